@@ -11,7 +11,7 @@ if str(src_dir) not in sys.path:
 	sys.path.insert(0, str(src_dir))
 
 # Now import from the package
-from ignition_lint.cli import main
+from ignition_lint.launcher import main
 
 if __name__ == "__main__":
 	main()
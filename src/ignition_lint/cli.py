@@ -3,17 +3,33 @@ Command-line interface for ignition-lint.
 """
 
 import json
+import os
 import sys
 import argparse
+import contextlib
 import glob
+import io
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 
 # Handle both relative and absolute imports
 try:
 	# Try relative imports first (when run as module)
-	from .common.flatten_json import read_json_file, flatten_json
-	from .linter import LintEngine
+	from .common.flatten_json import read_json_file, flatten_json, iter_flatten_file
+	from .common.file_watcher import AUTO_METHOD, DEFAULT_DEBOUNCE, WATCH_METHODS, create_watcher, iter_change_batches
+	from .common.git_changes import GitError, changed_view_files, staged_copies
+	from .common.json_backend import AUTO_BACKEND, BACKENDS, get_backend
+	from .common.profiler import (
+		DEFAULT_MAX_MODEL_RATIO, FILE, PHASE, MemoryProfiler, Profiler, memory_report, print_memory_report,
+		print_time_report, profile_span, write_chrome_trace
+	)
+	from .common.result_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, ModelCache, ResultCache
+	from .common.time_budget import BudgetExceeded, budgets_enforced, run_within_budget
+	from .daemon import run_client
+	from .linter import LintEngine, LintResults, EXECUTION_MODES, RULE_TIMEOUT_KEY
 	from .rules import RULES_MAP
 except ImportError:
 	# Fall back to absolute imports (when run directly or from tests)
@@ -22,11 +38,25 @@ except ImportError:
 	if str(src_dir) not in sys.path:
 		sys.path.insert(0, str(src_dir))
 
-	from ignition_lint.common.flatten_json import read_json_file, flatten_json
-	from ignition_lint.linter import LintEngine
+	from ignition_lint.common.flatten_json import read_json_file, flatten_json, iter_flatten_file
+	from ignition_lint.common.file_watcher import AUTO_METHOD, DEFAULT_DEBOUNCE, WATCH_METHODS, create_watcher, iter_change_batches
+	from ignition_lint.common.git_changes import GitError, changed_view_files, staged_copies
+	from ignition_lint.common.json_backend import AUTO_BACKEND, BACKENDS, get_backend
+	from ignition_lint.common.profiler import (
+		DEFAULT_MAX_MODEL_RATIO, FILE, PHASE, MemoryProfiler, Profiler, memory_report, print_memory_report,
+		print_time_report, profile_span, write_chrome_trace
+	)
+	from ignition_lint.common.result_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, ModelCache, ResultCache
+	from ignition_lint.common.time_budget import BudgetExceeded, budgets_enforced, run_within_budget
+	from ignition_lint.daemon import run_client
+	from ignition_lint.linter import LintEngine, LintResults, EXECUTION_MODES, RULE_TIMEOUT_KEY
 	from ignition_lint.rules import RULES_MAP
 
 
+# Errors key of the diagnostic reported for files aborted by --max-file-time
+FILE_TIMEOUT_KEY = 'FileTimeout'
+
+
 def load_config(config_path: str) -> dict:
 	"""Load configuration from a JSON file."""
 	try:
@@ -56,29 +86,66 @@ def create_rules_from_config(config: dict) -> list:
 		rule_class = RULES_MAP[rule_name]
 		kwargs = rule_config.get('kwargs', {})
 
+		timeout_ms = rule_config.get('timeout_ms')
+		if timeout_ms is not None and (isinstance(timeout_ms, bool) or not isinstance(timeout_ms, (int, float)) or timeout_ms <= 0):
+			print(f"Error creating rule {rule_name}: timeout_ms must be a positive number of milliseconds, got {timeout_ms!r}")
+			continue
+
 		try:
-			rules.append(rule_class.create_from_config(kwargs))
+			rule = rule_class.create_from_config(kwargs)
 		except (TypeError, ValueError, AttributeError) as e:
 			print(f"Error creating rule {rule_name}: {e}")
 			continue
+		rule.timeout_ms = timeout_ms
+		rules.append(rule)
 
 	return rules
 
 
-def get_view_file(file_path: Path) -> Dict[str, Any]:
-	"""Read and flatten a JSON file."""
+def get_view_file(
+	file_path: Path,
+	streaming: bool = False,
+	json_backend: str = None,
+	profiler: Optional[Profiler] = None
+) -> Dict[str, Any]:
+	"""
+	Read and flatten a view JSON file.
+
+	Args:
+		file_path: Path to the view.json file.
+		streaming: Flatten incrementally without building the JSON tree.
+		json_backend: Decode backend name, or None for the fastest installed one.
+		profiler: Optional profiler recording the time spent decoding and flattening.
+	"""
 	try:
-		json_data = read_json_file(file_path)
-		return flatten_json(json_data)
-	except (FileNotFoundError, json.JSONDecodeError, PermissionError, OSError) as e:
+		if streaming:
+			# Decoding and flattening are interleaved
+			with profile_span(profiler, 'decode+flatten', PHASE):
+				return OrderedDict(iter_flatten_file(file_path))
+		with profile_span(profiler, 'decode', PHASE):
+			json_data = read_json_file(file_path, json_backend)
+		with profile_span(profiler, 'flatten', PHASE):
+			return flatten_json(json_data)
+	except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError, PermissionError, OSError) as e:
 		print(f"Error reading or parsing file {file_path}: {e}")
 		return {}
 
 
-def collect_files(args) -> List[Path]:
-	"""Collect files to process based on arguments."""
+def collect_files(args, staged_content: contextlib.ExitStack) -> List[Path]:
+	"""Collect files to process based on arguments; with --staged, their staged content is read until staged_content closes."""
 	files_to_process = []
 
+	# In the git modes, lint the view files git reports as changed
+	if args.changed_since or args.staged:
+		try:
+			file_paths = changed_view_files(since=args.changed_since, staged=args.staged)
+			if args.staged and file_paths:
+				args.source_files = staged_content.enter_context(staged_copies(file_paths))
+			return file_paths
+		except GitError as e:
+			print(f"❌ Could not list changed files with git: {e}")
+			sys.exit(1)
+
 	# If filenames are provided directly (e.g., from pre-commit), use them
 	if args.filenames:
 		for filename in args.filenames:
@@ -212,11 +279,17 @@ def setup_linter(args) -> LintEngine:
 			print("❌ No valid rules configured")
 			sys.exit(1)
 
-		lint_engine = LintEngine(rules, debug_output_dir=args.debug_output)
+		lint_engine = LintEngine(rules, debug_output_dir=args.debug_output, execution_mode=args.execution_mode)
 
 		if args.verbose:
 			print(f"✅ Loaded {len(rules)} rules: {[rule.__class__.__name__ for rule in rules]}")
 
+	if args.verbose:
+		if args.streaming:
+			print("📦 JSON decode: streaming tokenizer")
+		else:
+			print(f"📦 JSON decode backend: {get_backend(args.json_backend).name}")
+
 	# Inform about debug output
 	if args.debug_output:
 		print(f"🔍 Debug output will be saved to: {args.debug_output}")
@@ -224,21 +297,150 @@ def setup_linter(args) -> LintEngine:
 	return lint_engine
 
 
-def process_single_file(file_path: Path, lint_engine: LintEngine, args) -> tuple[int, int]:
-	"""Process a single view file and return the warning and error counts."""
-	if not file_path.exists():
+def report_lint_results(file_path: Path, lint_results) -> tuple[int, int]:
+	"""Print the lint results of a file and return the warning and error counts."""
+	file_warnings, file_errors = print_file_results(file_path, lint_results)
+
+	if file_errors == 0 and file_warnings == 0:
+		print(f"✅ No issues found in {file_path}")
+	elif file_errors == 0 and file_warnings > 0:
+		print(f"✅ No errors found in {file_path} (warnings only)")
+
+	return file_warnings, file_errors
+
+
+def use_result_cache(args) -> bool:
+	"""Check if results can come from the cache: only plain linting, which needs nothing but the results."""
+	return not (
+		args.no_cache or args.stats_only or args.verbose or args.analyze_rules or args.debug_nodes is not None
+		or args.debug_output or args.memory_profile
+	)
+
+
+def use_model_cache(args) -> bool:
+	"""Check if view models can come from the cache: not when measuring the memory it takes to build them."""
+	return not (args.no_cache or args.memory_profile)
+
+
+def create_profiler(args) -> Optional[Profiler]:
+	"""Create the profiler for the profiling options of a run, or None without any."""
+	if args.memory_profile:
+		return MemoryProfiler(site_count=args.profile_top)
+	return Profiler() if args.profile else None
+
+
+def create_result_cache(args, lint_engine: LintEngine) -> ResultCache:
+	"""Create the result cache for the configuration and rules of this run."""
+	return ResultCache(args.cache_dir, config=load_config(args.config), rules=lint_engine.rules, max_bytes=args.cache_max_bytes)
+
+
+def source_file(file_path: Path, args) -> Path:
+	"""Return the file a view's content is read from: its copy from the git index with --staged, else the file itself."""
+	return getattr(args, 'source_files', {}).get(file_path, file_path)
+
+
+def read_view(file_path: Path, lint_engine: LintEngine, args, model_cache: Optional[ModelCache] = None):
+	"""
+	Read a view file, set it as the engine's view and return the view data (None if it cannot be read).
+
+	With a model cache, an unchanged file's view data and model are loaded from the cache;
+	otherwise its complete model is built now and stored, whatever subset the rules need.
+	"""
+	model_key = None
+	if model_cache is not None:
+		with profile_span(lint_engine.profiler, 'model_cache', PHASE):
+			model_key = model_cache.key_for(file_path)
+			cached = model_cache.get(model_key)
+		if cached is not None:
+			view_data, view_model = cached
+			lint_engine.set_view(view_data, view_model)
+			return view_data
+
+	# Read and flatten the JSON file
+	view_data = get_view_file(
+		file_path, streaming=args.streaming, json_backend=args.json_backend, profiler=lint_engine.profiler
+	)
+	if view_data and model_key is not None:
+		lint_engine.set_view(view_data)
+		view_model = lint_engine.get_view_model()
+		with profile_span(lint_engine.profiler, 'model_cache', PHASE):
+			model_cache.put(model_key, view_data, view_model)
+	return view_data
+
+
+def process_single_file(
+	file_path: Path,
+	lint_engine: LintEngine,
+	args,
+	cache: Optional[ResultCache] = None,
+	model_cache: Optional[ModelCache] = None
+) -> tuple[int, int]:
+	"""
+	Process a single view file and return the warning and error counts.
+
+	With --max-file-time, it is processed in a child process, killed if it takes longer (the file is reported as timed out).
+	"""
+	with profile_span(lint_engine.profiler, str(file_path), FILE, file_bytes=_file_size(source_file(file_path, args))):
+		if args.max_file_time is None or not budgets_enforced():
+			return _process_single_file(file_path, lint_engine, args, cache, model_cache)
+		try:
+			output, file_warnings, file_errors, spans = run_within_budget(
+				args.max_file_time, _capture_file, _process_single_file, file_path, lint_engine, args, cache, model_cache
+			)
+		except BudgetExceeded:
+			return report_lint_results(file_path, file_timeout_results(args.max_file_time))
+		sys.stdout.write(output)
+		if lint_engine.profiler is not None:
+			lint_engine.profiler.spans.extend(span._replace(pid=os.getpid()) for span in spans)
+		return file_warnings, file_errors
+
+
+def _capture_file(process, file_path: Path, lint_engine: LintEngine, args, cache, model_cache) -> tuple[str, int, int, list]:
+	"""Process a file with process(); return what it printed, its warning and error counts, and its profile spans."""
+	if lint_engine.profiler is not None:
+		lint_engine.profiler.take()  # Only the file's own spans are returned
+	output = io.StringIO()
+	with contextlib.redirect_stdout(output):
+		file_warnings, file_errors = process(file_path, lint_engine, args, cache, model_cache)
+	return output.getvalue(), file_warnings, file_errors, lint_engine.profiler.take() if lint_engine.profiler is not None else []
+
+
+def file_timeout_results(max_file_time: float) -> LintResults:
+	"""Return the results reported for a file aborted for taking longer than max_file_time seconds."""
+	message = f"Linting this view exceeded --max-file-time ({max_file_time:g}s) and was aborted; it was not fully checked"
+	return LintResults(warnings={}, errors={FILE_TIMEOUT_KEY: [message]}, has_errors=True)
+
+
+def _process_single_file(
+	file_path: Path,
+	lint_engine: LintEngine,
+	args,
+	cache: Optional[ResultCache] = None,
+	model_cache: Optional[ModelCache] = None
+) -> tuple[int, int]:
+	"""Process a single view file, within its profile span; see process_single_file."""
+	source = source_file(file_path, args)
+	if not source.exists():
 		print(f"⚠️  File {file_path} does not exist, skipping")
 		return 0, 0
 
-	# Read and flatten the JSON file
-	flattened_json = get_view_file(file_path)
+	# Reuse the results of an identical file linted with the same configuration and rules
+	cache_key = None
+	if cache is not None:
+		with profile_span(lint_engine.profiler, 'result_cache', PHASE):
+			cache_key = cache.key_for(source)
+			lint_results = cache.get(cache_key)
+		if lint_results is not None:
+			return report_lint_results(file_path, lint_results)
+
+	flattened_json = read_view(source, lint_engine, args, model_cache)
 	if not flattened_json:
 		print(f"❌ Failed to read or parse {file_path}, skipping")
 		return 0, 0
 
-	# Get statistics
-	stats = lint_engine.get_model_statistics(flattened_json)
-	print_statistics(file_path, stats, args.verbose or args.stats_only)
+	# Get statistics, only when they are printed (they need the complete model)
+	if args.verbose or args.stats_only:
+		print_statistics(file_path, lint_engine.get_model_statistics(flattened_json), verbose=True)
 
 	# Show rule analysis if requested
 	if args.analyze_rules and not args.stats_only:
@@ -251,16 +453,194 @@ def process_single_file(file_path: Path, lint_engine: LintEngine, args) -> tuple
 	# Run linting (unless stats-only mode)
 	if not args.stats_only:
 		lint_results = lint_engine.process(flattened_json, source_file_path=str(file_path))
-		file_warnings, file_errors = print_file_results(file_path, lint_results)
+		# Timeouts depend on the machine and its load: lint the file again next time
+		if cache_key is not None and RULE_TIMEOUT_KEY not in lint_results.errors:
+			with profile_span(lint_engine.profiler, 'result_cache', PHASE):
+				cache.put(cache_key, lint_results)
+		return report_lint_results(file_path, lint_results)
 
-		if file_errors == 0 and file_warnings == 0:
-			print(f"✅ No issues found in {file_path}")
-		elif file_errors == 0 and file_warnings > 0:
-			print(f"✅ No errors found in {file_path} (warnings only)")
+	return 0, 0
 
-		return file_warnings, file_errors
 
-	return 0, 0
+# Lint engine and caches of a --jobs worker process, set up once per process by _init_worker
+_WORKER_ENGINE = None
+_WORKER_CACHE = None
+_WORKER_MODEL_CACHE = None
+
+
+def _init_worker(args, cache: Optional[ResultCache] = None, model_cache: Optional[ModelCache] = None):
+	"""Set up a worker process's lint engine from the same configuration as the main process."""
+	global _WORKER_ENGINE, _WORKER_CACHE, _WORKER_MODEL_CACHE  # pylint: disable=global-statement
+	# The main process has already reported on the configuration
+	with contextlib.redirect_stdout(io.StringIO()):
+		_WORKER_ENGINE = setup_linter(args)
+	_WORKER_ENGINE.profiler = create_profiler(args)
+	_WORKER_CACHE = cache
+	_WORKER_MODEL_CACHE = model_cache
+
+
+def _lint_file_in_worker(file_path: Path, args) -> tuple[str, int, int, list]:
+	"""Lint a file in a worker process and return its printed output, warning and error counts, and profile spans."""
+	return _capture_file(process_single_file, file_path, _WORKER_ENGINE, args, _WORKER_CACHE, _WORKER_MODEL_CACHE)
+
+
+def _report_cached_file(
+	file_path: Path, args, cache: ResultCache, profiler: Optional[Profiler] = None
+) -> Optional[tuple[str, int, int, list]]:
+	"""Return the printed output and counts of a file whose results are cached (and no profile spans), or None."""
+	if not source_file(file_path, args).exists():
+		return None
+	with profile_span(profiler, 'result_cache', PHASE):
+		lint_results = cache.get(cache.key_for(source_file(file_path, args)))
+	if lint_results is None:
+		return None
+	output = io.StringIO()
+	with contextlib.redirect_stdout(output):
+		file_warnings, file_errors = report_lint_results(file_path, lint_results)
+	return output.getvalue(), file_warnings, file_errors, []
+
+
+def _file_size(file_path: Path) -> int:
+	"""Return the size of a file in bytes, or 0 if it cannot be read."""
+	try:
+		return file_path.stat().st_size
+	except OSError:
+		return 0
+
+
+def lint_files(
+	file_paths: List[Path],
+	lint_engine: LintEngine,
+	args,
+	cache: Optional[ResultCache] = None,
+	model_cache: Optional[ModelCache] = None
+) -> Iterator[tuple[int, int]]:
+	"""
+	Lint files and yield the warning and error counts of each, in input order.
+
+	With more than one job, files are linted by a pool of worker processes, largest first so
+	that a big file does not start last and hold up the end of the run. Each file's output is
+	printed in input order as soon as the files before it are done, so it matches a serial run.
+	Files with cached results are reported by the main process without starting any worker.
+	The profile spans of workers are added to the main process's profiler.
+	"""
+	finished = {}
+	if cache is not None and args.jobs > 1:
+		for index, file_path in enumerate(file_paths):
+			cached = _report_cached_file(file_path, args, cache, lint_engine.profiler)
+			if cached is not None:
+				finished[index] = cached
+	pending = [index for index in range(len(file_paths)) if index not in finished]
+
+	jobs = min(args.jobs, len(pending))
+	if jobs <= 1:
+		for index, file_path in enumerate(file_paths):
+			if index in finished:
+				output, file_warnings, file_errors, _ = finished.pop(index)
+				sys.stdout.write(output)
+				yield file_warnings, file_errors
+			else:
+				yield process_single_file(file_path, lint_engine, args, cache, model_cache)
+		return
+
+	schedule = sorted(pending, key=lambda index: _file_size(source_file(file_paths[index], args)), reverse=True)
+	next_index = 0
+	with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(args, cache, model_cache)) as pool:
+		futures = {pool.submit(_lint_file_in_worker, file_paths[index], args): index for index in schedule}
+		for future in as_completed(futures):
+			finished[futures[future]] = future.result()
+			while next_index in finished:
+				output, file_warnings, file_errors, spans = finished.pop(next_index)
+				if lint_engine.profiler is not None:
+					lint_engine.profiler.spans.extend(spans)
+				sys.stdout.write(output)
+				yield file_warnings, file_errors
+				next_index += 1
+
+
+def print_watch_summary(results: Dict[Path, tuple[int, int]], elapsed: float):
+	"""Print the state of every watched view after a (re-)lint, and that the watch continues."""
+	total_warnings = sum(file_warnings for file_warnings, _ in results.values())
+	total_errors = sum(file_errors for _, file_errors in results.values())
+	files_with_issues = sum(1 for file_warnings, file_errors in results.values() if file_warnings or file_errors)
+	print(
+		f"\n👀 [{time.strftime('%H:%M:%S')}] {len(results)} views, {files_with_issues} with issues "
+		f"({total_errors} errors, {total_warnings} warnings), linted in {elapsed:.2f}s. "
+		"Watching for changes (Ctrl+C to stop)...",
+		flush=True
+	)
+
+
+def watch_views(
+	args,
+	lint_engine: LintEngine,
+	cache: Optional[ResultCache] = None,
+	model_cache: Optional[ModelCache] = None
+):
+	"""
+	Lint every view below args.watch, then re-lint views as they change until interrupted.
+
+	The engine, its rules and pylint stay loaded between runs, so a saved view is re-linted
+	without any startup cost. On a terminal, the screen is cleared before each re-lint so
+	the summary stays in place below the results of the views that changed.
+	"""
+	root = Path(args.watch)
+	if not root.is_dir():
+		print(f"❌ {root} is not a directory")
+		sys.exit(1)
+	try:
+		watcher = create_watcher(root, args.watch_method)
+	except (ValueError, OSError) as e:
+		print(f"❌ Cannot watch {root}: {e}")
+		sys.exit(1)
+
+	results = {}
+	try:
+		start = time.perf_counter()
+		view_files = watcher.view_files()
+		for file_path, counts in zip(view_files, lint_files(view_files, lint_engine, args, cache, model_cache)):
+			results[file_path] = counts
+		print_watch_summary(results, time.perf_counter() - start)
+
+		for changed in iter_change_batches(watcher, args.debounce_ms / 1000):
+			start = time.perf_counter()
+			if sys.stdout.isatty():
+				print("\033[2J\033[H", end="")
+			for file_path in sorted(changed):
+				if file_path.is_file():
+					results[file_path] = process_single_file(file_path, lint_engine, args, cache, model_cache)
+				elif results.pop(file_path, None) is not None:
+					print(f"🗑️  {file_path} was removed")
+			print_watch_summary(results, time.perf_counter() - start)
+	except KeyboardInterrupt:
+		print("\n👋 Stopped watching")
+	finally:
+		watcher.close()
+		for used_cache in filter(None, (cache, model_cache)):
+			used_cache.prune()
+
+
+def report_profile(args, profiler: Profiler):
+	"""Print the reports of a profiled run, and write the trace and memory report files asked for."""
+	if args.profile:
+		print_time_report(profiler, args.profile_top)
+		if args.profile_output:
+			try:
+				write_chrome_trace(profiler.spans, Path(args.profile_output), main_pid=os.getpid())
+				print(f"📝 Profile trace written to {args.profile_output}")
+			except OSError as e:
+				print(f"⚠️  Warning: Could not write profile trace: {e}")
+
+	if args.memory_profile:
+		report = memory_report(profiler.spans, args.max_model_ratio)
+		print_memory_report(report, args.profile_top)
+		if args.memory_profile_output:
+			try:
+				with open(args.memory_profile_output, 'w', encoding='utf-8') as f:
+					json.dump(report, f, indent=2)
+				print(f"📝 Memory report written to {args.memory_profile_output}")
+			except OSError as e:
+				print(f"⚠️  Warning: Could not write memory report: {e}")
 
 
 def print_final_summary(processed_files: int, total_warnings: int, total_errors: int, files_with_issues: int, stats_only: bool, warnings_only_mode: bool = False):
@@ -294,8 +674,42 @@ def print_final_summary(processed_files: int, total_warnings: int, total_errors:
 		sys.exit(0)
 
 
-def main():
-	"""Main function to lint Ignition view.json files for style inconsistencies."""
+def get_linter(args, engines: Optional[Dict[tuple, tuple]] = None) -> LintEngine:
+	"""
+	Return the lint engine for args: a new one, or with engines, the one kept for the same settings.
+
+	Engines are kept per configuration file content, so editing the file gets a new engine. The
+	output of setting up an engine is kept with it and printed again on reuse, so a run with a
+	kept engine prints exactly what a fresh run does.
+	"""
+	if engines is None:
+		return setup_linter(args)
+	try:
+		config_content = Path(args.config).read_bytes()
+	except OSError:
+		config_content = None
+	key = (
+		args.config, config_content, args.stats_only, args.verbose, args.debug_output, args.execution_mode, args.streaming,
+		args.json_backend
+	)
+	if key not in engines:
+		# Drop the engines of a previous version of the configuration file
+		for outdated in [engine_key for engine_key in engines if engine_key[0] == args.config]:
+			del engines[outdated]
+		output = io.StringIO()
+		try:
+			with contextlib.redirect_stdout(output):
+				engines[key] = (setup_linter(args), output.getvalue())
+		finally:
+			if key not in engines:
+				sys.stdout.write(output.getvalue())
+	lint_engine, setup_output = engines[key]
+	sys.stdout.write(setup_output)
+	return lint_engine
+
+
+def build_parser() -> argparse.ArgumentParser:
+	"""Build the command line parser."""
 	parser = argparse.ArgumentParser(description="Lint Ignition JSON files")
 	parser.add_argument(
 		"--config",
@@ -337,18 +751,215 @@ def main():
 		action="store_true",
 		help="Exit with code 0 when only warnings are found (useful for pre-commit hooks)",
 	)
+	parser.add_argument(
+		"--streaming",
+		action="store_true",
+		help=(
+			"Flatten view files while decoding them, without building the JSON tree first: lowers peak memory "
+			"on very large views, but decoding is several times slower"
+		),
+	)
+	parser.add_argument(
+		"--execution-mode",
+		choices=list(EXECUTION_MODES),
+		default="per-rule",
+		help="How to run the rules: each rule walks its nodes in turn (per-rule), or all rules share a single walk (fused)",
+	)
+	parser.add_argument(
+		"--json-backend",
+		choices=[AUTO_BACKEND, "orjson", "stdlib"],
+		default=AUTO_BACKEND,
+		help="JSON decoder for view files (default: orjson when installed, otherwise the stdlib)",
+	)
+	parser.add_argument(
+		"--jobs",
+		"-j",
+		type=int,
+		help="Number of files to lint in parallel worker processes (default: number of CPUs; 1 with --use-daemon)",
+	)
+	parser.add_argument(
+		"--no-cache",
+		action="store_true",
+		help="Read and lint every file, without reading or writing the result and model caches",
+	)
+	parser.add_argument(
+		"--clear-cache",
+		action="store_true",
+		help="Delete the result and model caches before linting (only from a directory ignition-lint created as a cache)",
+	)
+	parser.add_argument(
+		"--cache-dir",
+		default=DEFAULT_CACHE_DIR,
+		help=f"Directory of the result and model caches (default: {DEFAULT_CACHE_DIR})",
+	)
+	parser.add_argument(
+		"--cache-max-bytes",
+		type=int,
+		default=DEFAULT_MAX_BYTES,
+		help=f"Size limit in bytes of each of the result and model caches, evicting least recently used entries (default: {DEFAULT_MAX_BYTES})",
+	)
+	file_selection = parser.add_mutually_exclusive_group()
+	file_selection.add_argument(
+		"--changed-since",
+		metavar="REF",
+		help="Only lint view files added or modified since the merge base of REF and HEAD (uses the local git repository)",
+	)
+	file_selection.add_argument(
+		"--staged",
+		action="store_true",
+		help="Only lint view files added or modified in the git index, as they are staged",
+	)
+	file_selection.add_argument(
+		"--watch",
+		metavar="DIR",
+		help="Lint every view file below DIR, then keep re-linting view files as they are saved",
+	)
+	parser.add_argument(
+		"--watch-method",
+		choices=[AUTO_METHOD, "inotify", "poll"],
+		default=AUTO_METHOD,
+		help="How --watch detects changes: inotify events (Linux) or rescanning (e.g. network drives) (default: inotify when available)",
+	)
+	parser.add_argument(
+		"--debounce-ms",
+		type=int,
+		default=int(DEFAULT_DEBOUNCE * 1000),
+		help=f"With --watch, wait this long after the last change before re-linting (default: {int(DEFAULT_DEBOUNCE * 1000)})",
+	)
+	parser.add_argument(
+		"--max-file-time",
+		metavar="SECONDS",
+		type=float,
+		help="Lint each file in a child process, killed if it takes longer than this, and report the file as timed out "
+		"(rules can also have their own \"timeout_ms\" in the configuration)",
+	)
+	parser.add_argument(
+		"--profile",
+		action="store_true",
+		help="Time every file, phase (JSON decode, flattening, model building) and rule, and print the slowest at the end",
+	)
+	parser.add_argument(
+		"--profile-output",
+		metavar="FILE",
+		help="With profiling (implies --profile), also write a Chrome trace (chrome://tracing, Perfetto) to FILE",
+	)
+	parser.add_argument(
+		"--profile-top",
+		metavar="N",
+		type=int,
+		default=10,
+		help="Number of files, rules and allocation sites to list in --profile and --memory-profile reports (default: 10)",
+	)
+	parser.add_argument(
+		"--memory-profile",
+		action="store_true",
+		help="Measure the memory allocated per file, phase and rule with tracemalloc, and print the largest "
+		"(reads and models every file without the caches; lints several times slower)",
+	)
+	parser.add_argument(
+		"--memory-profile-output",
+		metavar="FILE",
+		help="With memory profiling (implies --memory-profile), also write the memory report as JSON to FILE",
+	)
+	parser.add_argument(
+		"--max-model-ratio",
+		metavar="X",
+		type=float,
+		default=DEFAULT_MAX_MODEL_RATIO,
+		help="With --memory-profile, flag files whose view model takes more than X times their size on disk "
+		f"(default: {DEFAULT_MAX_MODEL_RATIO:g})",
+	)
 	parser.add_argument(
 		"filenames",
 		nargs="*",
 		help="Filenames to check (from pre-commit)",
 	)
-	args = parser.parse_args()
+	parser.add_argument(
+		"--use-daemon",
+		action="store_true",
+		help="Lint through a background process that keeps the rules and pylint loaded (started on demand)",
+	)
+	return parser
+
+
+def check_args(args, daemon_run: bool = False):
+	"""Check the parsed arguments and fill in defaults that depend on others, exiting on invalid ones."""
+	if args.jobs is None:
+		args.jobs = 1 if daemon_run else os.cpu_count() or 1
+	if args.jobs < 1:
+		print(f"❌ --jobs must be at least 1, got {args.jobs}")
+		sys.exit(1)
+
+	if args.debounce_ms < 0:
+		print(f"❌ --debounce-ms cannot be negative, got {args.debounce_ms}")
+		sys.exit(1)
+
+	if args.watch_method not in (AUTO_METHOD, *WATCH_METHODS):
+		print(f"❌ Watch method '{args.watch_method}' is not available (available: {', '.join(sorted(WATCH_METHODS))})")
+		sys.exit(1)
+
+	args.profile = args.profile or bool(args.profile_output)
+	args.memory_profile = args.memory_profile or bool(args.memory_profile_output)
+	if (args.profile or args.memory_profile) and args.watch:
+		print("❌ --profile and --memory-profile cannot be used with --watch")
+		sys.exit(1)
+	if args.max_file_time is not None and args.max_file_time <= 0:
+		print(f"❌ --max-file-time must be positive, got {args.max_file_time:g}")
+		sys.exit(1)
+
+	if args.cache_max_bytes < 0:
+		print(f"❌ --cache-max-bytes cannot be negative, got {args.cache_max_bytes}")
+		sys.exit(1)
+
+	if args.profile_top < 1:
+		print(f"❌ --profile-top must be at least 1, got {args.profile_top}")
+		sys.exit(1)
+
+	if args.json_backend not in (AUTO_BACKEND, *BACKENDS):
+		print(f"❌ JSON backend '{args.json_backend}' is not installed (available: {', '.join(sorted(BACKENDS))})")
+		sys.exit(1)
+
+
+def main(argv: Optional[List[str]] = None, engines: Optional[Dict[tuple, tuple]] = None):
+	"""
+	Main function to lint Ignition view.json files for style inconsistencies.
+
+	Args:
+		argv: Command line arguments; defaults to sys.argv[1:].
+		engines: Lint engines kept between calls by a long-lived caller (the daemon), which are
+			reused for runs with the same settings. Files are then linted in-process unless
+			--jobs is given.
+	"""
+	args = build_parser().parse_args(argv)
+
+	if args.use_daemon and engines is None:
+		sys.exit(run_client(sys.argv[1:] if argv is None else argv))
+
+	check_args(args, daemon_run=engines is not None)
+
+	if args.clear_cache:
+		try:
+			ResultCache(args.cache_dir).clear()
+		except ValueError as e:
+			print(f"❌ {e}")
+			sys.exit(1)
 
 	# Set up the linting engine
-	lint_engine = setup_linter(args)
+	lint_engine = get_linter(args, engines)
+	lint_engine.profiler = create_profiler(args)
+	cache = create_result_cache(args, lint_engine) if use_result_cache(args) else None
+	model_cache = ModelCache(args.cache_dir, max_bytes=args.cache_max_bytes) if use_model_cache(args) else None
+
+	if args.watch:
+		watch_views(args, lint_engine, cache, model_cache)
+		return
 
 	# Collect files to process
-	file_paths = collect_files(args)
+	staged_content = contextlib.ExitStack()
+	file_paths = collect_files(args, staged_content)
+	if not file_paths and (args.changed_since or args.staged):
+		print("✅ No changed view files to lint")
+		sys.exit(0)
 	if not file_paths:
 		print("❌ No files specified or found")
 		sys.exit(0)
@@ -362,15 +973,24 @@ def main():
 	files_with_issues = 0
 	processed_files = 0
 
-	for file_path in file_paths:
-		file_warnings, file_errors = process_single_file(file_path, lint_engine, args)
-
-		# All functions now return tuples, no need to check for -1
-		processed_files += 1
-		total_warnings += file_warnings
-		total_errors += file_errors
-		if file_warnings > 0 or file_errors > 0:
-			files_with_issues += 1
+	try:
+		with staged_content:
+			for file_warnings, file_errors in lint_files(file_paths, lint_engine, args, cache, model_cache):
+				# All functions now return tuples, no need to check for -1
+				processed_files += 1
+				total_warnings += file_warnings
+				total_errors += file_errors
+				if file_warnings > 0 or file_errors > 0:
+					files_with_issues += 1
+	finally:
+		if lint_engine.profiler is not None:
+			lint_engine.profiler.close()
+
+	for used_cache in filter(None, (cache, model_cache)):
+		used_cache.prune()  # Each cache within its own size limit
+
+	if lint_engine.profiler is not None:
+		report_profile(args, lint_engine.profiler)
 
 	# Print final summary
 	print_final_summary(processed_files, total_warnings, total_errors, files_with_issues, args.stats_only, args.warnings_only)
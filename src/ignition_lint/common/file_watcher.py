@@ -0,0 +1,279 @@
+"""
+This module watches a directory tree for changes to view files, for the CLI's watch mode.
+
+PollingWatcher rescans the tree and compares the modification time and size of every view
+file; it works everywhere, network filesystems included. On Linux, InotifyWatcher has the
+kernel report changes instead (through libc, no extra dependency), so a saved view is seen
+as soon as it is written, without rescanning the tree.
+
+Both report the view files created, modified, moved or deleted since the last call; callers
+check which of them still exist.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+VIEW_FILE_NAME = 'view.json'
+
+AUTO_METHOD = 'auto'
+
+# Seconds between rescans of the tree by the polling watcher
+DEFAULT_POLL_INTERVAL = 0.25
+
+# Seconds without further changes before a batch of changes is reported
+DEFAULT_DEBOUNCE = 0.1
+
+# inotify constants, from <sys/inotify.h>
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = (
+	_IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_ONLYDIR
+)
+
+# struct inotify_event: int wd; uint32_t mask, cookie, len; char name[len]
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def scan_view_files(root: Path) -> Dict[Path, Tuple[int, int]]:
+	"""Return the modification time and size of every view file below root."""
+	found = {}
+	for dir_path, _, file_names in os.walk(root):
+		if VIEW_FILE_NAME in file_names:
+			path = Path(dir_path) / VIEW_FILE_NAME
+			try:
+				stat = path.stat()
+			except OSError:
+				continue  # Deleted since the directory was listed
+			found[path] = (stat.st_mtime_ns, stat.st_size)
+	return found
+
+
+class PollingWatcher:
+	"""Detect view file changes by rescanning the tree at a fixed interval."""
+
+	def __init__(self, root: Path, interval: float = DEFAULT_POLL_INTERVAL):
+		"""
+		Args:
+			root: Directory to watch, recursively.
+			interval: Seconds between rescans.
+		"""
+		self.root = Path(root)
+		self.interval = interval
+		self._snapshot = scan_view_files(self.root)
+
+	def view_files(self) -> List[Path]:
+		"""Return the view files currently in the tree, sorted."""
+		return sorted(self._snapshot)
+
+	def changes(self, timeout: Optional[float] = None) -> Set[Path]:
+		"""Wait up to timeout seconds (None: until there is one) for view files to change, and return them."""
+		deadline = None if timeout is None else time.monotonic() + timeout
+		while True:
+			snapshot = scan_view_files(self.root)
+			changed = {
+				path for path in snapshot.keys() | self._snapshot.keys() if snapshot.get(path) != self._snapshot.get(path)
+			}
+			self._snapshot = snapshot
+			if changed:
+				return changed
+			if deadline is None:
+				time.sleep(self.interval)
+				continue
+			remaining = deadline - time.monotonic()
+			if remaining <= 0:
+				return changed
+			time.sleep(min(self.interval, remaining))
+
+	def close(self):
+		"""Stop watching (nothing to release)."""
+
+
+def _load_libc():
+	"""Return libc if it provides inotify (Linux), else None."""
+	if not sys.platform.startswith('linux'):
+		return None
+	try:
+		libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+	except OSError:
+		return None
+	return libc if hasattr(libc, 'inotify_init1') else None
+
+
+_LIBC = _load_libc()
+
+
+class InotifyWatcher:
+	"""Detect view file changes from inotify events, with a watch on every directory of the tree."""
+
+	def __init__(self, root: Path):
+		"""
+		Args:
+			root: Directory to watch, recursively.
+
+		Raises:
+			OSError: If inotify is unavailable or the tree needs more watches than the system allows
+				(see /proc/sys/fs/inotify/max_user_watches).
+		"""
+		if _LIBC is None:
+			raise OSError(errno.ENOSYS, "inotify is not available on this system")
+		self.root = Path(root)
+		self._fd = _LIBC.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+		if self._fd < 0:
+			error = ctypes.get_errno()
+			raise OSError(error, f"Cannot initialize inotify: {os.strerror(error)}")
+		self._directories: Dict[int, Path] = {}
+		self._view_files: Set[Path] = set()
+		try:
+			self._watch_tree(self.root)
+		except OSError:
+			self.close()
+			raise
+
+	def view_files(self) -> List[Path]:
+		"""Return the view files currently in the tree, sorted."""
+		return sorted(self._view_files)
+
+	def changes(self, timeout: Optional[float] = None) -> Set[Path]:
+		"""Wait up to timeout seconds (None: until there is one) for view files to change, and return them."""
+		deadline = None if timeout is None else time.monotonic() + timeout
+		changed = set()
+		while not changed:
+			remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+			readable, _, _ = select.select([self._fd], [], [], remaining)
+			if not readable:
+				break
+			while True:
+				try:
+					data = os.read(self._fd, 64 * 1024)
+				except BlockingIOError:
+					break
+				changed |= self._handle_events(data)
+		return changed
+
+	def close(self):
+		"""Stop watching and release the inotify instance."""
+		if self._fd >= 0:
+			os.close(self._fd)
+			self._fd = -1
+
+	def _watch_tree(self, directory: Path) -> Set[Path]:
+		"""Watch directory and every directory below it, and return the view files found in them."""
+		found = set()
+		for dir_path, _, file_names in os.walk(directory):
+			self._add_watch(Path(dir_path))
+			if VIEW_FILE_NAME in file_names:
+				found.add(Path(dir_path) / VIEW_FILE_NAME)
+		self._view_files |= found
+		return found
+
+	def _add_watch(self, directory: Path):
+		watch = _LIBC.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+		if watch < 0:
+			error = ctypes.get_errno()
+			if error in (errno.ENOENT, errno.ENOTDIR):
+				return  # Removed since it was listed
+			raise OSError(error, f"Cannot watch {directory}: {os.strerror(error)}")
+		self._directories[watch] = directory
+
+	def _forget_tree(self, directory: Path) -> Set[Path]:
+		"""Stop tracking a directory moved out of its place, and return the view files that were below it."""
+		for watch, path in list(self._directories.items()):
+			if path == directory or directory in path.parents:
+				_LIBC.inotify_rm_watch(self._fd, watch)
+				del self._directories[watch]
+		gone = {path for path in self._view_files if directory in path.parents}
+		self._view_files -= gone
+		return gone
+
+	def _handle_events(self, data: bytes) -> Set[Path]:
+		"""Update the watched tree from a buffer of inotify events and return the view files they changed."""
+		changed = set()
+		offset = 0
+		while offset < len(data):
+			watch, mask, _, name_length = _EVENT_HEADER.unpack_from(data, offset)
+			name = os.fsdecode(data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + name_length].rstrip(b'\0'))
+			offset += _EVENT_HEADER.size + name_length
+
+			if mask & _IN_Q_OVERFLOW:
+				# Events were dropped: start over from a rescan and report every view file
+				changed |= self._forget_tree(self.root) | self._watch_tree(self.root)
+				continue
+			directory = self._directories.get(watch)
+			if directory is None:
+				continue
+			if mask & _IN_IGNORED:
+				del self._directories[watch]
+				continue
+			if not name:
+				continue  # Events on the watched directory itself; its parent reports its removal
+			path = directory / name
+			if mask & _IN_ISDIR:
+				if mask & (_IN_CREATE | _IN_MOVED_TO):
+					changed |= self._watch_tree(path)
+				elif mask & _IN_MOVED_FROM:
+					changed |= self._forget_tree(path)
+			elif name == VIEW_FILE_NAME:
+				changed.add(path)
+				if mask & (_IN_DELETE | _IN_MOVED_FROM):
+					self._view_files.discard(path)
+				else:
+					self._view_files.add(path)
+		return changed
+
+
+WATCH_METHODS = {'poll': PollingWatcher}
+if _LIBC is not None:
+	WATCH_METHODS['inotify'] = InotifyWatcher
+
+
+def create_watcher(root: Path, method: str = None):
+	"""
+	Create a watcher for a directory tree.
+
+	Args:
+		root: Directory to watch, recursively.
+		method: "inotify", "poll", or None/"auto" for inotify when the system provides it (and
+			has enough watches for the tree), otherwise polling.
+
+	Raises:
+		ValueError: If the named method is unknown or not available on this system.
+		OSError: If the inotify watcher was requested and cannot watch the tree.
+	"""
+	if method in (None, AUTO_METHOD):
+		if 'inotify' in WATCH_METHODS:
+			try:
+				return InotifyWatcher(root)
+			except OSError:
+				pass
+		return PollingWatcher(root)
+	if method not in WATCH_METHODS:
+		raise ValueError(f"Watch method '{method}' is not available (available: {', '.join(sorted(WATCH_METHODS))})")
+	return WATCH_METHODS[method](root)
+
+
+def iter_change_batches(watcher, debounce: float = DEFAULT_DEBOUNCE) -> Iterator[Set[Path]]:
+	"""Yield the view files changed, in batches: each once no further change is seen for debounce seconds."""
+	while True:
+		changed = watcher.changes()
+		while True:
+			more = watcher.changes(timeout=debounce)
+			if not more:
+				break
+			changed |= more
+		yield changed
@@ -0,0 +1,119 @@
+"""
+This module provides FlatIndex, a read-only index over a flattened view that answers
+prefix and suffix queries with a binary search instead of a scan over every key.
+
+The index is built once per view (O(N log N)) and then each query costs O(log N + k),
+where k is the number of keys in the matched range. Results are always returned in the
+original (document) order of the flattened JSON, so callers see exactly what a linear
+scan would have produced.
+"""
+
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+class FlatIndex:
+	"""Sorted-key index over a flattened JSON dictionary."""
+
+	def __init__(self, flattened_json: Dict[str, Any]):
+		self._data = flattened_json
+		self._keys = list(flattened_json)
+		self._order = sorted(range(len(self._keys)), key=self._keys.__getitem__)
+		self._sorted_keys = [self._keys[position] for position in self._order]
+		# Built on first suffix query; most views never need it
+		self._reversed_keys = None
+		self._reversed_order = None
+
+	def __len__(self) -> int:
+		return len(self._keys)
+
+	def __contains__(self, path: str) -> bool:
+		return path in self._data
+
+	def __getitem__(self, path: str) -> Any:
+		return self._data[path]
+
+	def get(self, path: str, default: Any = None) -> Any:
+		"""Return the value at path, or default if the path is not present."""
+		return self._data.get(path, default)
+
+	def _positions_under(self, prefix: str) -> List[int]:
+		"""Return the document positions of every key starting with prefix, in document order."""
+		sorted_keys = self._sorted_keys
+		start = bisect_left(sorted_keys, prefix)
+		end = start
+		while end < len(sorted_keys) and sorted_keys[end].startswith(prefix):
+			end += 1
+		return sorted(self._order[start:end])
+
+	def has_prefix(self, prefix: str) -> bool:
+		"""Return True if at least one key starts with prefix."""
+		position = bisect_left(self._sorted_keys, prefix)
+		return position < len(self._sorted_keys) and self._sorted_keys[position].startswith(prefix)
+
+	def keys_under(self, prefix: str) -> List[str]:
+		"""Return every key starting with prefix, in document order."""
+		return [self._keys[position] for position in self._positions_under(prefix)]
+
+	def items_under(self, prefix: str) -> List[Tuple[str, Any]]:
+		"""Return (key, value) pairs for every key starting with prefix, in document order."""
+		return [(key, self._data[key]) for key in self.keys_under(prefix)]
+
+	def children(self, path: str = "") -> List[str]:
+		"""
+		Return the immediate child segments of a path, in document order.
+
+		Object members are returned by name and array elements as their index segment,
+		e.g. children("root.root") -> ['meta', 'type', 'children', 'props'] and
+		children("root.root.children") -> ['[0]', '[1]'].
+
+		Args:
+			path: Dotted container path; an empty string lists the top-level keys.
+
+		Returns:
+			List of distinct child segments
+		"""
+		children = {}
+		for key in self.keys_under(path):
+			rest = key[len(path):]
+			if not path:
+				segment = rest
+			elif rest[:1] == '.':
+				segment = rest[1:]
+			elif rest[:1] == '[':
+				children.setdefault(rest[:rest.index(']') + 1], None)
+				continue
+			else:
+				# A sibling that merely shares the prefix, e.g. "props" vs "propsExtra"
+				continue
+			end = len(segment)
+			for separator in '.[':
+				found = segment.find(separator)
+				if 0 < found < end:
+					end = found
+			children.setdefault(segment[:end], None)
+		return list(children)
+
+	def _build_suffix_index(self):
+		self._reversed_order = sorted(range(len(self._keys)), key=lambda position: self._keys[position][::-1])
+		self._reversed_keys = [self._keys[position][::-1] for position in self._reversed_order]
+
+	def keys_with_suffix(self, suffix: str) -> List[str]:
+		"""Return every key ending with suffix, in document order."""
+		if self._reversed_keys is None:
+			self._build_suffix_index()
+		reversed_suffix = suffix[::-1]
+		reversed_keys = self._reversed_keys
+		start = bisect_left(reversed_keys, reversed_suffix)
+		end = start
+		while end < len(reversed_keys) and reversed_keys[end].startswith(reversed_suffix):
+			end += 1
+		return [self._keys[position] for position in sorted(self._reversed_order[start:end])]
+
+	def items_with_suffix(self, suffix: str) -> List[Tuple[str, Any]]:
+		"""Return (key, value) pairs for every key ending with suffix, in document order."""
+		return [(key, self._data[key]) for key in self.keys_with_suffix(suffix)]
+
+	def iter_items(self) -> Iterator[Tuple[str, Any]]:
+		"""Iterate over all (key, value) pairs in document order."""
+		return iter(self._data.items())
@@ -7,7 +7,14 @@ import logging
 import sys
 import re
 from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, Optional
+
+from .json_backend import load_json_file
+from .json_stream import (
+	DEFAULT_CHUNK_SIZE, START_MAP, START_ARRAY, END_ARRAY, MAP_KEY, VALUE, iter_json_events
+)
 
 UNICODE_REPLACEMENTS = {
 	r"\\u003c": "UNICODE_LT",
@@ -49,29 +56,29 @@ def format_json(obj):
 	return json.dumps(obj, indent=2, ensure_ascii=False).rstrip()
 
 
-def read_json_file(file_path):
-	"""Read and parse a JSON file while preserving Unicode escapes.
+def read_json_file(file_path, backend=None):
+	"""Read and parse a JSON file.
+
+	The file is parsed from raw bytes by the selected decode backend (see json_backend);
+	objects are plain dicts, which preserve key order.
 
 	Args:
 		file_path (Path): Path to the JSON file.
+		backend (str): Decode backend name ("orjson", "stdlib"), or None for the fastest installed.
 
 	Returns:
-		OrderedDict: Parsed JSON data.
+		dict: Parsed JSON data.
 
 	Raises:
 		SystemExit: If the file is not found or JSON is invalid.
 	"""
 	file_path = Path(file_path).resolve()
 	try:
-		with file_path.open("r", encoding="utf-8") as file:
-			content = file.read()
-			return json.loads(content, object_pairs_hook=OrderedDict)
-			# preserved_content = preserve_unicode_escapes(content)
-			# return json.loads(preserved_content, object_pairs_hook=OrderedDict)
+		return load_json_file(file_path, backend)
 	except FileNotFoundError:
 		LOGGER.error("File %s not found. Confirm the file exists and is accessible.", file_path)
 		sys.exit(1)
-	except json.JSONDecodeError as e:
+	except (json.JSONDecodeError, UnicodeDecodeError) as e:
 		LOGGER.error("Invalid JSON in %s: %s", file_path, e)
 		sys.exit(1)
 
@@ -167,76 +174,260 @@ def _extract_java_date_timestamp(data):
 	return data["$ts"]
 
 
-def _process_dict_item(key, value, path, results):
-	"""Process a single key-value pair from a dictionary."""
-	current_path = f"{path}.{key}" if path else key
-	if isinstance(value, dict):
-		# Check if this is a Java Date object
-		if _is_java_date_object(value):
-			# Store as a single encoded date value
-			timestamp = _extract_java_date_timestamp(value)
-			results[f"{current_path}._JavaDate"] = timestamp
-		else:
-			# Regular dictionary - flatten recursively
-			flatten_json(value, current_path, results)
-	elif isinstance(value, list):
-		_process_list_items(value, current_path, results)
-	else:
-		results[current_path] = value
-
-
-def _process_list_items(items, base_path, results):
-	"""Process all items in a list."""
-	for index, item in enumerate(items):
-		item_path = f"{base_path}[{index}]"
-		_process_single_item(item, item_path, results)
-
+def _iter_items(data, path):
+	"""
+	Yield the (path, value) pair of each item of an object or array.
 
-def _process_single_item(item, item_path, results):
-	"""Process a single item, whether primitive or complex."""
-	if isinstance(item, (dict, list)):
-		flatten_json(item, item_path, results)
+	Objects named by `meta.name` extend the path with the component name, and Java Date
+	objects held by an object are collapsed into a single `._JavaDate` timestamp.
+	"""
+	if isinstance(data, dict):
+		path = _get_component_path(data, path)
+		for key, value in data.items():
+			current_path = f"{path}.{key}" if path else key
+			if isinstance(value, dict) and _is_java_date_object(value):
+				yield f"{current_path}._JavaDate", _extract_java_date_timestamp(value)
+			else:
+				yield current_path, value
 	else:
-		results[item_path] = item
+		for index, item in enumerate(data):
+			yield f"{path}[{index}]", item
 
 
 def flatten_json(data, path="", results=None):
 	"""
-	Recursively flattens a JSON-like dictionary into path-to-value pairs.
+	Flattens a JSON-like dictionary into path-to-value pairs.
+
+	The document is walked depth-first with an explicit stack of item iterators rather
+	than by recursion, so no nesting depth can exhaust the interpreter's recursion limit.
 
 	Args:
 		data (dict): The JSON data to flatten.
-		path (str): The current path being traversed (used internally).
-		results (dict): The dictionary to store the results (used internally).
+		path (str): The path of data in the document, prefixed to every key.
+		results (dict): The dictionary to store the results in (a new one by default).
 
 	Returns:
 		dict: A flattened dictionary where keys are paths and values are primitive values.
 	"""
 	if results is None:
 		results = OrderedDict()
-
-	if isinstance(data, dict):
-		path = _get_component_path(data, path)
-		for key, value in data.items():
-			_process_dict_item(key, value, path, results)
-	elif isinstance(data, list):
-		base_path = path if path else ""
-		for index, item in enumerate(data):
-			item_path = f"{base_path}[{index}]" if base_path else f"[{index}]"
-			_process_single_item(item, item_path, results)
+	if not isinstance(data, (dict, list)):
+		return results
+
+	stack = [_iter_items(data, path)]
+	while stack:
+		for item_path, value in stack[-1]:
+			if isinstance(value, (dict, list)):
+				stack.append(_iter_items(value, item_path))
+				break
+			results[item_path] = value
+		else:
+			stack.pop()
 
 	return results
 
 
-def flatten_file(file_path):
+class _PathNode:
+	"""
+	Path of a container whose rendering waits for the end of the streaming pass.
+
+	A component's `meta.name` usually comes after its `children` (keys are written in
+	alphabetical order), so the paths below an object are only known once it is closed.
+	"""
+	__slots__ = ('parent', 'key', 'name', 'path')
+
+	def __init__(self, parent, key):
+		self.parent = parent  # Node of the enclosing container, None for the document
+		self.key = key  # Key in the enclosing object, or index in the enclosing array
+		self.name = None  # Component name from meta.name
+		self.path = None
+
+	def resolve(self):
+		"""Render the path; the parent must be resolved already."""
+		path = _child_path(self.parent.path, self.key) if self.parent is not None else ""
+		if self.name:
+			path = f"{path}.{self.name}" if path else self.name
+		self.path = path
+
+
+def _child_path(path, key):
+	"""Path of the value at a key (or array index) of the container at path."""
+	if isinstance(key, int):
+		return f"{path}[{key}]"
+	return f"{path}.{key}" if path else key
+
+
+@dataclass
+class _MapFrame:
+	"""Per-object bookkeeping for the streaming pass."""
+	node: _PathNode
+	start: int  # Number of pairs emitted before the object, to drop them for a Java Date
+	meta_owner: Optional[_PathNode]  # Node of the object whose "meta" this is
+	key: Optional[str] = None
+	key_count: int = 0
+	date_candidate: bool = True
+	date_marker: bool = False  # "$" holds a valid ["ts", precision, nanos] list
+	timestamp: Any = None
+
+
+@dataclass
+class _ArrayFrame:
+	"""Per-array bookkeeping for the streaming pass."""
+	node: _PathNode
+	date_owner: Optional[_MapFrame]  # Map frame whose "$" value this array is, if any
+	index: int = 0
+	items: list = field(default_factory=list)
+
+
+def _next_key(frame):
+	"""Return the key or index of the value starting in a container, advancing the array index."""
+	if isinstance(frame, _MapFrame):
+		return frame.key
+	frame.index += 1
+	return frame.index - 1
+
+
+def _on_key(frame, key):
+	"""Record an object key: anything but "$" and "$ts" rules out a Java Date."""
+	frame.key = sys.intern(key)  # Keys are kept until the end of the file, and views repeat them a lot
+	frame.key_count += 1
+	if key not in ('$', '$ts') or frame.key_count > 2:
+		frame.date_candidate = False
+
+
+def _on_value(frame, value):
+	"""Record a scalar: a component name, a Java Date timestamp, or an item of a Java Date marker."""
+	if isinstance(frame, _MapFrame):
+		if frame.key == 'name' and frame.meta_owner is not None and value:
+			frame.meta_owner.name = value
+		elif frame.key == '$ts' and isinstance(value, (int, float)):
+			frame.timestamp = value
+		elif frame.key in ('$', '$ts'):
+			frame.date_candidate = False
+	elif frame.date_owner is not None:
+		frame.items.append(value)
+
+
+def _on_start(parent, is_map, node, start):
+	"""Open a frame for a container; a container value rules out the Java Date it belongs to."""
+	if isinstance(parent, _ArrayFrame) and parent.date_owner is not None:
+		parent.date_owner.date_candidate = False
+	elif isinstance(parent, _MapFrame) and (parent.key == '$ts' or (parent.key == '$' and is_map)):
+		parent.date_candidate = False
+
+	if is_map:
+		is_meta = isinstance(parent, _MapFrame) and parent.key == 'meta'
+		return _MapFrame(node, start, parent.node if is_meta else None)
+	is_marker = isinstance(parent, _MapFrame) and parent.key == '$' and parent.date_candidate
+	return _ArrayFrame(node, parent if is_marker else None)
+
+
+def _on_end_array(frame):
+	"""Close an array: check it is a valid ["ts", precision, nanos] Java Date marker."""
+	owner = frame.date_owner
+	if owner is not None and owner.date_candidate:
+		items = frame.items
+		owner.date_marker = (
+			len(items) == 3 and items[0] == "ts" and isinstance(items[1], (int, float)) and
+			isinstance(items[2], (int, float))
+		)
+
+
+def _is_java_date_frame(frame):
+	"""Check whether a closed object was a Java Date, as _is_java_date_object does."""
+	return frame.date_candidate and frame.date_marker and frame.timestamp is not None and frame.key_count == 2
+
+
+def _collect_pairs(events):
+	"""
+	Streaming pass: collect (container node, key, value) for every scalar, in document order.
+
+	Java Date objects held by an object are collapsed as soon as they close. The pairs keep
+	a reference to their container's node instead of a rendered path, so component names
+	found later still apply to them.
+
+	Returns:
+		tuple: (nodes, pairs) where nodes lists every container in document order.
+	"""
+	nodes = []
+	pairs = ([], [], [])  # Container nodes, keys and values, kept apart to save a tuple per scalar
+	containers, keys, values = pairs
+	stack = []
+
+	for event, value in events:
+		if event == MAP_KEY:
+			_on_key(stack[-1], value)
+		elif event == VALUE:
+			if stack:
+				frame = stack[-1]
+				containers.append(frame.node)
+				keys.append(_next_key(frame))
+				values.append(value)
+				_on_value(frame, value)
+		elif event in (START_MAP, START_ARRAY):
+			parent = stack[-1] if stack else None
+			node = _PathNode(parent.node, _next_key(parent)) if parent else _PathNode(None, None)
+			nodes.append(node)
+			stack.append(_on_start(parent, event == START_MAP, node, len(values)))
+		elif event == END_ARRAY:
+			_on_end_array(stack.pop())
+		else:  # END_MAP
+			frame = stack.pop()
+			if stack and isinstance(stack[-1], _MapFrame) and _is_java_date_frame(frame):
+				for column in pairs:
+					del column[frame.start:]
+				containers.append(frame.node.parent)
+				keys.append(f"{frame.node.key}._JavaDate")
+				values.append(frame.timestamp)
+
+	return nodes, pairs
+
+
+def iter_flatten_file(file_path, chunk_size=DEFAULT_CHUNK_SIZE):
+	"""
+	Flatten a JSON file incrementally, straight from the byte stream.
+
+	Unlike read_json_file + flatten_json, the nested document is never materialized: the
+	file is tokenized once, and each scalar is kept with a reference to its container
+	until the end of the file, when every component name is known and the paths can be
+	rendered. Pairs are released as they are yielded, so a caller that collects them
+	(flatten_file, the CLI) peaks at about the size of the flattened view.
+
+	Args:
+		file_path: Path to the JSON file.
+		chunk_size (int): Number of bytes to read at a time.
+
+	Yields:
+		tuple: (path, value) pairs identical to those produced by flatten_json.
+
+	Raises:
+		json.JSONDecodeError: If the file is not valid JSON (or not valid UTF-8).
+	"""
+	with Path(file_path).resolve().open("rb") as file:
+		nodes, pairs = _collect_pairs(iter_json_events(file, chunk_size))
+	# Parents come before their children, so one pass in document order resolves every path
+	for node in nodes:
+		node.resolve()
+	del nodes
+	containers, keys, values = pairs
+	for column in pairs:
+		column.reverse()
+	while values:
+		yield _child_path(containers.pop().path, keys.pop()), values.pop()
+
+
+def flatten_file(file_path, streaming=False):
 	"""Flatten a JSON file and return sorted results.
 
 	Args:
 		file_path: Path to the JSON file.
+		streaming (bool): Flatten incrementally without building the JSON tree.
 
 	Returns:
 		OrderedDict: Sorted flattened JSON data.
 	"""
+	if streaming:
+		return OrderedDict(sorted(iter_flatten_file(file_path)))
 	json_data = read_json_file(file_path)
 	flat_json = flatten_json(json_data)
 	return OrderedDict(sorted(flat_json.items()))
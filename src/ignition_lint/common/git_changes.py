@@ -0,0 +1,127 @@
+"""
+This module asks the local git repository which view files changed, so that CI and pre-commit
+runs can lint only those instead of every view in the tree.
+
+Only the git CLI is used, against local refs: nothing is fetched. Added, modified, copied and
+renamed view.json files are reported (a renamed view under its new path); deleted ones are not,
+as there is nothing left to lint.
+
+For the index, what a view contains in the next commit can differ from the working tree file, so
+staged_copies() checks the staged content out into a temporary directory to be linted instead.
+"""
+
+import contextlib
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+VIEW_FILE_NAME = 'view.json'
+
+# Statuses of files that still exist after the change: added, copied, modified, renamed, type changed
+_LINTABLE_STATUSES = 'ACMRT'
+
+
+class GitError(Exception):
+	"""Raised when git cannot list the changed files: git is missing, not in a repository, or an unknown ref."""
+
+
+def _run_git(args: List[str], cwd: Optional[str] = None, stdin: Optional[str] = None) -> str:
+	"""Run a git command, with the given standard input, and return its output."""
+	try:
+		completed = subprocess.run(['git', *args], cwd=cwd, input=stdin, capture_output=True, text=True, check=False)
+	except FileNotFoundError as e:
+		raise GitError("git is not installed or not on the PATH") from e
+	if completed.returncode != 0:
+		raise GitError(completed.stderr.strip() or f"git {' '.join(args)} failed")
+	return completed.stdout
+
+
+def _parse_name_status(output: str) -> List[str]:
+	"""Return the paths that still exist from `git diff --name-status -z` output (new paths of renames and copies)."""
+	fields = output.split('\0')
+	paths = []
+	index = 0
+	while index < len(fields) and fields[index]:
+		status = fields[index]
+		# Renames and copies list the old and the new path, other changes a single path
+		path_count = 2 if status[0] in 'RC' else 1
+		if status[0] in _LINTABLE_STATUSES:
+			paths.append(fields[index + path_count])
+		index += 1 + path_count
+	return paths
+
+
+def changed_view_files(since: Optional[str] = None, staged: bool = False, cwd: Optional[str] = None) -> List[Path]:
+	"""
+	Return the view files that changed, relative to the working directory when they are below it.
+
+	Args:
+		since: A commit-ish; files changed since its merge base with HEAD are returned, including
+			uncommitted and untracked changes in the working tree (what a branch adds over `since`).
+		staged: Return the files changed in the index instead (what the next commit adds), including
+			those deleted from the working tree since; lint their content from staged_copies().
+		cwd: Directory inside the repository; defaults to the current directory.
+
+	Raises:
+		GitError: If git fails, e.g. outside a repository or for an unknown ref.
+	"""
+	if staged == (since is not None):
+		raise ValueError("Pass exactly one of since and staged")
+
+	root = Path(_run_git(['rev-parse', '--show-toplevel'], cwd=cwd).strip())
+	diff_args = ['diff', '--name-status', '-z', '--find-renames', '--no-ext-diff']
+	if staged:
+		paths = _parse_name_status(_run_git([*diff_args, '--cached'], cwd=root))
+	else:
+		merge_base = _run_git(['merge-base', since, 'HEAD'], cwd=root).strip()
+		paths = _parse_name_status(_run_git([*diff_args, merge_base], cwd=root))
+		paths += _run_git(['ls-files', '--others', '--exclude-standard', '-z'], cwd=root).split('\0')
+
+	working_dir = Path(cwd or os.getcwd()).resolve()
+	view_files = []
+	for path in dict.fromkeys(paths):
+		if Path(path).name != VIEW_FILE_NAME:
+			continue
+		file_path = root / path
+		# Outside the index, a file deleted from the working tree has nothing to lint
+		if not staged and not file_path.is_file():
+			continue
+		try:
+			file_path = file_path.resolve().relative_to(working_dir)
+		except ValueError:
+			pass
+		view_files.append(file_path)
+	return view_files
+
+
+@contextlib.contextmanager
+def staged_copies(file_paths: List[Path], cwd: Optional[str] = None) -> Iterator[Dict[Path, Path]]:
+	"""
+	Check the content of files in the index out into a temporary directory, removed on exit.
+
+	Args:
+		file_paths: Files in the repository, as returned by changed_view_files(staged=True).
+		cwd: Directory inside the repository the paths are relative to; defaults to the current directory.
+
+	Yields:
+		The path of each file's staged copy, by file path.
+
+	Raises:
+		GitError: If git fails, e.g. for a file that is not in the index.
+	"""
+	working_dir = Path(cwd or os.getcwd()).resolve()
+	root = Path(_run_git(['rev-parse', '--show-toplevel'], cwd=cwd).strip()).resolve()
+	repo_paths = {
+		file_path: Path(os.path.normpath(working_dir / file_path)).relative_to(root).as_posix()
+		for file_path in file_paths
+	}
+	with tempfile.TemporaryDirectory(prefix='ignition-lint-staged-') as temp_dir:
+		if repo_paths:
+			_run_git(
+				['checkout-index', f"--prefix={temp_dir}{os.sep}", '-z', '--stdin'],
+				cwd=root,
+				stdin=''.join(f"{path}\0" for path in repo_paths.values())
+			)
+		yield {file_path: Path(temp_dir) / path for file_path, path in repo_paths.items()}
@@ -0,0 +1,98 @@
+"""
+This module provides the JSON decode backends used to read view files.
+
+Files are read as raw bytes (no text-mode decode step) and parsed into plain dicts, which
+keep insertion order. When orjson is installed it is used automatically; files above
+MMAP_THRESHOLD are then memory-mapped and handed to the parser without an intermediate copy.
+Without orjson, the stdlib json module parses the bytes directly.
+"""
+
+import json
+import mmap
+import os
+from typing import Any, Callable, NamedTuple
+
+try:
+	import orjson  # pylint: disable=import-error
+except ImportError:
+	orjson = None
+
+# Files at least this large are memory-mapped when the backend can parse a buffer in place
+MMAP_THRESHOLD = 1024 * 1024
+
+AUTO_BACKEND = "auto"
+
+
+class JsonBackend(NamedTuple):
+	"""A JSON decoder that parses UTF-8 bytes."""
+	name: str
+	loads: Callable[[Any], Any]
+	accepts_buffer: bool  # Can parse a memoryview (e.g. over an mmap) without copying it
+
+
+def _load_stdlib(data) -> Any:
+	"""Parse bytes with the stdlib decoder (UTF-8/16/32 and a UTF-8 BOM are detected)."""
+	return json.loads(data)
+
+
+def _load_orjson(data) -> Any:
+	"""Parse bytes or a buffer with orjson, deferring to the stdlib for what orjson rejects."""
+	# pylint: disable=no-member  # orjson is a compiled extension pylint cannot introspect
+	try:
+		return orjson.loads(data)
+	except orjson.JSONDecodeError:
+		# orjson is strict (no NaN/Infinity, no integers beyond 64 bits, no BOM); the stdlib
+		# accepts those and raises the same json.JSONDecodeError for genuinely invalid input
+		return json.loads(bytes(data))
+
+
+BACKENDS = {"stdlib": JsonBackend("stdlib", _load_stdlib, False)}
+if orjson is not None:
+	BACKENDS["orjson"] = JsonBackend("orjson", _load_orjson, True)
+
+
+def get_backend(name: str = None) -> JsonBackend:
+	"""
+	Resolve a backend by name.
+
+	Args:
+		name: "orjson", "stdlib", or None/"auto" for the fastest installed backend.
+
+	Returns:
+		JsonBackend: The selected backend.
+
+	Raises:
+		ValueError: If the named backend is unknown or not installed.
+	"""
+	if name in (None, AUTO_BACKEND):
+		return BACKENDS.get("orjson", BACKENDS["stdlib"])
+	if name not in BACKENDS:
+		raise ValueError(f"JSON backend '{name}' is not available (installed: {', '.join(sorted(BACKENDS))})")
+	return BACKENDS[name]
+
+
+def load_json_file(file_path, backend: str = None, mmap_threshold: int = MMAP_THRESHOLD) -> Any:
+	"""
+	Read and parse a JSON file from raw bytes.
+
+	Args:
+		file_path: Path to the JSON file.
+		backend: Backend name, see get_backend.
+		mmap_threshold: Size in bytes from which files are memory-mapped (buffer-capable backends only).
+
+	Returns:
+		The parsed JSON document, with objects as plain dicts.
+
+	Raises:
+		OSError: If the file cannot be read.
+		json.JSONDecodeError: If the file is not valid JSON.
+	"""
+	json_backend = get_backend(backend)
+	with open(file_path, "rb") as file:
+		size = os.fstat(file.fileno()).st_size
+		if json_backend.accepts_buffer and size and size >= mmap_threshold:
+			with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+				# Release the view before the map is closed
+				with memoryview(mapped) as buffer:
+					return json_backend.loads(buffer)
+		return json_backend.loads(file.read())
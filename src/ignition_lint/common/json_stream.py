@@ -0,0 +1,262 @@
+"""
+This module provides an incremental JSON tokenizer that turns a byte (or text) stream
+into a flat sequence of parse events without ever building the nested document.
+
+Only one chunk of the input plus the largest single scalar value is held in memory at a
+time, so the tokenizer's own memory stays roughly constant regardless of the size of the
+view file; what a consumer keeps of the events is up to it.
+"""
+
+import codecs
+import json
+import re
+from json.decoder import scanstring
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Parse event names (same vocabulary as ijson)
+START_MAP = "start_map"
+END_MAP = "end_map"
+START_ARRAY = "start_array"
+END_ARRAY = "end_array"
+MAP_KEY = "map_key"
+VALUE = "value"
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER = re.compile(r'(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?')
+_LITERALS = {
+	'true': True,
+	'false': False,
+	'null': None,
+	'NaN': float('nan'),
+	'Infinity': float('inf'),
+	'-Infinity': float('-inf'),
+}
+_LONGEST_LITERAL = max(len(literal) for literal in _LITERALS)
+
+# Tokenizer states
+_EXPECT_VALUE = 0
+_EXPECT_VALUE_OR_END = 1  # Right after '['
+_EXPECT_KEY_OR_END = 2  # Right after '{'
+_EXPECT_KEY = 3  # After ',' inside an object
+_EXPECT_COLON = 4
+_EXPECT_DELIMITER = 5  # After a complete value
+
+
+class _ChunkReader:
+	"""Sliding text window over a stream that is refilled on demand."""
+
+	def __init__(self, stream, chunk_size: int):
+		self._stream = stream
+		self._chunk_size = chunk_size
+		self._decoder = None
+		self.buffer = ""
+		self.pos = 0
+		self.eof = False
+		# Position of the window in the whole document, for error messages
+		self.offset = 0  # Characters before the window
+		self.line = 0  # Line breaks before the window
+		self.column = 0  # Characters between the last of those line breaks and the window
+
+	def fill(self, size: int = None):
+		"""Read another chunk, discarding everything before the current position."""
+		data = self._stream.read(size or self._chunk_size)
+		self._discard()
+		if isinstance(data, bytes):
+			if self._decoder is None:
+				self._decoder = codecs.getincrementaldecoder("utf-8")()
+			try:
+				text = self._decoder.decode(data, final=not data)
+			except UnicodeDecodeError as e:
+				# Keep the text before the offending byte, so the error points at it
+				self.buffer += e.object[:e.start].decode("utf-8")
+				self.pos = len(self.buffer)
+				raise self.error(f"Invalid UTF-8 data ({e.reason})") from None
+		else:
+			text = data
+		if not data:
+			self.eof = True
+		self.buffer += text
+
+	def _discard(self):
+		"""Drop the consumed part of the window, keeping track of where the window starts."""
+		line_breaks = self.buffer.count('\n', 0, self.pos)
+		if line_breaks:
+			self.line += line_breaks
+			self.column = self.pos - self.buffer.rfind('\n', 0, self.pos) - 1
+		else:
+			self.column += self.pos
+		self.offset += self.pos
+		self.buffer = self.buffer[self.pos:]
+		self.pos = 0
+
+	def peek(self) -> str:
+		"""Skip whitespace and return the next significant character ('' at end of input)."""
+		if self.pos < len(self.buffer):
+			char = self.buffer[self.pos]
+			if char not in ' \t\n\r':
+				return char
+		while True:
+			self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+			if self.pos < len(self.buffer):
+				return self.buffer[self.pos]
+			if self.eof:
+				return ""
+			self.fill()
+
+	def read_string(self) -> str:
+		"""Read the string starting at the current '"', refilling until it is complete."""
+		read_size = self._chunk_size
+		while True:
+			try:
+				value, self.pos = scanstring(self.buffer, self.pos + 1, True)
+				return value
+			except json.JSONDecodeError as e:
+				if self.eof:
+					raise self.error(e.msg, e.pos) from None
+				# Grow the read size so very long strings are scanned a logarithmic number of times
+				self.fill(read_size)
+				read_size *= 2
+
+	def read_scalar(self):
+		"""Read a number or literal starting at the current position."""
+		while not self.eof and len(self.buffer) - self.pos < _LONGEST_LITERAL:
+			self.fill()
+
+		for literal, value in _LITERALS.items():
+			if self.buffer.startswith(literal, self.pos):
+				self.pos += len(literal)
+				return value
+
+		while True:
+			match = _NUMBER.match(self.buffer, self.pos)
+			if match is None:
+				raise self.error("Expecting value")
+			# A number touching the end of the window may continue in the next chunk
+			if not self.eof and len(self.buffer) - match.end() <= 2:
+				self.fill()
+				continue
+			integer, fraction, exponent = match.groups()
+			self.pos = match.end()
+			if fraction or exponent:
+				return float(integer + (fraction or '') + (exponent or ''))
+			return int(integer)
+
+	def error(self, message: str, pos: int = None) -> json.JSONDecodeError:
+		"""
+		Build a decode error pointing at a position in the window (the current one by default).
+
+		The line, column and character offset are those in the whole document, as the json
+		module reports them.
+		"""
+		pos = self.pos if pos is None else pos
+		line_breaks = self.buffer.count('\n', 0, pos)
+		lineno = self.line + line_breaks + 1
+		colno = pos - self.buffer.rfind('\n', 0, pos) if line_breaks else self.column + pos + 1
+		error = json.JSONDecodeError(message, self.buffer, pos)
+		error.pos, error.lineno, error.colno = self.offset + pos, lineno, colno
+		error.args = (f"{message}: line {lineno} column {colno} (char {error.pos})",)
+		return error
+
+
+def _close(reader, containers) -> tuple:
+	"""Consume the closing bracket of the innermost container and return its end event."""
+	reader.pos += 1
+	return _EXPECT_DELIMITER, (END_MAP if containers.pop() == '{' else END_ARRAY, None)
+
+
+def _after_value(reader, containers, char) -> tuple:
+	"""Handle the delimiter after a complete value inside a container."""
+	if char == ',':
+		reader.pos += 1
+		return (_EXPECT_KEY if containers[-1] == '{' else _EXPECT_VALUE), None
+	if char == _CLOSING[containers[-1]]:
+		return _close(reader, containers)
+	raise reader.error("Expecting ',' delimiter")
+
+
+def _after_key(reader, _containers, char) -> tuple:
+	"""Handle the colon after an object key."""
+	if char != ':':
+		raise reader.error("Expecting ':' delimiter")
+	reader.pos += 1
+	return _EXPECT_VALUE, None
+
+
+def _key(reader, _containers, char) -> tuple:
+	"""Read an object key."""
+	if char != '"':
+		raise reader.error("Expecting property name enclosed in double quotes")
+	return _EXPECT_COLON, (MAP_KEY, reader.read_string())
+
+
+def _key_or_end(reader, containers, char) -> tuple:
+	"""Read the first key of an object, or close an empty one."""
+	if char == '}':
+		return _close(reader, containers)
+	return _key(reader, containers, char)
+
+
+def _value(reader, containers, char) -> tuple:
+	"""Read a value: open a container, or read a scalar."""
+	if char in _CLOSING:
+		containers.append(char)
+		reader.pos += 1
+		return _OPENED[char]
+	if char == '"':
+		return _EXPECT_DELIMITER, (VALUE, reader.read_string())
+	if not char:
+		raise reader.error("Expecting value")
+	return _EXPECT_DELIMITER, (VALUE, reader.read_scalar())
+
+
+def _value_or_end(reader, containers, char) -> tuple:
+	"""Read the first value of an array, or close an empty one."""
+	if char == ']':
+		return _close(reader, containers)
+	return _value(reader, containers, char)
+
+
+_CLOSING = {'{': '}', '[': ']'}
+_OPENED = {'{': (_EXPECT_KEY_OR_END, (START_MAP, None)), '[': (_EXPECT_VALUE_OR_END, (START_ARRAY, None))}
+
+# Token handlers by tokenizer state: (reader, containers, next character) -> (next state, event or None)
+_STATE_HANDLERS = {
+	_EXPECT_VALUE: _value,
+	_EXPECT_VALUE_OR_END: _value_or_end,
+	_EXPECT_KEY_OR_END: _key_or_end,
+	_EXPECT_KEY: _key,
+	_EXPECT_COLON: _after_key,
+	_EXPECT_DELIMITER: _after_value,
+}
+
+
+def iter_json_events(stream, chunk_size: int = DEFAULT_CHUNK_SIZE):
+	"""
+	Tokenize a JSON document incrementally.
+
+	Args:
+		stream: File-like object opened in binary (UTF-8) or text mode.
+		chunk_size: Number of bytes/characters to read at a time.
+
+	Yields:
+		tuple: (event, value) pairs where event is one of START_MAP, END_MAP, START_ARRAY,
+		END_ARRAY, MAP_KEY or VALUE. Value is the key for MAP_KEY, the scalar for VALUE and
+		None otherwise.
+
+	Raises:
+		json.JSONDecodeError: If the document is not valid JSON (or not valid UTF-8).
+	"""
+	reader = _ChunkReader(stream, chunk_size)
+	containers = []
+	state = _EXPECT_VALUE
+
+	while True:
+		char = reader.peek()
+		if state == _EXPECT_DELIMITER and not containers:
+			if char:
+				raise reader.error("Extra data")
+			return
+		state, event = _STATE_HANDLERS[state](reader, containers, char)
+		if event is not None:
+			yield event
@@ -0,0 +1,367 @@
+"""
+This module records where linting time goes, for the CLI's --profile option.
+
+A Profiler collects spans: timed sections of work, each in one of three categories. A file span
+covers everything done for one view. Phase spans cover reading and modelling it: JSON decode,
+flattening, building the model, cache lookups. Rule spans cover a rule visiting its nodes (with
+the number of nodes it visited) and its post-processing. Every span has its wall and CPU time.
+
+A MemoryProfiler, for --memory-profile, also measures with tracemalloc how much memory each
+span allocated at its peak and kept allocated at its end, and where the memory held at the end
+of the most demanding phase or rule was allocated.
+
+Spans are plain tuples, so --jobs workers send theirs back to the main process with their
+results. They can be totalled per name for the end-of-run reports, or written as a Chrome trace
+(chrome://tracing, https://ui.perfetto.dev) with one lane per process.
+"""
+
+import contextlib
+import gc
+import json
+import os
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+FILE = 'file'
+PHASE = 'phase'
+RULE = 'rule'
+
+# Ratio of a view's model size to its file size above which a memory report flags the file
+DEFAULT_MAX_MODEL_RATIO = 10.0
+
+
+class ProfileSpan(NamedTuple):
+	"""A timed section of work."""
+	name: str
+	category: str
+	# time.perf_counter_ns() at the start; the clock is system-wide, so spans of different processes line up
+	start_ns: int
+	wall_ns: int
+	cpu_ns: int
+	pid: int
+	args: Dict[str, Any]
+	# Name of the file span this span belongs to (its own name for a file span), or None
+	file: Optional[str] = None
+
+
+class SpanTotal(NamedTuple):
+	"""The combined time of the spans sharing a name."""
+	name: str
+	wall_ns: int
+	cpu_ns: int
+	count: int
+	nodes: int
+
+
+class Profiler:
+	"""Collect spans of the work done in this process."""
+
+	def __init__(self):
+		self.spans: List[ProfileSpan] = []
+		self._file = None
+
+	@contextlib.contextmanager
+	def span(self, name: str, category: str, **args) -> Iterator[Dict[str, Any]]:
+		"""
+		Time the work done inside the block as a span.
+
+		Yields the span's args, which the block can add to (e.g. a node count known only once done).
+		"""
+		parent_file = self._file
+		if category == FILE:
+			self._file = name
+		self._begin(category)
+		start_ns = time.perf_counter_ns()
+		start_cpu_ns = time.thread_time_ns()
+		try:
+			yield args
+		finally:
+			wall_ns = time.perf_counter_ns() - start_ns
+			cpu_ns = time.thread_time_ns() - start_cpu_ns
+			self._end(category, args)
+			self.spans.append(ProfileSpan(name, category, start_ns, wall_ns, cpu_ns, os.getpid(), args, self._file))
+			self._file = parent_file
+
+	def take(self) -> List[ProfileSpan]:
+		"""Return the spans recorded so far and forget them."""
+		spans, self.spans = self.spans, []
+		return spans
+
+	def close(self):
+		"""Stop measuring (nothing to release)."""
+
+	def _begin(self, category: str):
+		"""Start measuring a span; called before its block runs."""
+
+	def _end(self, category: str, args: Dict[str, Any]):
+		"""Finish measuring a span, adding to its args; called after its block has run."""
+
+
+class MemoryProfiler(Profiler):
+	"""
+	Collect spans that also measure memory, with tracemalloc (started if not already tracing).
+
+	Each span's args get peak_bytes, the most memory it had allocated at once, and
+	retained_bytes, what it still had allocated at its end (negative if it freed memory
+	allocated before it), both counted from what was allocated when it started. Garbage is
+	collected before each file span, so the memory freed in a file is the file's own. A phase or
+	rule span with a larger peak than any before it in this process also gets allocation_sites:
+	the lines that allocated the most memory still held at its end.
+	"""
+
+	def __init__(self, site_count: int = 10):
+		"""
+		Args:
+			site_count: Number of allocation sites to record.
+		"""
+		super().__init__()
+		self.site_count = site_count
+		self._started_tracing = not tracemalloc.is_tracing()
+		if self._started_tracing:
+			tracemalloc.start()
+		# Memory allocated at the start of each open span, and the highest allocation seen since
+		self._open = []
+		self._largest_peak = 0
+
+	def close(self):
+		"""Stop tracemalloc, if this profiler started it."""
+		if self._started_tracing and tracemalloc.is_tracing():
+			tracemalloc.stop()
+
+	def _begin(self, category: str):
+		if category == FILE:
+			# Free the garbage of earlier files now, rather than have it freed (and counted) in this one
+			gc.collect()
+		current, peak = tracemalloc.get_traced_memory()
+		# tracemalloc has a single peak: fold it into the enclosing span before restarting it for this one
+		if self._open:
+			self._open[-1][1] = max(self._open[-1][1], peak)
+		tracemalloc.reset_peak()
+		self._open.append([current, current])
+
+	def _end(self, category: str, args: Dict[str, Any]):
+		current, peak = tracemalloc.get_traced_memory()
+		start, highest = self._open.pop()
+		highest = max(highest, peak)
+		if self._open:
+			self._open[-1][1] = max(self._open[-1][1], highest)
+		args['peak_bytes'] = highest - start
+		args['retained_bytes'] = current - start
+		if category != FILE and args['peak_bytes'] > self._largest_peak:
+			self._largest_peak = args['peak_bytes']
+			args['allocation_sites'] = self._allocation_sites()
+			tracemalloc.reset_peak()  # Leave out the snapshot taken for the sites
+
+	def _allocation_sites(self) -> List[Dict[str, Any]]:
+		"""Return the lines that allocated the most memory currently held."""
+		snapshot = tracemalloc.take_snapshot().filter_traces(
+			(tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+		)
+		return [{
+			'site': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+			'bytes': stat.size,
+			'count': stat.count,
+		} for stat in snapshot.statistics('lineno')[:self.site_count]]
+
+
+def profile_span(profiler: Optional[Profiler], name: str, category: str, **args):
+	"""Return profiler.span(...), or a block that records nothing without a profiler."""
+	if profiler is None:
+		return contextlib.nullcontext(args)
+	return profiler.span(name, category, **args)
+
+
+def summarize(spans: Iterable[ProfileSpan], category: str, key: Optional[str] = None) -> List[SpanTotal]:
+	"""
+	Total the spans of a category, slowest first.
+
+	Args:
+		spans: Spans to total.
+		category: Category of the spans to total.
+		key: Argument to group the spans by (e.g. "rule"); defaults to their names.
+	"""
+	totals = {}
+	for span in spans:
+		if span.category != category:
+			continue
+		name = span.name if key is None else span.args.get(key, span.name)
+		wall_ns, cpu_ns, count, nodes = totals.get(name, (0, 0, 0, 0))
+		totals[name] = (wall_ns + span.wall_ns, cpu_ns + span.cpu_ns, count + 1, nodes + span.args.get('nodes', 0))
+	return sorted(
+		(SpanTotal(name, *total) for name, total in totals.items()), key=lambda total: total.wall_ns, reverse=True
+	)
+
+
+def _memory_totals(spans: Iterable[ProfileSpan], category: str, key: Optional[str] = None) -> List[Dict[str, Any]]:
+	"""Combine the memory measured by the spans of a category sharing a name (or the key argument), largest peak first."""
+	totals = {}
+	for span in spans:
+		if span.category != category or 'peak_bytes' not in span.args:
+			continue
+		name = span.name if key is None else span.args.get(key, span.name)
+		total = totals.setdefault(name, {'name': name, 'count': 0, 'peak_bytes': 0, 'retained_bytes': 0})
+		total['count'] += 1
+		total['peak_bytes'] = max(total['peak_bytes'], span.args['peak_bytes'])
+		total['retained_bytes'] += span.args['retained_bytes']
+	return sorted(totals.values(), key=lambda total: total['peak_bytes'], reverse=True)
+
+
+def memory_report(spans: List[ProfileSpan], max_model_ratio: float) -> Dict[str, Any]:
+	"""
+	Summarize the memory measured by a MemoryProfiler, as JSON-compatible data.
+
+	Files are listed largest peak first, each with the memory its model takes and the ratio of
+	that to the file's size on disk; files with a higher ratio than max_model_ratio are flagged.
+	The model size is the peak of its build_model phase rather than what the phase retained,
+	which is less whatever the builder released of the previous view. Phases and rules are listed with their largest
+	peak and their total retained memory, and the allocation sites are those of the span with
+	the largest peak.
+	"""
+	model_bytes = {}
+	for span in spans:
+		if span.category == PHASE and span.name == 'build_model' and span.file is not None and 'peak_bytes' in span.args:
+			model_bytes[span.file] = max(model_bytes.get(span.file, 0), span.args['peak_bytes'])
+
+	files = []
+	for span in spans:
+		if span.category != FILE or 'peak_bytes' not in span.args:
+			continue
+		file_bytes = span.args.get('file_bytes', 0)
+		model = model_bytes.get(span.name)
+		ratio = round(model / file_bytes, 2) if model is not None and file_bytes else None
+		files.append({
+			'file': span.name,
+			'file_bytes': file_bytes,
+			'peak_bytes': span.args['peak_bytes'],
+			'retained_bytes': span.args['retained_bytes'],
+			'model_bytes': model,
+			'model_ratio': ratio,
+			'flagged': ratio is not None and ratio > max_model_ratio,
+		})
+	files.sort(key=lambda file: file['peak_bytes'], reverse=True)
+
+	sites_span = max(
+		(span for span in spans if 'allocation_sites' in span.args), key=lambda span: span.args['peak_bytes'], default=None
+	)
+	return {
+		'max_model_ratio': max_model_ratio,
+		'files': files,
+		'phases': _memory_totals(spans, PHASE),
+		'rules': _memory_totals(spans, RULE, key='rule'),
+		'allocation_sites': {
+			'span': sites_span.name,
+			'file': sites_span.file,
+			'peak_bytes': sites_span.args['peak_bytes'],
+			'sites': sites_span.args['allocation_sites'],
+		} if sites_span is not None else None,
+	}
+
+
+def _milliseconds(nanoseconds: int) -> str:
+	return f"{nanoseconds / 1e6:10.1f} ms"
+
+
+def print_time_report(profiler: Profiler, top: int):
+	"""Print the time spent per phase, and the slowest files and rules, from a profiled run."""
+	print("\n⏱️  Profile (wall time, CPU time):")
+
+	phases = summarize(profiler.spans, PHASE)
+	if phases:
+		print("  Phases:")
+		for total in phases:
+			print(f"    {total.name:<16}{_milliseconds(total.wall_ns)}{_milliseconds(total.cpu_ns)}   {total.count}×")
+
+	files = summarize(profiler.spans, FILE)
+	if files:
+		print(f"  Slowest files (top {min(top, len(files))} of {len(files)}):")
+		for rank, total in enumerate(files[:top], 1):
+			print(f"    {rank:>2}. {_milliseconds(total.wall_ns)}{_milliseconds(total.cpu_ns)}   {total.name}")
+
+	rules = summarize(profiler.spans, RULE, key='rule')
+	if rules:
+		print(f"  Slowest rules (top {min(top, len(rules))} of {len(rules)}):")
+		for rank, total in enumerate(rules[:top], 1):
+			print(
+				f"    {rank:>2}. {_milliseconds(total.wall_ns)}{_milliseconds(total.cpu_ns)}   "
+				f"{total.name} ({total.nodes} nodes)"
+			)
+
+
+def _megabytes(byte_count: Optional[int]) -> str:
+	return f"{byte_count / 2**20:9.2f} MB" if byte_count is not None else f"{'-':>12}"
+
+
+def print_memory_report(report: Dict[str, Any], top: int):
+	"""Print the peak and retained memory per phase, rule and file, and the top allocation sites, of a memory profile."""
+	print("\n🧠 Memory profile (peak allocated, retained at the end):")
+
+	if report['phases']:
+		print("  Phases:")
+		for total in report['phases']:
+			print(f"    {total['name']:<16}{_megabytes(total['peak_bytes'])}{_megabytes(total['retained_bytes'])}   {total['count']}×")
+
+	if report['rules']:
+		print(f"  Rules (top {min(top, len(report['rules']))} of {len(report['rules'])}):")
+		for rank, total in enumerate(report['rules'][:top], 1):
+			print(f"    {rank:>2}. {_megabytes(total['peak_bytes'])}{_megabytes(total['retained_bytes'])}   {total['name']}")
+
+	files = report['files']
+	if files:
+		print(f"  Files (top {min(top, len(files))} of {len(files)}; model size and its ratio to the file size):")
+		for rank, file in enumerate(files[:top], 1):
+			ratio = f"{file['model_ratio']:.1f}×" if file['model_ratio'] is not None else "-"
+			print(
+				f"    {rank:>2}. {_megabytes(file['peak_bytes'])}{_megabytes(file['retained_bytes'])}"
+				f"{_megabytes(file['model_bytes'])} {ratio:>8}   {file['file']}"
+			)
+
+	sites = report['allocation_sites']
+	if sites:
+		location = f" in {sites['file']}" if sites['file'] else ""
+		print(f"  Top allocation sites (memory held after {sites['span']}{location}):")
+		for site in sites['sites']:
+			print(f"    {_megabytes(site['bytes'])} {site['count']:>9} blocks   {site['site']}")
+
+	flagged = [file for file in files if file['flagged']]
+	if flagged:
+		print(f"  ⚠️  {len(flagged)} files have models over {report['max_model_ratio']:g}× their size on disk:")
+		for file in flagged:
+			print(f"    • {file['file']}: {_megabytes(file['model_bytes']).strip()} model, {file['model_ratio']:.1f}× its size")
+
+
+def chrome_trace(spans: List[ProfileSpan], main_pid: Optional[int] = None) -> Dict[str, Any]:
+	"""
+	Convert spans to the Chrome trace event format, with one lane per process.
+
+	Args:
+		spans: Spans to convert.
+		main_pid: Process id of the main process, named "main" (other processes are numbered workers).
+	"""
+	origin_ns = min((span.start_ns for span in spans), default=0)
+	events = []
+	lanes = {}
+	for span in sorted(spans, key=lambda span: span.start_ns):
+		if span.pid not in lanes:
+			lanes[span.pid] = 'main' if span.pid == main_pid else f"worker {sum(pid != main_pid for pid in lanes) + 1}"
+		events.append({
+			'name': span.name,
+			'cat': span.category,
+			'ph': 'X',
+			'ts': (span.start_ns - origin_ns) / 1000,
+			'dur': span.wall_ns / 1000,
+			'pid': span.pid,
+			'tid': span.pid,
+			'args': {**span.args, 'cpu_ms': round(span.cpu_ns / 1e6, 3)},
+		})
+	for sort_index, (pid, lane) in enumerate(lanes.items()):
+		events.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': pid, 'args': {'name': lane}})
+		events.append({'name': 'process_sort_index', 'ph': 'M', 'pid': pid, 'tid': pid, 'args': {'sort_index': sort_index}})
+	return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def write_chrome_trace(spans: List[ProfileSpan], path: Path, main_pid: Optional[int] = None):
+	"""Write spans to a file in the Chrome trace event format (see chrome_trace)."""
+	with open(path, 'w', encoding='utf-8') as f:
+		json.dump(chrome_trace(spans, main_pid), f)
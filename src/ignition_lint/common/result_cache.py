@@ -0,0 +1,416 @@
+"""
+This module implements the on-disk caches used by the CLI, which share one cache directory.
+
+ResultCache stores a file's lint results under a key that combines the hash of the file's
+content, the hash of the normalized rule configuration, and a fingerprint of the source of
+every module the configured rules are implemented in (plus the model and engine modules they
+run on). Editing a view, the configuration or a rule therefore never returns stale results.
+
+ModelCache stores the flattened view and the model built from it, keyed only by the content
+hash and a fingerprint of the flattening and model building code, so changing the rule
+configuration still reuses them and only the rules run again. Model entries are compressed
+pickles signed with a key kept in the user's cache directory, outside any repository; an
+entry whose signature does not match (e.g. one committed to a repository) is never unpickled.
+
+To avoid re-hashing files that have not changed, the content hash of each file is kept
+alongside its size and modification time, and reused while both are unchanged.
+
+A cache directory created by a cache is marked with a CACHEDIR.TAG, which backup tools skip
+and clear() requires before deleting anything, and a .gitignore keeping it out of git.
+
+Entries are written atomically, so several processes (--jobs workers) can share a cache
+directory. Results, models and hash records are each kept under their own size limit by
+evicting the least recently used entries, so large models never evict results.
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import pickle
+import secrets
+import shutil
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from ..linter import LintResults
+from ..model.view_model import ViewModel
+
+DEFAULT_CACHE_DIR = ".ignition-lint-cache"
+
+# Default limit on the size of each of the result, model and hash record directories
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# Bump when the layout or the content of cache entries changes
+CACHE_FORMAT_VERSION = 3
+
+# File marking a directory as a cache (https://bford.info/cachedir/); clear() refuses a directory without it
+CACHE_MARKER = 'CACHEDIR.TAG'
+_CACHE_MARKER_CONTENT = b"Signature: 8a477f597d28d172789f06886806bc55\n# This directory is a cache created by ignition-lint.\n"
+
+# Subdirectories of a cache directory holding results, models and content hash records
+_CACHE_SUBDIRS = ('results', 'models', 'files')
+
+# Modules every rule's results depend on, besides the rule's own classes
+_CORE_MODULES = (
+	'ignition_lint.linter',
+	'ignition_lint.common.flatten_json',
+	'ignition_lint.model.builder',
+	'ignition_lint.model.node_types',
+	'ignition_lint.model.view_model',
+)
+
+# Modules that read a view and build its model
+_MODEL_MODULES = (
+	'ignition_lint.common.flat_index',
+	'ignition_lint.common.flatten_json',
+	'ignition_lint.common.json_backend',
+	'ignition_lint.model.builder',
+	'ignition_lint.model.node_types',
+	'ignition_lint.model.view_model',
+)
+
+
+def _hash_bytes(data: bytes) -> str:
+	return hashlib.sha256(data).hexdigest()
+
+
+def _hash_json(value: Any) -> str:
+	return _hash_bytes(json.dumps(value, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8'))
+
+
+def rules_fingerprint(rules: Iterable[Any]) -> str:
+	"""
+	Fingerprint the implementation of the given rule instances.
+
+	Hashes the source of every module defining a class in each rule's MRO, together with the
+	engine and model modules, and the version of any package those modules import (e.g. pylint),
+	so that a change to any code that can affect results changes it.
+	"""
+	module_names = set(_CORE_MODULES)
+	for rule in rules:
+		for cls in type(rule).__mro__:
+			if cls.__module__ != 'builtins':
+				module_names.add(cls.__module__)
+	return _modules_fingerprint(module_names)
+
+
+def model_fingerprint() -> str:
+	"""Fingerprint the code that builds view models, and the Python running it."""
+	return _hash_bytes(f"{sys.version}:{_modules_fingerprint(_MODEL_MODULES)}".encode('utf-8'))
+
+
+def _modules_fingerprint(module_names: Iterable[str]) -> str:
+	"""Hash the source of the given (imported) modules and the versions of the packages they import."""
+	digest = hashlib.sha256(f"format:{CACHE_FORMAT_VERSION}".encode('utf-8'))
+	for module_name in sorted(module_names):
+		module = sys.modules.get(module_name)
+		module_file = getattr(module, '__file__', None)
+		digest.update(module_name.encode('utf-8'))
+		if module_file:
+			try:
+				digest.update(Path(module_file).read_bytes())
+			except OSError:
+				pass
+		for value in vars(module).values() if module else ():
+			if isinstance(value, ModuleType):
+				package = sys.modules.get(value.__name__.partition('.')[0])
+				version = getattr(package, '__version__', None)
+				if isinstance(version, str):
+					digest.update(f"{package.__name__}=={version}".encode('utf-8'))
+	return digest.hexdigest()
+
+
+# Length of the key signing model entries, and of the signature prefixing each entry
+_SIGNATURE_BYTES = 32
+
+
+def default_key_path() -> Path:
+	"""Return the path of the key signing model cache entries, in the user's cache directory."""
+	cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+	return Path(cache_home) / 'ignition-lint' / 'model-cache.key'
+
+
+def load_signing_key(key_path: Path) -> Optional[bytes]:
+	"""
+	Return the key signing model cache entries, creating it on first use.
+
+	Returns:
+		The key, or None if it can neither be read nor created, which disables the model cache
+	"""
+	if key_path.exists():
+		return _read_signing_key(key_path)
+
+	try:
+		key_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+		fd, temp_path = tempfile.mkstemp(dir=key_path.parent, prefix='.tmp-')
+	except OSError:
+		return None
+	try:
+		with os.fdopen(fd, 'wb') as f:
+			f.write(secrets.token_bytes(_SIGNATURE_BYTES))
+		# Linking fails if another process created the key first; every process then uses that one
+		os.link(temp_path, key_path)
+	except FileExistsError:
+		pass
+	except OSError:
+		return None
+	finally:
+		Path(temp_path).unlink(missing_ok=True)
+	return _read_signing_key(key_path)
+
+
+def _read_signing_key(key_path: Path) -> Optional[bytes]:
+	try:
+		key = key_path.read_bytes()
+	except OSError:
+		return None
+	return key if len(key) == _SIGNATURE_BYTES else None
+
+
+def _write_atomic(path: Path, data: bytes):
+	"""Write a file so that concurrent readers see either the old or the new content."""
+	path.parent.mkdir(parents=True, exist_ok=True)
+	# The name is chosen before the file exists, so that an interruption at any point (e.g. by a
+	# time budget, which raises a BaseException) leaves nothing behind once the file is removed
+	temp_path = path.parent / f".tmp-{secrets.token_hex(8)}"
+	try:
+		with open(temp_path, 'xb') as f:
+			f.write(data)
+		os.replace(temp_path, path)
+	except BaseException:
+		temp_path.unlink(missing_ok=True)
+		raise
+
+
+def _create_cache_dir(cache_dir: Path):
+	"""
+	Create a cache directory, marking it as a cache and ignoring it in git.
+
+	A directory that already exists is only marked if it is empty, so that a --cache-dir pointing at
+	a directory holding other files never becomes one clear() may empty.
+	"""
+	try:
+		cache_dir.mkdir(parents=True)
+	except FileExistsError:
+		if (cache_dir / CACHE_MARKER).exists() or any(cache_dir.iterdir()):
+			return
+	_write_atomic(cache_dir / '.gitignore', b"*\n")
+	_write_atomic(cache_dir / CACHE_MARKER, _CACHE_MARKER_CONTENT)
+
+
+class _CacheDirectory:
+	"""Cache entries in a subdirectory of a cache directory, with the content hash records and pruning they share."""
+
+	# Subdirectory holding this cache's entries
+	ENTRIES_DIR = ''
+
+	def __init__(self, cache_dir: str, max_bytes: int):
+		"""
+		Args:
+			cache_dir: Directory holding the cache; created on first write.
+			max_bytes: Size this cache's entries, and the hash records, are each pruned down to by prune().
+		"""
+		self.cache_dir = Path(cache_dir)
+		self.max_bytes = max_bytes
+		self._entries_dir = self.cache_dir / self.ENTRIES_DIR
+		self._files_dir = self.cache_dir / 'files'
+		self._created = False
+
+	def _create(self):
+		"""Create the cache directory before the first write to it."""
+		if not self._created:
+			_create_cache_dir(self.cache_dir)
+			self._created = True
+
+	def content_hash(self, file_path: Path) -> str:
+		"""
+		Return the hash of a file's content.
+
+		The hash recorded for the file is reused while its size and modification time are
+		unchanged; otherwise the file is read and hashed, and the record updated.
+		"""
+		stat = file_path.stat()
+		record_path = self._files_dir / f"{_hash_bytes(str(file_path.resolve()).encode('utf-8'))}.json"
+		try:
+			record = json.loads(record_path.read_text(encoding='utf-8'))
+			if record['mtime_ns'] == stat.st_mtime_ns and record['size'] == stat.st_size:
+				os.utime(record_path)  # Mark as recently used
+				return record['sha256']
+		except (OSError, ValueError, KeyError, TypeError):
+			pass
+
+		content_hash = _hash_bytes(file_path.read_bytes())
+		try:
+			self._create()
+			_write_atomic(
+				record_path,
+				json.dumps({'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': content_hash}).encode('utf-8')
+			)
+		except OSError:
+			pass  # The cache is an optimization; a read-only location only costs re-hashing
+		return content_hash
+
+	def _read_entry(self, file_name: str) -> Optional[bytes]:
+		"""Return the content of an entry, marking it as recently used, or None if there is none."""
+		entry_path = self._entries_dir / file_name
+		try:
+			data = entry_path.read_bytes()
+			os.utime(entry_path)  # Mark as recently used
+		except OSError:
+			return None
+		return data
+
+	def _write_entry(self, file_name: str, data: bytes):
+		try:
+			self._create()
+			_write_atomic(self._entries_dir / file_name, data)
+		except OSError:
+			pass  # As for hash records, failing to store an entry only costs doing the work again
+
+	def prune(self):
+		"""Evict the least recently used entries of this cache, and hash records, until each fits in max_bytes."""
+		for directory in (self._entries_dir, self._files_dir):
+			_prune_directory(directory, self.max_bytes)
+
+	def clear(self):
+		"""
+		Delete the entries of every cache in the cache directory, and the hash records.
+
+		Only the subdirectories the caches write are removed, and only from a directory marked as a cache.
+
+		Raises:
+			ValueError: If the cache directory exists but is not marked as a cache.
+		"""
+		if not self.cache_dir.exists():
+			return
+		if not (self.cache_dir / CACHE_MARKER).is_file():
+			raise ValueError(f"Not clearing {self.cache_dir}: it is not an ignition-lint cache directory (no {CACHE_MARKER})")
+		for name in _CACHE_SUBDIRS:
+			shutil.rmtree(self.cache_dir / name, ignore_errors=True)
+
+
+def _prune_directory(directory: Path, max_bytes: int):
+	"""Evict the least recently used files of a directory until it fits in max_bytes."""
+	if not directory.is_dir():
+		return
+	entries = []
+	total = 0
+	for entry in os.scandir(directory):
+		try:
+			stat = entry.stat()
+		except OSError:
+			continue
+		entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+		total += stat.st_size
+
+	for _, size, path in sorted(entries):
+		if total <= max_bytes:
+			break
+		try:
+			os.unlink(path)
+			total -= size
+		except OSError:
+			pass
+
+
+class ResultCache(_CacheDirectory):
+	"""Cache of per-file lint results, keyed by file content, rule configuration and rule implementation."""
+
+	ENTRIES_DIR = 'results'
+
+	def __init__(
+		self,
+		cache_dir: str = DEFAULT_CACHE_DIR,
+		config: Optional[Dict[str, Any]] = None,
+		rules: Iterable[Any] = (),
+		max_bytes: int = DEFAULT_MAX_BYTES
+	):
+		"""
+		Args:
+			cache_dir: Directory holding the cache; created on first write.
+			config: The rule configuration the results are produced with.
+			rules: The rule instances built from that configuration.
+			max_bytes: Size this cache's entries, and the hash records, are each pruned down to by prune().
+		"""
+		super().__init__(cache_dir, max_bytes)
+		self._context_hash = _hash_json({'config': config or {}, 'rules': rules_fingerprint(rules)})
+
+	def key_for(self, file_path: Path) -> str:
+		"""Return the cache key for a file's results under this cache's configuration and rules."""
+		return _hash_bytes(f"{self.content_hash(file_path)}:{self._context_hash}".encode('utf-8'))
+
+	def get(self, key: str) -> Optional[LintResults]:
+		"""Return the cached results for a key, or None on a miss."""
+		data = self._read_entry(f"{key}.json")
+		if data is None:
+			return None
+		try:
+			entry = json.loads(data)
+			return LintResults(warnings=entry['warnings'], errors=entry['errors'], has_errors=bool(entry['errors']))
+		except (ValueError, KeyError, TypeError):
+			return None
+
+	def put(self, key: str, results: LintResults):
+		"""Store the results for a key."""
+		self._write_entry(
+			f"{key}.json", json.dumps({'warnings': results.warnings, 'errors': results.errors}).encode('utf-8')
+		)
+
+
+class ModelCache(_CacheDirectory):
+	"""Cache of the view data and the complete model built from each file, keyed by file content and model code."""
+
+	ENTRIES_DIR = 'models'
+
+	def __init__(
+		self,
+		cache_dir: str = DEFAULT_CACHE_DIR,
+		max_bytes: int = DEFAULT_MAX_BYTES,
+		key_path: Optional[Path] = None
+	):
+		"""
+		Args:
+			cache_dir: Directory holding the cache; created on first write.
+			max_bytes: Size this cache's entries, and the hash records, are each pruned down to by prune().
+			key_path: File holding the key entries are signed with (default: default_key_path()).
+		"""
+		super().__init__(cache_dir, max_bytes)
+		self._context_hash = model_fingerprint()
+		self._signing_key = load_signing_key(default_key_path() if key_path is None else Path(key_path))
+
+	def key_for(self, file_path: Path) -> str:
+		"""Return the cache key for the model of a file."""
+		return _hash_bytes(f"{self.content_hash(file_path)}:{self._context_hash}".encode('utf-8'))
+
+	def _sign(self, key: str, payload: bytes) -> bytes:
+		"""Return the signature of an entry's payload, bound to the key it is stored under."""
+		return hmac.new(self._signing_key, key.encode('utf-8') + b':' + payload, hashlib.sha256).digest()
+
+	def get(self, key: str) -> Optional[Tuple[Dict[str, Any], ViewModel]]:
+		"""Return the cached view data and model for a key, or None on a miss or an entry this user did not write."""
+		if self._signing_key is None:
+			return None
+		data = self._read_entry(f"{key}.pickle")
+		if data is None:
+			return None
+		signature, payload = data[:_SIGNATURE_BYTES], data[_SIGNATURE_BYTES:]
+		if not hmac.compare_digest(signature, self._sign(key, payload)):
+			return None  # Never unpickle an entry that was not signed with this user's key
+		try:
+			view_data, view_model = pickle.loads(zlib.decompress(payload))
+		except Exception:  # pylint: disable=broad-exception-caught
+			return None  # An entry from an incompatible build is a miss; unpickling can raise almost anything
+		return view_data, view_model
+
+	def put(self, key: str, view_data: Dict[str, Any], view_model: ViewModel):
+		"""Store the view data and the complete model built from it for a key, signed."""
+		if self._signing_key is None:
+			return
+		# Level 1 compresses the pickle about 8x while keeping decompression cheap next to unpickling
+		payload = zlib.compress(pickle.dumps((view_data, view_model), protocol=pickle.HIGHEST_PROTOCOL), 1)
+		self._write_entry(f"{key}.pickle", self._sign(key, payload) + payload)
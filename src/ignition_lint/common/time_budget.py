@@ -0,0 +1,148 @@
+"""
+This module runs work that must not take longer than a time budget, for per-rule timeouts and
+--max-file-time.
+
+The work runs in a child process forked from the caller, so it starts with everything the caller
+holds (the view model, the configured rules) without any of it being pickled, and only its result
+is sent back. A child still running when its budget runs out is killed. Nothing is interrupted in
+the caller's process: no signal handler or hook is installed, third-party code such as pylint is
+never stopped in the middle of a call, and whatever the work changed in memory is discarded with
+the child, so the caller's objects are never left half updated. Work must therefore return
+everything the caller needs from it.
+
+The child of the outermost budget leads a process group of its own, so killing it also kills the
+processes it started, including the children of budgets nested in it (a rule's inside a file's).
+The temporary files the work creates with the tempfile module (such as the file pylint checks)
+go into a directory of the child's own, which is removed once the child has ended.
+
+Forking needs os.fork; on platforms without it, the work runs in the caller's process, without a
+budget.
+"""
+
+import multiprocessing
+import os
+import shutil
+import signal
+import tempfile
+import traceback
+from typing import Any, Callable
+
+_FORK_AVAILABLE = 'fork' in multiprocessing.get_all_start_methods()
+
+# Whether this process is the child of a budget; the children of nested budgets stay in its process group
+_in_budget_child = False  # pylint: disable=invalid-name  # Set in children as they start
+
+
+class BudgetExceeded(Exception):
+	"""Raised when work ran past its time budget and was killed."""
+
+	def __init__(self, seconds: float):
+		super().__init__(f"The work exceeded its time budget of {seconds:g}s and was killed")
+		self.seconds = seconds
+
+
+class _ChildTraceback(Exception):
+	"""The traceback of an exception raised in a child, attached to it as its cause."""
+
+	def __init__(self, text: str):
+		super().__init__(text)
+		self.text = text
+
+	def __str__(self) -> str:
+		return f"\n\"\"\"\n{self.text}\"\"\""
+
+
+def budgets_enforced() -> bool:
+	"""Check if budgets are enforced on this platform (work runs without one otherwise)."""
+	return _FORK_AVAILABLE
+
+
+def run_within_budget(seconds: float, function: Callable[..., Any], *args) -> Any:
+	"""
+	Run function(*args) in a child process, killing it if it takes longer than seconds.
+
+	Args:
+		seconds: Time the work may take.
+		function: The work; it need not be picklable, but what it returns or raises must be.
+		*args: Arguments of the work.
+
+	Returns:
+		What the work returned.
+
+	Raises:
+		BudgetExceeded: If the work ran past its budget.
+		ValueError: If seconds is not positive.
+		Whatever the work raised, with the child's traceback as its cause.
+	"""
+	if seconds <= 0:
+		raise ValueError(f"A time budget must be positive, got {seconds}")
+	if not _FORK_AVAILABLE:
+		return function(*args)
+
+	context = multiprocessing.get_context('fork')
+	reader, writer = context.Pipe(duplex=False)
+	leads_group = not _in_budget_child
+	temp_dir = tempfile.mkdtemp(prefix='ignition-lint-budget-')
+	process = context.Process(target=_run_child, args=(writer, leads_group, temp_dir, function, args))
+	process.start()
+	writer.close()
+	if leads_group:
+		_set_process_group(process.pid)
+	try:
+		if not reader.poll(seconds):
+			raise BudgetExceeded(seconds)
+		failed, value = reader.recv()
+	except EOFError:
+		process.join()
+		raise RuntimeError(f"The process doing the work exited with code {process.exitcode}") from None
+	except BaseException:
+		# Out of time, or interrupted (e.g. by Ctrl+C, which a child in its own process group does not get)
+		_kill(process, leads_group)
+		raise
+	finally:
+		reader.close()
+		process.join()
+		shutil.rmtree(temp_dir, ignore_errors=True)
+
+	if failed:
+		exception, text = value
+		raise exception from _ChildTraceback(text)
+	return value
+
+
+def _run_child(writer, leads_group: bool, temp_dir: str, function: Callable[..., Any], args: tuple):
+	"""Do the work in the child process and send back its result, or the exception it raised."""
+	global _in_budget_child  # pylint: disable=global-statement
+	_in_budget_child = True
+	if leads_group:
+		_set_process_group(0)
+	tempfile.tempdir = temp_dir
+	try:
+		message = (False, function(*args))
+	except BaseException as e:  # pylint: disable=broad-exception-caught  # Everything is handed to the caller
+		message = (True, (e, traceback.format_exc()))
+	try:
+		writer.send(message)
+	except Exception:  # pylint: disable=broad-exception-caught  # A result or exception that cannot be pickled
+		outcome = 'exception' if message[0] else 'result'
+		writer.send((True, (RuntimeError(f"The work's {outcome} cannot be sent back"), traceback.format_exc())))
+	writer.close()
+
+
+def _set_process_group(pid: int):
+	"""Make a process (0: this one) the leader of a new process group; both parent and child do, whichever runs first."""
+	try:
+		os.setpgid(pid, 0)
+	except OSError:
+		pass  # The child has already done it, or has exited
+
+
+def _kill(process: Any, leads_group: bool):
+	"""Kill a child, with the processes in its group if it leads one."""
+	if leads_group:
+		try:
+			os.killpg(process.pid, signal.SIGKILL)
+			return
+		except OSError:
+			pass  # Not leading its group yet
+	process.kill()
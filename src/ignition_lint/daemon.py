@@ -0,0 +1,317 @@
+"""
+This module implements the lint daemon and its client, used with --use-daemon.
+
+Starting the CLI costs most of a second before the first view is read: importing pylint and
+astroid, discovering and validating every rule, and loading the configuration. The daemon pays
+that once. It is a background process, one per working directory, that listens on a Unix
+socket and runs each client's command line in-process, keeping its lint engines (rules and
+pylint state) between runs; a changed configuration file gets a new engine.
+
+The client is deliberately light (this module imports nothing from the linter at import time):
+it sends its arguments to the daemon, starting one if none is running, and prints the output it
+gets back. Each request carries a fingerprint of the package sources, so a daemon running code
+that has since been upgraded or edited shuts down and the client starts a fresh one. A daemon
+also exits after DEFAULT_IDLE_TIMEOUT seconds without requests.
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import socket
+import sys
+import time
+from stat import S_IMODE, S_ISDIR
+from typing import Any, Dict, List, Optional
+
+# The client runs on every hook invocation: modules only the daemon or the first start need
+# (argparse, subprocess, tempfile, traceback) are imported where used, and paths are plain strings
+# rather than pathlib objects, to keep its startup to the interpreter's own
+
+# Seconds without a request after which the daemon exits
+DEFAULT_IDLE_TIMEOUT = 900
+
+# Seconds the client waits for a daemon it started to accept connections
+_START_TIMEOUT = 15
+
+_PACKAGE_DIR = os.path.dirname(os.path.realpath(__file__))
+
+
+def daemon_supported() -> bool:
+	"""Check if the platform has Unix sockets (and per-user socket directories)."""
+	return hasattr(socket, 'AF_UNIX') and hasattr(os, 'getuid')
+
+
+def package_fingerprint() -> str:
+	"""Fingerprint the package sources, by path, size and modification time, and the interpreter running them."""
+	digest = hashlib.sha256(sys.executable.encode('utf-8'))
+	for dir_path, dir_names, file_names in os.walk(_PACKAGE_DIR):
+		dir_names[:] = sorted(name for name in dir_names if name != '__pycache__')
+		for file_name in sorted(file_names):
+			if file_name.endswith('.py'):
+				stat = os.stat(os.path.join(dir_path, file_name))
+				digest.update(f"{dir_path}/{file_name}:{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8'))
+	return digest.hexdigest()
+
+
+def socket_path(cwd: str) -> str:
+	"""
+	Return the socket of the daemon serving a working directory, in a directory only the user can access.
+
+	Raises:
+		PermissionError: If the socket directory exists but is not a directory (e.g. a symlink)
+			owned by the user with mode 0700; in a shared temporary directory, another user may
+			have created it first.
+	"""
+	runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+	if not runtime_dir or not os.path.isdir(runtime_dir):
+		import tempfile  # pylint: disable=import-outside-toplevel
+		runtime_dir = tempfile.gettempdir()
+	directory = os.path.join(runtime_dir, f"ignition-lint-{os.getuid()}")
+	os.makedirs(directory, mode=0o700, exist_ok=True)
+	directory_stat = os.lstat(directory)
+	if (
+		not S_ISDIR(directory_stat.st_mode) or directory_stat.st_uid != os.getuid()
+		or S_IMODE(directory_stat.st_mode) != 0o700
+	):
+		raise PermissionError(f"{directory} must be a directory owned by the current user with mode 0700")
+	return os.path.join(directory, f"{hashlib.sha256(os.path.realpath(cwd).encode('utf-8')).hexdigest()[:16]}.sock")
+
+
+def _exit_code(exit_request: SystemExit) -> int:
+	"""Return the process exit code a SystemExit stands for."""
+	if exit_request.code is None:
+		return 0
+	if isinstance(exit_request.code, int):
+		return exit_request.code
+	print(exit_request.code, file=sys.stderr)
+	return 1
+
+
+def _send(connection: socket.socket, message: Dict[str, Any]):
+	connection.sendall(json.dumps(message).encode('utf-8'))
+	connection.shutdown(socket.SHUT_WR)
+
+
+def _receive(connection: socket.socket) -> Dict[str, Any]:
+	chunks = []
+	while True:
+		chunk = connection.recv(65536)
+		if not chunk:
+			break
+		chunks.append(chunk)
+	return json.loads(b''.join(chunks))
+
+
+def _request(path: str, message: Dict[str, Any]) -> Dict[str, Any]:
+	"""Send a request to the daemon at path and return its reply."""
+	with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+		connection.connect(path)
+		_send(connection, message)
+		return _receive(connection)
+
+
+def _start_daemon(path: str, cwd: str):
+	"""Start a daemon for the working directory in the background, detached from this process."""
+	import subprocess  # pylint: disable=import-outside-toplevel
+	env = dict(os.environ)
+	# Make the package importable when running from a source checkout
+	env['PYTHONPATH'] = os.pathsep.join(filter(None, (os.path.dirname(_PACKAGE_DIR), env.get('PYTHONPATH'))))
+	subprocess.Popen(  # pylint: disable=consider-using-with  # The daemon outlives this process
+		[sys.executable, '-m', 'ignition_lint.daemon', '--socket', path],
+		cwd=cwd,
+		env=env,
+		stdin=subprocess.DEVNULL,
+		stdout=subprocess.DEVNULL,
+		stderr=subprocess.DEVNULL,
+		start_new_session=True,
+	)
+
+
+def _request_or_start(path: str, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+	"""Send a request, starting the daemon first if none is listening; None if it cannot be reached."""
+	try:
+		return _request(path, message)
+	except (FileNotFoundError, ConnectionRefusedError):
+		pass
+	_start_daemon(path, message['cwd'])
+	deadline = time.monotonic() + _START_TIMEOUT
+	while time.monotonic() < deadline:
+		try:
+			return _request(path, message)
+		except (FileNotFoundError, ConnectionRefusedError):
+			time.sleep(0.05)
+	return None
+
+
+def _run_locally(argv: List[str]) -> int:
+	"""Run a command line in this process, without the daemon."""
+	from .cli import main as cli_main  # pylint: disable=import-outside-toplevel,cyclic-import
+	try:
+		cli_main(argv)
+	except SystemExit as e:
+		return _exit_code(e)
+	return 0
+
+
+def run_client(argv: List[str]) -> int:
+	"""
+	Run a command line through the daemon of the working directory and return its exit code.
+
+	The daemon is started if none is running, and replaced if it runs other package sources.
+	Command lines the daemon cannot serve (--watch), and platforms without Unix sockets, are
+	run in this process instead.
+	"""
+	argv = [arg for arg in argv if arg != '--use-daemon']
+	if not daemon_supported():
+		return _run_locally(argv)
+
+	cwd = os.getcwd()
+	try:
+		path = socket_path(cwd)
+	except OSError as e:
+		print(f"⚠️  Cannot use the lint daemon ({e}), linting without it", file=sys.stderr)
+		return _run_locally(argv)
+	message = {'argv': argv, 'cwd': cwd, 'fingerprint': package_fingerprint()}
+	# A second attempt reaches the daemon started in place of an outdated one
+	for _ in range(2):
+		reply = _request_or_start(path, message)
+		if reply is None:
+			break
+		if reply['status'] == 'restart':
+			continue
+		if reply['status'] == 'local':
+			return _run_locally(argv)
+		sys.stdout.write(reply['stdout'])
+		sys.stderr.write(reply['stderr'])
+		return reply['exit_code']
+
+	print("⚠️  Could not reach the lint daemon, linting without it", file=sys.stderr)
+	return _run_locally(argv)
+
+
+class LintDaemon:
+	"""Serve lint requests on a Unix socket, one at a time, with lint engines kept between requests."""
+
+	def __init__(self, path: str, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+		"""
+		Args:
+			path: Socket to listen on.
+			idle_timeout: Seconds without a request after which serve_forever() returns.
+		"""
+		# Load the linter, its rules and pylint before the first request arrives
+		from .cli import build_parser, main as cli_main  # pylint: disable=import-outside-toplevel,cyclic-import
+		self._build_parser = build_parser
+		self._main = cli_main
+		self.path = path
+		self.idle_timeout = idle_timeout
+		self.fingerprint = package_fingerprint()
+		self._engines = {}
+		self._listener = None
+
+	def serve_forever(self):
+		"""Serve requests until idle for idle_timeout seconds or replaced by a newer daemon."""
+		if not self._listen():
+			return
+		try:
+			while True:
+				try:
+					connection, _ = self._listener.accept()
+				except socket.timeout:
+					return
+				with connection:
+					if not self._handle(connection):
+						return
+		finally:
+			self._close()
+
+	def _listen(self) -> bool:
+		"""Listen on the socket; return False if another daemon already serves it."""
+		if os.path.exists(self.path):
+			try:
+				with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+					probe.connect(self.path)
+				return False
+			except (ConnectionRefusedError, FileNotFoundError):
+				self._unlink()  # Left behind by a daemon that did not exit cleanly
+		listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		try:
+			listener.bind(self.path)
+		except OSError:
+			listener.close()
+			return False  # Another daemon started at the same time
+		listener.listen()
+		listener.settimeout(self.idle_timeout)
+		self._listener = listener
+		return True
+
+	def _close(self):
+		"""Stop listening, so that clients start a new daemon rather than queue for this one."""
+		if self._listener is not None:
+			self._listener.close()
+			self._listener = None
+			self._unlink()
+
+	def _unlink(self):
+		with contextlib.suppress(FileNotFoundError):
+			os.unlink(self.path)
+
+	def _handle(self, connection: socket.socket) -> bool:
+		"""Serve one request; return False if the daemon should exit."""
+		connection.settimeout(None)
+		try:
+			request = _receive(connection)
+			argv, cwd, fingerprint = request['argv'], request['cwd'], request['fingerprint']
+			os.chdir(cwd)
+		except (OSError, ValueError, KeyError, TypeError):
+			return True  # Not a request from a client (or its directory is gone); drop it and keep serving
+		if fingerprint != self.fingerprint:
+			self._close()
+			self._reply(connection, {'status': 'restart'})
+			return False
+
+		stdout = io.StringIO()
+		stderr = io.StringIO()
+		exit_code = 0
+		with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+			try:
+				if self._build_parser().parse_args(argv).watch:
+					self._reply(connection, {'status': 'local'})
+					return True
+				self._main(argv, engines=self._engines)
+			except SystemExit as e:
+				exit_code = _exit_code(e)
+			except Exception:  # pylint: disable=broad-exception-caught  # Report it and keep serving
+				import traceback  # pylint: disable=import-outside-toplevel
+				traceback.print_exc()
+				exit_code = 1
+		self._reply(
+			connection, {'status': 'ok', 'stdout': stdout.getvalue(), 'stderr': stderr.getvalue(), 'exit_code': exit_code}
+		)
+		return True
+
+	@staticmethod
+	def _reply(connection: socket.socket, message: Dict[str, Any]):
+		with contextlib.suppress(OSError):  # The client may have been interrupted
+			_send(connection, message)
+
+
+def main():
+	"""Run a daemon; started by clients (python -m ignition_lint.daemon --socket PATH)."""
+	import argparse  # pylint: disable=import-outside-toplevel
+	parser = argparse.ArgumentParser(description="Serve ignition-lint runs for --use-daemon clients")
+	parser.add_argument('--socket', required=True, help="Unix socket to listen on")
+	parser.add_argument(
+		'--idle-timeout',
+		type=float,
+		default=DEFAULT_IDLE_TIMEOUT,
+		help=f"Exit after this many seconds without a request (default: {DEFAULT_IDLE_TIMEOUT})",
+	)
+	args = parser.parse_args()
+	sys.argv[0] = 'ignition-lint'  # The program name in the usage and help output of served runs
+	LintDaemon(args.socket, args.idle_timeout).serve_forever()
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,18 @@
+"""
+Console entry point of ignition-lint.
+
+Runs with --use-daemon are handed to the daemon client before the linter is imported, so
+they do not pay for loading pylint and the rules; every other run goes to the CLI.
+"""
+import sys
+
+
+def main():
+	"""Run the daemon client for --use-daemon, otherwise the CLI."""
+	argv = sys.argv[1:]
+	if '--use-daemon' in argv:
+		from .daemon import run_client  # pylint: disable=import-outside-toplevel
+		sys.exit(run_client(argv))
+
+	from .cli import main as cli_main  # pylint: disable=import-outside-toplevel
+	cli_main(argv)
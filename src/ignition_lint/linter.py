@@ -4,12 +4,26 @@ It provides functionality to apply linting rules, collect errors, and analyze th
 It also includes methods for debugging nodes and analyzing rule impact on the view model.
 """
 
+import contextlib
+import io
 import json
+import os
+import sys
 from pathlib import Path
-from typing import Dict, List, Any, NamedTuple, Optional
-from .rules.common import LintingRule
+from typing import Dict, List, Any, NamedTuple, Optional, Set, Tuple
+from .rules.common import LintingRule, is_private_property
 from .model.builder import ViewModelBuilder
-from .model.node_types import NodeType, NodeUtils
+from .model.node_types import NodeType, ViewNode
+from .model.view_model import ViewModel, NODE_ORDER
+from .common.flat_index import FlatIndex
+from .common.profiler import PHASE, RULE, Profiler, profile_span
+from .common.time_budget import BudgetExceeded, budgets_enforced, run_within_budget
+
+# Ways of running the rules, selectable with LintEngine(execution_mode=...)
+EXECUTION_MODES = ('per-rule', 'fused')
+
+# Errors key of the diagnostics reported for rules that ran out of their time budget
+RULE_TIMEOUT_KEY = 'RuleTimeout'
 
 
 class LintResults(NamedTuple):
@@ -19,102 +33,358 @@ class LintResults(NamedTuple):
 	has_errors: bool
 
 
-class LintEngine:
+class LintEngine:  # pylint: disable=too-many-instance-attributes  # Per-view state is cached between entry points
 	"""Simplified linter engine that processes nodes more efficiently."""
 
-	def __init__(self, rules: List[LintingRule], debug_output_dir: Optional[str] = None):
+	def __init__(
+		self,
+		rules: List[LintingRule],
+		debug_output_dir: Optional[str] = None,
+		execution_mode: str = 'per-rule',
+		profiler: Optional[Profiler] = None
+	):
+		"""
+		Args:
+			rules: Rule instances to apply.
+			debug_output_dir: Optional directory for flattened JSON, model and statistics dumps.
+			execution_mode: 'per-rule' lets each rule walk its nodes in turn; 'fused' walks the
+				nodes once, calling every interested rule's handler for each node. Rules that
+				override process_nodes or process_applicable_nodes always run on their own.
+			profiler: Optional profiler recording the time spent building models and in each rule.
+		"""
+		if execution_mode not in EXECUTION_MODES:
+			raise ValueError(
+				f"Unknown execution mode '{execution_mode}', expected one of {', '.join(EXECUTION_MODES)}"
+			)
 		self.rules = rules
+		self.execution_mode = execution_mode
 		self.model_builder = ViewModelBuilder()
-		self.flattened_json = {}
-		self.view_model = {}
+		self._flattened_json = {}
+		self._flat_index = None
+		# The view data last passed in, and the model built from it for _model_collections
+		# (None: every collection), reused until a different view is passed
+		self._view_input = None
+		self._model = None
+		self._model_collections = None
+		self.view_model = ViewModel()
 		self.debug_output_dir = debug_output_dir
+		self.profiler = profiler
 
 		# Create debug output directory if specified
 		if self.debug_output_dir:
 			Path(self.debug_output_dir).mkdir(parents=True, exist_ok=True)
 
-	def get_view_model(self) -> Dict[str, List[Any]]:
-		"""Return the structured view model."""
-		return self.model_builder.build_model(self.flattened_json)
+	@property
+	def flattened_json(self) -> Dict[str, Any]:
+		"""The flattened view being linted."""
+		return self._flattened_json
+
+	@flattened_json.setter
+	def flattened_json(self, flattened_json: Dict[str, Any]):
+		self._flattened_json = flattened_json
+		self._flat_index = None
+		self._view_input = None
+		self._model = None
+
+	@property
+	def flat_index(self) -> FlatIndex:
+		"""Prefix index over the flattened view, shared by the builder and any rules implementing set_flat_index."""
+		if self._flat_index is None:
+			self._flat_index = FlatIndex(self.flattened_json)
+		return self._flat_index
+
+	def _set_view_input(self, view_data: Dict[str, Any]):
+		"""
+		Store the flattened view to lint.
+
+		Passing the same object again keeps the model already built from it, so the view data
+		must not be modified in place between calls.
+		"""
+		if view_data is self._view_input:
+			return
+		self.flattened_json = view_data
+		self._view_input = view_data
+
+	def set_view(self, view_data: Dict[str, Any], view_model: Optional[ViewModel] = None):
+		"""
+		Set the view to lint, optionally with the complete model already built from it (e.g. by a cache).
+
+		Later calls given the same view data object, such as process(), reuse that model.
+
+		Args:
+			view_data: Flattened view JSON.
+			view_model: The complete model of the view, or None to build it when needed.
+		"""
+		self._set_view_input(view_data)
+		if view_model is not None:
+			self._model = view_model
+			self._model_collections = None
+
+	def required_collections(self) -> Optional[Set[str]]:
+		"""Return the model collections needed by the configured rules, or None if any rule needs all of them."""
+		collections = set()
+		for rule in self.rules:
+			rule_collections = rule.required_collections
+			if rule_collections is None:
+				return None
+			collections |= rule_collections
+		return collections
+
+	def get_view_model(self, collections: Optional[Set[str]] = None) -> ViewModel:
+		"""
+		Return the structured view model.
+
+		The model is built once per view: later calls for the same view reuse it as long as it
+		holds the requested collections (a complete model serves every request).
+
+		Args:
+			collections: Model collections to build, or None for the complete model.
+		"""
+		if self._model is not None and (
+			self._model_collections is None or (collections is not None and set(collections) <= self._model_collections)
+		):
+			return self._model
+		with profile_span(self.profiler, 'build_model', PHASE) as span_args:
+			model = self.model_builder.build_model(self.flattened_json, index=self._flat_index, collections=collections)
+			span_args['nodes'] = model.total_nodes
+		self._model = model
+		self._model_collections = None if collections is None else frozenset(collections)
+		return model
 
 	def process(self, flattened_json: Dict[str, Any], source_file_path: Optional[str] = None) -> LintResults:
-		"""Lint the given flattened JSON and return warnings and errors."""
-		# Build the object model
-		self.flattened_json = flattened_json
-		self.view_model = self.get_view_model()
+		"""
+		Lint a view and return warnings and errors.
+
+		Args:
+			flattened_json: Flattened view JSON.
+			source_file_path: Path of the view file, used to name debug output files.
+		"""
+		# Build the object model, limited to what the rules need unless it is written out for debugging
+		self._set_view_input(flattened_json)
+		save_debug_files = bool(self.debug_output_dir and source_file_path)
+		self.view_model = self.get_view_model(None if save_debug_files else self.required_collections())
 
 		# Save debug information if debug output directory is configured
-		if self.debug_output_dir and source_file_path:
+		if save_debug_files:
 			self._save_debug_files(source_file_path)
 
-		# Collect all nodes in a flat list, excluding generic collections to avoid duplicates
-		# Generic collections ('bindings', 'scripts', 'event_handlers') are convenience collections
-		# that contain the same nodes as specific collections, causing duplicates
-		specific_collections = [
-			'components', 'message_handlers', 'custom_methods', 'expression_bindings',
-			'expression_struct_bindings', 'property_bindings', 'tag_bindings', 'query_bindings', 'script_transforms', 'event_handlers', 'properties'
-		]
-		all_nodes = []
-		for collection_name in specific_collections:
-			if collection_name in self.view_model:
-				all_nodes.extend(self.view_model[collection_name])
-
 		warnings = {}
 		errors = {}
 
-		# Apply each rule to the nodes
+		# The model already buckets nodes by type; only properties need splitting, once, into public
+		# and private, so that no rule has to check its nodes one by one
+		public_properties = [
+			node for node in self.view_model.nodes_of_type(NodeType.PROPERTY) if not is_private_property(node)
+		]
+
+		# Give rules access to flattened JSON if they need it
 		for rule in self.rules:
-			# Give rules access to flattened JSON if they need it
 			if hasattr(rule, 'set_flattened_json'):
 				rule.set_flattened_json(self.flattened_json)
+			if hasattr(rule, 'set_flat_index'):
+				rule.set_flat_index(self.flat_index)
 
-			# Let the rule process all nodes it's interested in
-			rule.process_nodes(all_nodes)
+		fused_rules = []
+		timed_out = []
+		if self.execution_mode == 'fused':
+			# Rules with a time budget run on their own, so that exceeding it aborts only them
+			fused_rules = [rule for rule in self.rules if self._can_fuse(rule) and rule.timeout_ms is None]
+			self._process_fused(fused_rules, public_properties)
+
+		# Apply each rule to the nodes
+		for rule in self.rules:
+			if rule in fused_rules:
+				rule_warnings, rule_errors = rule.warnings, rule.errors
+			else:
+				rule_results = self._process_rule_within_budget(rule, public_properties)
+				if rule_results is None:
+					# Its results are incomplete: report the timeout instead
+					timed_out.append(
+						f"{type(rule).__name__} exceeded its time budget of {rule.timeout_ms:g} ms and was aborted; "
+						"its results for this view are discarded"
+					)
+					continue
+				rule_warnings, rule_errors = rule_results
 
 			# Collect warnings from this rule
-			if rule.warnings:
-				warnings[rule.error_key] = rule.warnings
+			if rule_warnings:
+				warnings[rule.error_key] = rule_warnings
 
 			# Collect errors from this rule
-			if rule.errors:
-				errors[rule.error_key] = rule.errors
+			if rule_errors:
+				errors[rule.error_key] = rule_errors
+
+		if timed_out:
+			errors[RULE_TIMEOUT_KEY] = timed_out
 
 		return LintResults(warnings=warnings, errors=errors, has_errors=bool(errors))
 
+	def _process_rule_within_budget(
+		self, rule: LintingRule, public_properties: List[ViewNode]
+	) -> Optional[Tuple[List[str], List[str]]]:
+		"""
+		Run a rule and return its warnings and errors, or None if it exceeded its time budget.
+
+		A rule with a budget runs in a child process (see run_within_budget), which is killed once
+		the budget runs out; the rule instance in this process is left untouched either way.
+		"""
+		if rule.timeout_ms is None or not budgets_enforced():
+			self._process_rule(rule, public_properties)
+			return rule.warnings, rule.errors
+		try:
+			rule_warnings, rule_errors, output, spans = run_within_budget(
+				rule.timeout_ms / 1000, self._process_rule_in_child, rule, public_properties
+			)
+		except BudgetExceeded:
+			return None
+		sys.stdout.write(output)
+		if self.profiler is not None:
+			# The rule's spans belong in this process's lane, which waited for them
+			self.profiler.spans.extend(span._replace(pid=os.getpid()) for span in spans)
+		return rule_warnings, rule_errors
+
+	def _process_rule_in_child(self, rule: LintingRule, public_properties: List[ViewNode]) -> tuple:
+		"""Run a rule in the child process of its budget; return its warnings and errors, what it printed and its profile spans."""
+		if self.profiler is not None:
+			self.profiler.take()  # Only the rule's own spans are sent back
+		output = io.StringIO()
+		with contextlib.redirect_stdout(output):
+			self._process_rule(rule, public_properties)
+		return rule.warnings, rule.errors, output.getvalue(), self.profiler.take() if self.profiler is not None else []
+
+	def _process_rule(self, rule: LintingRule, public_properties: List[ViewNode]):
+		"""Let a rule process the nodes of the types it targets (all nodes if it targets none)."""
+		if type(rule).process_nodes is not LintingRule.process_nodes:
+			# Rules that override process_nodes keep working; their filtering finds nothing to drop
+			nodes = self._applicable_nodes(rule, public_properties)
+			rule_name = type(rule).__name__
+			with profile_span(self.profiler, f"{rule_name}.process_nodes", RULE, rule=rule_name, nodes=len(nodes)):
+				rule.process_nodes(nodes)
+			return
+
+		handlers = rule.visit_handlers()
+		nodes = self._applicable_nodes(rule, public_properties, handlers)
+		if self._can_fuse(rule):
+			self._visit_nodes(rule, nodes, handlers)
+		else:
+			rule.process_applicable_nodes(nodes)
+
+	@staticmethod
+	def _can_fuse(rule: LintingRule) -> bool:
+		"""Check if a rule can share a single traversal: it must process nodes through the standard hooks."""
+		return (
+			type(rule).process_nodes is LintingRule.process_nodes
+			and type(rule).process_applicable_nodes is LintingRule.process_applicable_nodes
+		)
+
+	def _visit_nodes(self, rule: LintingRule, nodes: List[ViewNode], handlers: Dict[NodeType, Any]):
+		"""Run a rule as process_applicable_nodes does, timing its node visits and its post-processing apart."""
+		rule_name = type(rule).__name__
+		with profile_span(self.profiler, f"{rule_name}.process_nodes", RULE, rule=rule_name, nodes=len(nodes)):
+			rule.begin_processing()
+			for node in nodes:
+				handler = handlers[node.node_type]
+				if handler is not None:
+					handler(node)
+		with profile_span(self.profiler, f"{rule_name}.post_process", RULE, rule=rule_name):
+			rule.finish_processing()
+
+	def _process_fused(self, rules: List[LintingRule], public_properties: List[ViewNode]):
+		"""
+		Run rules in a single pass over the nodes, calling every interested rule's handler for each node.
+
+		Each rule sees the same nodes, in the same order, as when it processes them on its own.
+		When profiling, the shared pass is timed as a whole; each rule's post-processing apart.
+		"""
+		# Handlers subscribed to each node type; property handlers are split by whether they see private properties
+		subscribers = {node_type: [] for node_type in NODE_ORDER}
+		private_property_handlers = []
+		# Number of nodes each rule visits, for the profile
+		node_counts = {}
+		for rule in rules:
+			rule.begin_processing()
+			node_counts[rule] = 0
+			for node_type, handler in rule.visit_handlers().items():
+				if handler is None or (rule.target_node_types and node_type not in rule.target_node_types):
+					continue
+				if node_type is NodeType.PROPERTY and rule.include_private_properties:
+					private_property_handlers.append(handler)
+					node_counts[rule] += len(self.view_model.nodes_of_type(node_type))
+				else:
+					subscribers[node_type].append(handler)
+					node_counts[rule] += len(
+						public_properties if node_type is NodeType.PROPERTY else self.view_model.nodes_of_type(node_type)
+					)
+
+		with profile_span(self.profiler, 'fused_visit', PHASE, nodes=sum(node_counts.values())):
+			for node_type in NODE_ORDER:
+				handlers = subscribers[node_type]
+				if node_type is NodeType.PROPERTY and private_property_handlers:
+					self._visit_all_properties(handlers, private_property_handlers)
+					continue
+				if not handlers:
+					continue
+				nodes = public_properties if node_type is NodeType.PROPERTY else self.view_model.nodes_of_type(node_type)
+				for node in nodes:
+					for handler in handlers:
+						handler(node)
+
+		for rule in rules:
+			rule_name = type(rule).__name__
+			with profile_span(self.profiler, f"{rule_name}.post_process", RULE, rule=rule_name, nodes=node_counts[rule]):
+				rule.finish_processing()
+
+	def _visit_all_properties(self, public_handlers: List[Any], private_handlers: List[Any]):
+		"""Visit properties when some rules include private ones: those rules see all, the others only public ones."""
+		all_handlers = public_handlers + private_handlers
+		for node in self.view_model.nodes_of_type(NodeType.PROPERTY):
+			for handler in private_handlers if is_private_property(node) else all_handlers:
+				handler(node)
+
+	def _applicable_nodes(
+		self, rule: LintingRule, public_properties: List[ViewNode], handlers: Optional[Dict[NodeType, Any]] = None
+	) -> List[ViewNode]:
+		"""
+		Return the union of the rule's target type buckets, in visiting order.
+
+		Args:
+			rule: The rule to collect nodes for.
+			public_properties: The model's properties without private ones.
+			handlers: The rule's visit_handlers(); if given, types without a handler are skipped.
+		"""
+		nodes = []
+		for node_type in NODE_ORDER:
+			if rule.target_node_types and node_type not in rule.target_node_types:
+				continue
+			if handlers is not None and handlers[node_type] is None:
+				continue
+			if node_type is NodeType.PROPERTY and not rule.include_private_properties:
+				nodes.extend(public_properties)
+			else:
+				nodes.extend(self.view_model.nodes_of_type(node_type))
+		return nodes
+
 	def get_model_statistics(self, flattened_json: Dict[str, Any]) -> Dict[str, Any]:
 		"""Get statistics about the parsed model for debugging/analysis."""
-		self.flattened_json = flattened_json
+		self._set_view_input(flattened_json)
 		self.view_model = self.get_view_model()
+		return self._compute_model_statistics()
 
-		# Get all nodes for analysis, excluding generic collections to avoid duplicates
-		specific_collections = [
-			'components', 'message_handlers', 'custom_methods', 'expression_bindings',
-			'expression_struct_bindings', 'property_bindings', 'tag_bindings', 'query_bindings', 'script_transforms', 'event_handlers', 'properties'
-		]
-		all_nodes = []
-		for collection_name in specific_collections:
-			if collection_name in self.view_model:
-				all_nodes.extend(self.view_model[collection_name])
-
-		# Count by individual node types
-		node_type_counts = {}
-		for node_type in NodeType:
-			count = len(NodeUtils.filter_by_types(all_nodes, {node_type}))
-			if count > 0:  # Only include types that have nodes
-				node_type_counts[node_type.value] = count
+	def _compute_model_statistics(self) -> Dict[str, Any]:
+		"""Compute statistics for the current view model from its precomputed counts."""
+		# Count by individual node types (only types that have nodes)
+		node_type_counts = {node_type.value: count for node_type, count in self.view_model.node_type_counts.items()}
 
 		# Count components by their actual type (Button, Label, etc.)
-		components_by_type = {}
-		component_nodes = NodeUtils.filter_by_types(all_nodes, {NodeType.COMPONENT})
-		for comp in component_nodes:
-			comp_type = getattr(comp, 'type', 'unknown')
-			components_by_type[comp_type] = components_by_type.get(comp_type, 0) + 1
+		components_by_type = {
+			comp_type: len(components) for comp_type, components in self.view_model.components_by_type.items()
+		}
 
 		# Get rule coverage statistics
-		rule_coverage = self._get_rule_coverage_stats(all_nodes)
+		rule_coverage = self._get_rule_coverage_stats()
 
 		stats = {
-			'total_nodes': len(all_nodes),
+			'total_nodes': self.view_model.total_nodes,
 			'node_type_counts': node_type_counts,
 			'components_by_type': components_by_type,
 			'rule_coverage': rule_coverage,
@@ -123,7 +393,7 @@ class LintEngine:
 
 		return stats
 
-	def _get_rule_coverage_stats(self, all_nodes: List) -> Dict[str, Any]:
+	def _get_rule_coverage_stats(self) -> Dict[str, Any]:
 		"""Get statistics about which nodes each rule would process."""
 		coverage = {}
 		for rule in self.rules:
@@ -131,25 +401,22 @@ class LintEngine:
 
 			# Count how many nodes this rule would apply to
 			if rule.target_node_types:
-				applicable_nodes = NodeUtils.filter_by_types(all_nodes, rule.target_node_types)
 				coverage[rule_name] = {
 					'target_types': [nt.value for nt in rule.target_node_types],
-					'applicable_node_count': len(applicable_nodes)
+					'applicable_node_count': self.view_model.count(rule.target_node_types)
 				}
 			else:
 				# Rule applies to all nodes
-				coverage[rule_name] = {'target_types': ['all'], 'applicable_node_count': len(all_nodes)}
+				coverage[rule_name] = {'target_types': ['all'], 'applicable_node_count': self.view_model.total_nodes}
 
 		return coverage
 
 	def debug_nodes(self, flattened_json: Dict[str, Any], node_types: List[str] = None) -> List[Dict]:
 		"""Get detailed information about nodes for debugging."""
-		self.flattened_json = flattened_json
+		self._set_view_input(flattened_json)
 		self.view_model = self.get_view_model()
 
-		all_nodes = []
-		for node_list in self.view_model.values():
-			all_nodes.extend(node_list)
+		all_nodes = self.view_model.nodes
 
 		# Filter by node types if specified
 		if node_types:
@@ -164,26 +431,22 @@ class LintEngine:
 					)
 
 			if target_types:
-				all_nodes = NodeUtils.filter_by_types(all_nodes, target_types)
+				all_nodes = self.view_model.nodes_of_types(target_types)
 
 		# Return serialized node information
 		return [node.serialize() for node in all_nodes]
 
 	def analyze_rule_impact(self, flattened_json: Dict[str, Any]) -> Dict[str, Dict]:
 		"""Analyze which nodes each rule would target."""
-		self.flattened_json = flattened_json
+		self._set_view_input(flattened_json)
 		self.view_model = self.get_view_model()
 
-		all_nodes = []
-		for node_list in self.view_model.values():
-			all_nodes.extend(node_list)
-
 		analysis = {}
 		for rule in self.rules:
 			rule_name = rule.__class__.__name__
 
 			if rule.target_node_types:
-				applicable_nodes = NodeUtils.filter_by_types(all_nodes, rule.target_node_types)
+				applicable_nodes = self.view_model.nodes_of_types(rule.target_node_types)
 
 				analysis[rule_name] = {
 					'target_types': [nt.value for nt in rule.target_node_types],
@@ -199,6 +462,7 @@ class LintEngine:
 					]
 				}
 			else:
+				all_nodes = self.view_model.nodes
 				analysis[rule_name] = {
 					'target_types': ['all'],
 					'applicable_nodes': len(all_nodes),
@@ -244,7 +508,7 @@ class LintEngine:
 				json.dump(serialized_model, f, indent=2, sort_keys=True)
 
 			# Save model statistics
-			stats = self.get_model_statistics(self.flattened_json)
+			stats = self._compute_model_statistics()
 			stats_file = Path(self.debug_output_dir) / f"{source_name}_stats.json"
 			with open(stats_file, 'w', encoding='utf-8') as f:
 				json.dump(stats, f, indent=2, sort_keys=True)
@@ -2,6 +2,7 @@
 This module contains the core data models for representing Ignition view components and their properties.
 """
 from .builder import ViewModelBuilder
+from .view_model import ViewModel
 from .node_types import (
 	ViewNode,
 	Component,
@@ -17,6 +18,7 @@ from .node_types import (
 
 __all__ = [
 	"ViewModelBuilder",
+	"ViewModel",
 	"ViewNode",
 	"Component",
 	"ExpressionBinding",
@@ -4,10 +4,11 @@ from a flattened JSON representation of an Ignition Perspective view. It include
 component types, bindings, event handlers, and other elements from the JSON data.
 """
 import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
 
+from ..common.flat_index import FlatIndex
+from .view_model import ViewModel
 from .node_types import (
-	ViewNode,
 	Component,
 	ExpressionBinding,
 	ExpressionStructBinding,
@@ -21,27 +22,85 @@ from .node_types import (
 	Property,
 )
 
+# Collectors that must run to fill each model collection. Properties are attributed to their
+# owning component, so they need the components collector as well.
+_BINDING_COLLECTORS = frozenset(('bindings',))
+COLLECTION_COLLECTORS = {
+	'components': frozenset(('components',)),
+	'bindings': _BINDING_COLLECTORS,
+	'expression_bindings': _BINDING_COLLECTORS,
+	'expression_struct_bindings': _BINDING_COLLECTORS,
+	'property_bindings': _BINDING_COLLECTORS,
+	'tag_bindings': _BINDING_COLLECTORS,
+	'query_bindings': _BINDING_COLLECTORS,
+	'script_transforms': _BINDING_COLLECTORS,
+	'message_handlers': frozenset(('message_handlers',)),
+	'custom_methods': frozenset(('custom_methods',)),
+	'event_handlers': frozenset(('event_handlers',)),
+	'scripts': frozenset(('bindings', 'message_handlers', 'custom_methods', 'event_handlers')),
+	'properties': frozenset(('components', 'properties')),
+}
+ALL_COLLECTORS = frozenset().union(*COLLECTION_COLLECTORS.values())
+
+# Any key holding one of these segments belongs to a node other than a property
+_STRUCTURAL_SEGMENT = re.compile(r'\.(?:meta|binding|scripts|events)\.')
+_CUSTOM_METHOD_INDEX = re.compile(r'\.scripts\.customMethods\[(\d+)\]')
+_CUSTOM_METHOD_PARAM_INDEX = re.compile(r'params\[(\d+)\]')
+_EVENT_TYPE = re.compile(r'\.events\.([^.]+)$')
+
+_PROP_CONFIG_PREFIX = 'propConfig.'
+_NO_PROPERTY_CONFIG = {}
+
+
+def resolve_collectors(collections: Optional[Iterable[str]] = None) -> Set[str]:
+	"""
+	Return the collectors needed to fill the given model collections.
+
+	Args:
+		collections: Model collection names (keys of the model dict), or None for all of them.
+
+	Returns:
+		Set of collector names ('components', 'bindings', 'message_handlers', 'custom_methods',
+		'event_handlers', 'properties')
+
+	Raises:
+		ValueError: If a collection name is unknown.
+	"""
+	if collections is None:
+		return set(ALL_COLLECTORS)
+	collectors = set()
+	for collection in collections:
+		if collection not in COLLECTION_COLLECTORS:
+			raise ValueError(f"Unknown model collection '{collection}'")
+		collectors |= COLLECTION_COLLECTORS[collection]
+	return collectors
+
 
 class ViewModelBuilder:
 	"""Builds a structured view model from flattened JSON."""
 
 	def __init__(self):
 		self.flattened_json = {}
-		self.model = {
-			'components': [],
-			'bindings': [],
-			'scripts': [],
-			'event_handlers': [],
-			'message_handlers': [],
-			'custom_methods': [],
-			'expression_bindings': [],
-			'expression_struct_bindings': [],
-			'property_bindings': [],
-			'tag_bindings': [],
-			'query_bindings': [],
-			'script_transforms': [],
-			'properties': []
-		}
+		self._index = None
+		# Keys under each "<binding path>.binding." prefix, filled by _classify_keys
+		self._binding_keys = {}
+		# propConfig settings ('persistent', 'access') keyed by property path, filled by _classify_keys
+		self._property_config = {}
+		# Components of the current model keyed by path, and the owner of each container path resolved so far
+		self.components_by_path = {}
+		self._owners = {}
+		self._reset_model()
+
+	def _reset_model(self):
+		"""Start a new, empty model."""
+		self.model = ViewModel()
+
+	@property
+	def index(self) -> FlatIndex:
+		"""Prefix index over the flattened JSON, built on first use."""
+		if self._index is None:
+			self._index = FlatIndex(self.flattened_json)
+		return self._index
 
 	def _search_for_path_value(self, path: str, suffix: str = None, fallback: Any = None) -> Any:
 		"""Search for a value in the flattened JSON by path, optionally with a suffix."""
@@ -68,25 +127,27 @@ class ViewModelBuilder:
 		"""Get the mode from a tag binding (direct, indirect, or expression)."""
 		return self._search_for_path_value(binding_path, "binding.config.mode", "direct")
 
+	def _get_binding_items(self, binding_path: str, prefix: str) -> List[Tuple[str, Any]]:
+		"""Return the (path, value) pairs of one binding's keys that start with prefix, in document order."""
+		return [item for item in self._binding_keys.get(binding_path, ()) if item[0].startswith(prefix)]
+
 	def _get_tag_references(self, binding_path: str) -> Dict[str, str]:
 		"""Get the references dictionary from an indirect tag binding."""
 		references = {}
 		references_prefix = f"{binding_path}.binding.config.references."
-		for path, value in self.flattened_json.items():
-			if path.startswith(references_prefix):
-				# Extract the reference key from the path
-				key = path[len(references_prefix):]
-				if isinstance(value, str):
-					references[key] = value
+		for path, value in self._get_binding_items(binding_path, references_prefix):
+			# Extract the reference key from the path
+			key = path[len(references_prefix):]
+			if isinstance(value, str):
+				references[key] = value
 		return references
 
 	def _get_tag_config(self, binding_path: str) -> Dict[str, Any]:
 		"""Get the configuration for a tag binding, excluding mode, tagPath, and references."""
 		config = {}
 		config_prefix = f"{binding_path}.binding.config."
-		for path, value in self.flattened_json.items():
-			if (path.startswith(config_prefix) and
-				not path.startswith(f"{config_prefix}references.") and
+		for path, value in self._get_binding_items(binding_path, config_prefix):
+			if (not path.startswith(f"{config_prefix}references.") and
 				not path.endswith("tagPath") and
 				not path.endswith("mode")):
 				# Extract the config key
@@ -98,20 +159,19 @@ class ViewModelBuilder:
 		"""Get the struct dictionary from an expression struct binding."""
 		struct = {}
 		struct_prefix = f"{binding_path}.binding.config.struct."
-		for path, value in self.flattened_json.items():
-			if path.startswith(struct_prefix):
-				# Extract the key from the path
-				key = path[len(struct_prefix):]
-				if isinstance(value, str):
-					struct[key] = value
+		for path, value in self._get_binding_items(binding_path, struct_prefix):
+			# Extract the key from the path
+			key = path[len(struct_prefix):]
+			if isinstance(value, str):
+				struct[key] = value
 		return struct
 
 	def _get_expression_struct_config(self, binding_path: str) -> Dict[str, Any]:
 		"""Get the configuration for an expression struct binding."""
 		config = {}
 		config_prefix = f"{binding_path}.binding.config."
-		for path, value in self.flattened_json.items():
-			if path.startswith(config_prefix) and not path.startswith(f"{config_prefix}struct."):
+		for path, value in self._get_binding_items(binding_path, config_prefix):
+			if not path.startswith(f"{config_prefix}struct."):
 				# Extract the config key
 				key = path[len(config_prefix):]
 				config[key] = value
@@ -125,20 +185,19 @@ class ViewModelBuilder:
 		"""Get the parameters dictionary from a query binding."""
 		parameters = {}
 		parameters_prefix = f"{binding_path}.binding.config.parameters."
-		for path, value in self.flattened_json.items():
-			if path.startswith(parameters_prefix):
-				# Extract the parameter name from the path
-				param_name = path[len(parameters_prefix):]
-				if isinstance(value, str):
-					parameters[param_name] = value
+		for path, value in self._get_binding_items(binding_path, parameters_prefix):
+			# Extract the parameter name from the path
+			param_name = path[len(parameters_prefix):]
+			if isinstance(value, str):
+				parameters[param_name] = value
 		return parameters
 
 	def _get_query_config(self, binding_path: str) -> Dict[str, Any]:
 		"""Get the configuration for a query binding, excluding queryPath and parameters."""
 		config = {}
 		config_prefix = f"{binding_path}.binding.config."
-		for path, value in self.flattened_json.items():
-			if path.startswith(config_prefix) and not path.startswith(f"{config_prefix}parameters.") and not path.endswith("queryPath"):
+		for path, value in self._get_binding_items(binding_path, config_prefix):
+			if not path.startswith(f"{config_prefix}parameters.") and not path.endswith("queryPath"):
 				# Extract the config key
 				key = path[len(config_prefix):]
 				config[key] = value
@@ -150,9 +209,8 @@ class ViewModelBuilder:
 		transform_paths = []
 
 		# Find transform paths
-		for path, value in self.flattened_json.items():
-			if path.startswith(f"{binding_path}.transforms"
-						) and path.endswith('.type') and value == 'script':
+		for path, value in self._get_binding_items(binding_path, f"{binding_path}.binding.transforms"):
+			if path.endswith('.type') and value == 'script':
 				transform_base = path.rsplit('.type', 1)[0]
 				transform_paths.append(transform_base)
 
@@ -170,9 +228,8 @@ class ViewModelBuilder:
 		transform_paths = []
 
 		# Find transform paths for expression type transforms
-		for path, value in self.flattened_json.items():
-			if path.startswith(f"{binding_path}.transforms"
-						) and path.endswith('.type') and value == 'expression':
+		for path, value in self._get_binding_items(binding_path, f"{binding_path}.binding.transforms"):
+			if path.endswith('.type') and value == 'expression':
 				transform_base = path.rsplit('.type', 1)[0]
 				transform_paths.append(transform_base)
 
@@ -197,10 +254,12 @@ class ViewModelBuilder:
 		"""Extract configuration for a component."""
 		config = {}
 		prefix = f"{config_path}."
-		for path, value in data.items():
-			if path.startswith(prefix):
-				key = path[len(prefix):]
-				config[key] = value
+		if data is self.flattened_json:
+			items = self.index.items_under(prefix)
+		else:
+			items = ((path, value) for path, value in data.items() if path.startswith(prefix))
+		for path, value in items:
+			config[path[len(prefix):]] = value
 		return config
 
 	def _is_property_persistent(self, property_path: str) -> bool:
@@ -218,57 +277,134 @@ class ViewModelBuilder:
 			True if the property should be persistent, False if it's created by bindings at runtime
 		"""
 		# Check for explicit persistence configuration
-		config_path = f"propConfig.{property_path}.persistent"
-		persistent_value = self.flattened_json.get(config_path)
+		persistent_value = self._get_property_persistence(property_path)
 
 		if persistent_value is not None:
 			# Explicit configuration found
 			return persistent_value
 
-		# No explicit configuration - check if there's any propConfig for this property
-		config_prefix = f"propConfig.{property_path}."
-		has_any_config = any(path.startswith(config_prefix) for path in self.flattened_json.keys())
-
-		if has_any_config:
-			# Property has configuration but no explicit persistent setting
-			# Default to True (persistent) unless proven otherwise
-			return True
-
-		# No configuration at all - default to persistent
+		# No explicit persistent setting (with or without other propConfig) - default to persistent
 		return True
 
 	def _get_property_persistence(self, property_path: str) -> bool:
 		"""Get the persistence value for a property, returning None if not specified."""
-		config_path = f"propConfig.{property_path}.persistent"
-		return self.flattened_json.get(config_path)
+		return self._property_config.get(property_path, _NO_PROPERTY_CONFIG).get('persistent')
 
 	def _get_property_access_mode(self, property_path: str) -> bool:
 		"""Get whether a property has private access mode, returning None if not specified."""
-		config_path = f"propConfig.{property_path}.access"
-		access_value = self.flattened_json.get(config_path)
+		access_value = self._property_config.get(property_path, _NO_PROPERTY_CONFIG).get('access')
 		if access_value is not None:
 			return access_value == 'PRIVATE'
 		return None
 
-	def _collect_components(self):
-		# First, identify components by looking for meta.name entries
-		for path, value in self.flattened_json.items():
-			if not path.endswith('.meta.name'):
+	def _find_owner(self, path: str) -> Optional[str]:
+		"""
+		Find the innermost component containing a path.
+
+		Only the ancestors of the path at segment boundaries ('.' or '[') are looked up, longest
+		first, so resolving an owner costs O(depth) instead of a scan over every component.
+		Results are cached per container path, which siblings share.
+
+		Args:
+			path: Flattened path of a property.
+
+		Returns:
+			The owning component's path, or None if the path is outside every component
+		"""
+		container_end = max(path.rfind('.'), path.rfind('['))
+		if container_end <= 0:
+			return None
+		container = path[:container_end]
+		if container in self._owners:
+			return self._owners[container]
+
+		owner = None
+		end = len(container)
+		while end > 0:
+			prefix = container[:end]
+			if prefix in self.components_by_path:
+				owner = prefix
+				break
+			end = max(container.rfind('.', 0, end), container.rfind('[', 0, end))
+		self._owners[container] = owner
+		return owner
+
+	def _classify_keys(self, collectors: Set[str]) -> Dict[str, List[Tuple[str, Any]]]:
+		"""
+		Route every flattened key to the collectors that read it, in a single pass.
+
+		Keys without a .meta., .binding., .scripts. or .events. segment can only be properties,
+		so only the remaining keys are tested against the other collectors' patterns. Binding keys
+		are also grouped by binding path (into self._binding_keys), so each binding is later built
+		from its own keys rather than from a search over the whole view.
+
+		Args:
+			collectors: Names of the collectors that will run.
+
+		Returns:
+			Dict mapping collector name to its (path, value) pairs, in document order
+		"""
+		routed = {name: [] for name in ALL_COLLECTORS}
+		components = routed['components'].append if 'components' in collectors else None
+		bindings = routed['bindings'].append if 'bindings' in collectors else None
+		message_handlers = routed['message_handlers'].append if 'message_handlers' in collectors else None
+		custom_methods = routed['custom_methods'].append if 'custom_methods' in collectors else None
+		event_handlers = routed['event_handlers'].append if 'event_handlers' in collectors else None
+		properties = routed['properties'].append if 'properties' in collectors else None
+		structural_segment = _STRUCTURAL_SEGMENT.search
+		binding_keys = self._binding_keys = {}
+		property_config = self._property_config = {}
+		prop_config_prefix_length = len(_PROP_CONFIG_PREFIX)
+
+		for item in self.flattened_json.items():
+			path = item[0]
+			if properties and path.startswith(_PROP_CONFIG_PREFIX):
+				# Index persistence and access settings by the path of the property they configure
+				for setting in ('persistent', 'access'):
+					if path.endswith(setting) and path[-len(setting) - 1] == '.':
+						property_path = path[prop_config_prefix_length:-len(setting) - 1]
+						property_config.setdefault(property_path, {})[setting] = item[1]
+
+			if structural_segment(path) is None:
+				# Type keys and propConfig entries are configuration, not properties
+				if properties and not path.endswith('.type') and not path.startswith('propConfig.'):
+					properties(item)
 				continue
+
+			if components and path.endswith('.meta.name'):
+				components(item)
+			if bindings and '.binding.' in path:
+				if '.binding.type' in path:
+					bindings(item)
+				# A key belongs to every binding whose "<path>.binding." prefix it starts with
+				start = path.find('.binding.')
+				while start != -1:
+					binding_keys.setdefault(path[:start], []).append(item)
+					start = path.find('.binding.', start + 1)
+			if message_handlers and path.endswith('.messageType') and '.scripts.messageHandlers' in path:
+				message_handlers(item)
+			if custom_methods and '.scripts.customMethods' in path:
+				custom_methods(item)
+			if event_handlers and '.events.' in path and ('.config.script' in path or path.endswith('.script')):
+				event_handlers(item)
+
+		return routed
+
+	def _collect_components(self, items: List[Tuple[str, Any]]):
+		"""Create a component for each meta.name entry."""
+		for path, value in items:
 			component_path = path.rsplit('.meta.name', 1)[0]
 			component_name = value
 			component_type = self._get_component_type(component_path)
-			self.model['components'].append(Component(component_path, component_name, component_type))
+			self.model.add(Component(component_path, component_name, component_type))
 
-	def _collect_bindings(self):
-		"""Collect all bindings from the flattened JSON."""
-		visited_paths = []
-		for path, binding_type in self.flattened_json.items():
-			if '.binding.type' not in path:
-				continue
+	def _collect_bindings(self, items: List[Tuple[str, Any]]):
+		"""Collect all bindings from their binding.type entries."""
+		visited_paths = set()
+		for path, binding_type in items:
 			binding_path = path.rsplit('.binding.type', 1)[0]
 			if binding_path not in visited_paths:
-				visited_paths.append(binding_path)
+				visited_paths.add(binding_path)
 
 				# Create the specific binding type
 				binding = self._create_binding_by_type(binding_type, binding_path)
@@ -308,69 +444,48 @@ class ViewModelBuilder:
 
 		return None
 
-	def _add_binding_to_model(self, binding, binding_type: str):
-		"""Add a binding to the appropriate model collections."""
-		# Add to general bindings collection
-		self.model['bindings'].append(binding)
-
-		# Add to type-specific collection
-		if binding_type in ('expression', 'expr'):
-			self.model['expression_bindings'].append(binding)
-		elif binding_type == 'expr-struct':
-			self.model['expression_struct_bindings'].append(binding)
-		elif binding_type == 'property':
-			self.model['property_bindings'].append(binding)
-		elif binding_type == 'tag':
-			self.model['tag_bindings'].append(binding)
-		elif binding_type == 'query':
-			self.model['query_bindings'].append(binding)
+	def _add_binding_to_model(self, binding, binding_type: str):  # pylint: disable=unused-argument
+		"""Add a binding to the model (its node type selects the collection)."""
+		self.model.add(binding)
 
 	def _process_binding_transforms(self, binding_path: str):
 		"""Process script and expression transforms for a binding."""
-		full_binding_path = f"{binding_path}.binding"
-
 		# Process script transforms
-		transforms = self._get_script_transforms(full_binding_path)
+		transforms = self._get_script_transforms(binding_path)
 		for transform_path, script in transforms:
 			transform = TransformScript(transform_path, script, binding_path)
-			self.model['script_transforms'].append(transform)
-			self.model['scripts'].append(transform)
+			self.model.add(transform)
 
 		# Process expression transforms
-		expression_transforms = self._get_expression_transforms(full_binding_path)
+		expression_transforms = self._get_expression_transforms(binding_path)
 		for transform_path, expression in expression_transforms:
 			# Create ExpressionBinding nodes for each expression transform
 			expression_binding = ExpressionBinding(transform_path, expression)
-			self.model['expression_bindings'].append(expression_binding)
-			self.model['bindings'].append(expression_binding)
-
-	def _collect_message_handlers(self):
-		"""Collect all message handlers from the flattened JSON."""
-		for path, message_type in self.flattened_json.items():
-			if '.scripts.messageHandlers' in path and path.endswith('.messageType'):
-				base_path = path.rsplit('.messageType', 1)[0]
-				script_code = self._search_for_path_value(base_path, "script", "")
-
-				# Get scope information
-				scope = {
-					'page': self._search_for_path_value(base_path, "pageScope", False),
-					'session': self._search_for_path_value(base_path, "sessionScope", False),
-					'view': self._search_for_path_value(base_path, "viewScope", False)
-				}
-
-				handler = MessageHandlerScript(base_path, script_code, message_type, scope)
-				self.model['message_handlers'].append(handler)
-				self.model['scripts'].append(handler)
-
-	def _collect_custom_methods(self):
-		"""Collect all custom methods from the flattened JSON."""
+			self.model.add(expression_binding)
+
+	def _collect_message_handlers(self, items: List[Tuple[str, Any]]):
+		"""Collect all message handlers from their messageType entries."""
+		for path, message_type in items:
+			base_path = path.rsplit('.messageType', 1)[0]
+			script_code = self._search_for_path_value(base_path, "script", "")
+
+			# Get scope information
+			scope = {
+				'page': self._search_for_path_value(base_path, "pageScope", False),
+				'session': self._search_for_path_value(base_path, "sessionScope", False),
+				'view': self._search_for_path_value(base_path, "viewScope", False)
+			}
+
+			handler = MessageHandlerScript(base_path, script_code, message_type, scope)
+			self.model.add(handler)
+
+	def _collect_custom_methods(self, items: List[Tuple[str, Any]]):
+		"""Collect all custom methods from their scripts.customMethods entries."""
 		custom_method_data = {}
 		# First, collect all the data for each custom method
-		for path, value in self.flattened_json.items():
-			if '.scripts.customMethods' not in path:
-				continue
+		for path, value in items:
 			# Extract the method index
-			match = re.search(r'\.scripts\.customMethods\[(\d+)\]', path)
+			match = _CUSTOM_METHOD_INDEX.search(path)
 			if match:
 				method_index = int(match.group(1))
 				component_path = path.split('.scripts.customMethods')[0]
@@ -392,7 +507,7 @@ class ViewModelBuilder:
 					custom_method_data[method_id]['script'] = value
 				elif 'params' in path:
 					# Extract parameter index
-					param_match = re.search(r'params\[(\d+)\]', path)
+					param_match = _CUSTOM_METHOD_PARAM_INDEX.search(path)
 					if param_match:
 						param_index = int(param_match.group(1))
 						# Ensure params list is long enough
@@ -404,52 +519,41 @@ class ViewModelBuilder:
 		# Now create CustomMethodScript objects from the collected data
 		for method_id, data in custom_method_data.items():
 			method = CustomMethodScript(data['path'], data['name'], data['script'], data['params'])
-			self.model['custom_methods'].append(method)
-			self.model['scripts'].append(method)
-
-	def _collect_event_handlers(self):
-		"""Collect all event handlers from the flattened JSON."""
-		for path, script in self.flattened_json.items():
-			# Look for event handler script configurations
-			# Check both .config.script (alternative format) and .script (standard format)
-			if '.events.' in path and ('.config.script' in path or path.endswith('.script')):
-				if '.config.script' in path:
-					# Alternative format: path.events.eventType.config.script
-					event_path_parts = path.split('.config.script')[0]
-				else:
-					# Standard format: path.events.eventType.script
-					event_path_parts = path.split('.script')[0]
-
-				event_path = event_path_parts
-
-				# Extract event type from path (e.g., 'onActionPerformed', 'onStartup')
-				# Standard Ignition events don't use domains, just event types
-				event_type_match = re.search(r'\.events\.([^.]+)$', event_path_parts)
-				if event_type_match:
-					event_type = event_type_match.group(1)  # e.g., 'onActionPerformed', 'onStartup'
-
-					# Get the scope from the same event path
-					scope_path = f"{event_path_parts}.scope"
-					scope = self.flattened_json.get(scope_path, "L")
-
-					# Create a script event handler
-					handler = EventHandlerScript(
-						event_path, "component", event_type, script, scope=scope
-					)
-					self.model['event_handlers'].append(handler)
-					self.model['scripts'].append(handler)
-
-	def _collect_properties(self):
-		for path, value in self.flattened_json.items():
-			# Skip meta properties, bindings, scripts, events - we already processed those
-			processed_props = ['meta', 'binding', 'scripts', 'events']
-			if any(f".{prop}." in path for prop in processed_props) or path.endswith('.type'):
-				continue
-
-			# Skip propConfig properties - these are configuration, not actual properties
-			if path.startswith('propConfig.'):
-				continue
-
+			self.model.add(method)
+
+	def _collect_event_handlers(self, items: List[Tuple[str, Any]]):
+		"""Collect all event handlers from their event script entries."""
+		for path, script in items:
+			# Event handler script configurations are either .config.script (alternative format)
+			# or .script (standard format)
+			if '.config.script' in path:
+				# Alternative format: path.events.eventType.config.script
+				event_path_parts = path.split('.config.script')[0]
+			else:
+				# Standard format: path.events.eventType.script
+				event_path_parts = path.split('.script')[0]
+
+			event_path = event_path_parts
+
+			# Extract event type from path (e.g., 'onActionPerformed', 'onStartup')
+			# Standard Ignition events don't use domains, just event types
+			event_type_match = _EVENT_TYPE.search(event_path_parts)
+			if event_type_match:
+				event_type = event_type_match.group(1)  # e.g., 'onActionPerformed', 'onStartup'
+
+				# Get the scope from the same event path
+				scope_path = f"{event_path_parts}.scope"
+				scope = self.flattened_json.get(scope_path, "L")
+
+				# Create a script event handler
+				handler = EventHandlerScript(
+					event_path, "component", event_type, script, scope=scope
+				)
+				self.model.add(handler)
+
+	def _collect_properties(self, items: List[Tuple[str, Any]]):
+		"""Collect properties from the keys left once meta, binding, script, event, type and propConfig keys are removed."""
+		for path, value in items:
 			# Handle view-level properties (custom.* and params.*)
 			if path.startswith('custom.') or path.startswith('params.'):
 				# Check if this is a persistent property
@@ -458,16 +562,11 @@ class ViewModelBuilder:
 					persistent = self._get_property_persistence(path)
 					private_access = self._get_property_access_mode(path)
 					prop = Property(path, property_name, value, persistent=persistent, private_access=private_access)
-					self.model['properties'].append(prop)
+					self.model.add(prop)
 				continue
 
-			# Find the component this property belongs to
-			component_path = None
-			for comp_obj in self.model['components']:
-				if path.startswith(comp_obj.path):
-					# Take the longest matching path (most specific component)
-					if component_path is None or len(comp_obj.path) > len(component_path):
-						component_path = comp_obj.path
+			# Find the component this property belongs to (the most specific one)
+			component_path = self._find_owner(path)
 
 			if component_path:
 				# For component properties, also check persistence for custom properties
@@ -479,57 +578,109 @@ class ViewModelBuilder:
 				persistent = self._get_property_persistence(path)
 				private_access = self._get_property_access_mode(path)
 				prop = Property(path, property_name, value, persistent=persistent, private_access=private_access)
-				self.model['properties'].append(prop)
-				# Add the property to the component
-				if component_path in self.model['components']:
-					self.model['components'][component_path].properties[property_name] = value
+				self.model.add(prop)
+
+	def _index_components(self):
+		"""Key the collected components by path, which _find_owner resolves owners against."""
+		self.components_by_path = self.model.components_by_path
+		self._owners = {}
+
+	def _link_components(self):
+		"""
+		Turn the collected components into a tree and attach every node to its owning component.
 
-	def get_view_model(self) -> Dict[str, List[ViewNode]]:
+		Parents and owners are resolved with _find_owner, so linking is linear in the number of
+		nodes. Children and owned nodes keep the order of the model collections.
+		"""
+		if not self.components_by_path:
+			return
+
+		roots = []
+		for component in self.model['components']:
+			parent_path = self._find_owner(component.path)
+			if parent_path is None:
+				roots.append(component)
+			else:
+				component.parent = self.components_by_path[parent_path]
+				component.parent.children.append(component)
+
+		# Parents can follow their children in document order, so depths are set from the roots down
+		stack = [(component, 0) for component in roots]
+		while stack:
+			component, depth = stack.pop()
+			component.depth = depth
+			stack.extend((child, depth + 1) for child in component.children)
+
+		for attribute, collection in (('bindings', 'bindings'), ('scripts', 'scripts'), ('property_nodes', 'properties')):
+			for node in self.model[collection]:
+				owner_path = self._find_owner(node.path)
+				if owner_path is not None:
+					getattr(self.components_by_path[owner_path], attribute).append(node)
+
+		for prop in self.model['properties']:
+			owner_path = self._find_owner(prop.path)
+			if owner_path is not None:
+				self.components_by_path[owner_path].properties[prop.name] = prop.value
+
+	def get_component(self, path: str) -> Optional[Component]:
+		"""Return the component at path in the current model, or None."""
+		return self.components_by_path.get(path)
+
+	def get_view_model(self) -> ViewModel:
 		"""Return the structured view model."""
 		return self.model
 
-	def build_model(self, flattened_json: Dict[str, Any]) -> Dict[str, List[ViewNode]]:
+	def build_model(
+		self, flattened_json: Dict[str, Any], index: FlatIndex = None, collections: Optional[Iterable[str]] = None
+	) -> ViewModel:
 		"""
 		Parse the flattened JSON and build a structured model.
 
+		Args:
+			flattened_json: Output of flatten_json.
+			index: Optional FlatIndex already built over the same flattened JSON.
+			collections: Model collections the caller needs, or None for all of them. Collectors
+				that fill none of them are skipped and their collections are left empty.
+
 		Returns:
-			Dict mapping node types to lists of those nodes
+			ViewModel holding the collected nodes
 		"""
+		collectors = resolve_collectors(collections)
 		self.flattened_json = flattened_json
+		self._index = index
 
 		# Reset model to avoid accumulation from multiple calls
-		self.model = {
-			'components': [],
-			'bindings': [],
-			'scripts': [],
-			'event_handlers': [],
-			'message_handlers': [],
-			'custom_methods': [],
-			'expression_bindings': [],
-			'expression_struct_bindings': [],
-			'property_bindings': [],
-			'tag_bindings': [],
-			'query_bindings': [],
-			'script_transforms': [],
-			'properties': []
-		}
+		self._reset_model()
+
+		# Route every key to its collector in one pass, then build the nodes collector by collector
+		routed = self._classify_keys(collectors)
 
 		# First, identify components
-		self._collect_components()
+		if 'components' in collectors:
+			self._collect_components(routed['components'])
+		self._index_components()
 
 		# Process bindings
-		self._collect_bindings()
+		if 'bindings' in collectors:
+			self._collect_bindings(routed['bindings'])
 
 		# Process message handlers
-		self._collect_message_handlers()
+		if 'message_handlers' in collectors:
+			self._collect_message_handlers(routed['message_handlers'])
 
 		# Process custom methods
-		self._collect_custom_methods()
+		if 'custom_methods' in collectors:
+			self._collect_custom_methods(routed['custom_methods'])
 
 		# Process event handlers
-		self._collect_event_handlers()
+		if 'event_handlers' in collectors:
+			self._collect_event_handlers(routed['event_handlers'])
 
 		# Process regular properties
-		self._collect_properties()
+		if 'properties' in collectors:
+			self._collect_properties(routed['properties'])
+
+		# Link components into a tree that owns the nodes found inside each of them
+		self._link_components()
 
 		return self.get_view_model()
@@ -4,9 +4,11 @@ It includes base classes for nodes, specific node types, and an enum for node ty
 It also provides visitor support for processing nodes in a structured way.
 """
 
+import sys
 from enum import Enum
 from abc import ABC
-from typing import Dict, List, Any, Set
+from types import MappingProxyType
+from typing import Dict, List, Any, Set, Tuple
 
 
 class NodeType(Enum):
@@ -31,14 +33,52 @@ ALL_BINDINGS = {
 }
 ALL_SCRIPTS = {NodeType.MESSAGE_HANDLER, NodeType.CUSTOM_METHOD, NodeType.TRANSFORM, NodeType.EVENT_HANDLER}
 
+# Shared read-only default for empty config/references/parameters/scope mappings, so the many
+# nodes without one do not each allocate an empty dict
+EMPTY_MAPPING = MappingProxyType({})
+
+
+class _EmptyMappingState:  # pylint: disable=too-few-public-methods
+	"""Stands in for EMPTY_MAPPING in pickled node state: mapping proxies cannot be pickled, classes pickle by name."""
+
+
+# Slot names of each node class, base class slots first
+_SLOT_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+
+def _slot_names(cls: type) -> Tuple[str, ...]:
+	names = _SLOT_NAMES.get(cls)
+	if names is None:
+		names = tuple(name for klass in reversed(cls.__mro__) for name in klass.__dict__.get('__slots__', ()))
+		_SLOT_NAMES[cls] = names
+	return names
+
 
 class ViewNode(ABC):
-	"""Base class for all nodes in the view tree with centralized rule application logic."""
+	"""
+	Base class for all nodes in the view tree with centralized rule application logic.
+
+	Nodes use __slots__ (large views hold hundreds of thousands of them), so subclasses must
+	declare __slots__ for any attribute they add.
+	"""
+
+	__slots__ = ('path', 'node_type')
 
 	def __init__(self, path: str, node_type: NodeType):
 		self.path = path
 		self.node_type = node_type
 
+	def __getstate__(self) -> Tuple[Any, ...]:
+		"""Return the slot values, in slot order, for pickling (e.g. by the model cache)."""
+		return tuple(
+			_EmptyMappingState if value is EMPTY_MAPPING else value
+			for value in (getattr(self, name) for name in _slot_names(type(self)))
+		)
+
+	def __setstate__(self, state: Tuple[Any, ...]):
+		for name, value in zip(_slot_names(type(self)), state):
+			setattr(self, name, EMPTY_MAPPING if value is _EmptyMappingState else value)
+
 	def applies_to_rule(self, rule_node_types: Set[NodeType]) -> bool:
 		"""Check if this node applies to a rule based on its target node types."""
 		if not rule_node_types:
@@ -65,41 +105,80 @@ class ViewNode(ABC):
 
 
 class Component(ViewNode):
-	"""Represents a component in the view."""
+	"""
+	Represents a component in the view.
+
+	Once the model is built, components form a tree: parent/children/depth describe the
+	component hierarchy, and the owned node lists hold the bindings, scripts and properties
+	whose innermost enclosing component is this one (for the collections that were built).
+	"""
+
+	__slots__ = ('name', 'type', 'properties', 'parent', 'children', 'depth', 'property_nodes', 'bindings', 'scripts')
 
 	def __init__(self, path: str, name: str, type_name: str = None, properties: Dict = None):
 		super().__init__(path, NodeType.COMPONENT)
 		self.name = name
-		self.type = type_name
-		self.properties = properties or {}
+		self.type = sys.intern(type_name) if isinstance(type_name, str) else type_name
+		self.properties = properties or {}  # Property name -> value
+		self.parent = None
 		self.children = []
+		self.depth = 0
+		self.property_nodes = []
+		self.bindings = []
+		self.scripts = []
+
+	def iter_ancestors(self):
+		"""Yield the enclosing components, innermost first."""
+		ancestor = self.parent
+		while ancestor is not None:
+			yield ancestor
+			ancestor = ancestor.parent
+
+	def iter_descendants(self):
+		"""Yield every component nested below this one, depth first in document order."""
+		stack = list(reversed(self.children))
+		while stack:
+			component = stack.pop()
+			yield component
+			stack.extend(reversed(component.children))
 
 	def _get_serializable_attrs(self) -> Dict[str, Any]:
-		return {'name': self.name, 'type': self.type, 'properties_count': len(self.properties)}
+		return {
+			'name': self.name,
+			'type': self.type,
+			'properties_count': len(self.properties),
+			'parent': self.parent.path if self.parent else None,
+			'depth': self.depth,
+			'children_count': len(self.children),
+		}
 
 
 class ExpressionBinding(ViewNode):
 	"""Represents an expression binding."""
 
+	__slots__ = ('expression', 'config')
+
 	def __init__(self, path: str, expression: str, config: Dict = None):
 		super().__init__(path, NodeType.EXPRESSION_BINDING)
 		self.expression = expression
-		self.config = config or {}
+		self.config = config or EMPTY_MAPPING
 
 	def _get_serializable_attrs(self) -> Dict[str, Any]:
-		return {'expression': self.expression, 'config': self.config}
+		return {'expression': self.expression, 'config': dict(self.config)}
 
 
 class ExpressionStructBinding(ViewNode):
 	"""Represents an expression structure binding with multiple key-expression mappings."""
 
+	__slots__ = ('struct', 'config')
+
 	def __init__(self, path: str, struct: Dict[str, str], config: Dict = None):
 		super().__init__(path, NodeType.EXPRESSION_STRUCT_BINDING)
 		self.struct = struct  # Dict mapping keys to expression strings
-		self.config = config or {}
+		self.config = config or EMPTY_MAPPING
 
 	def _get_serializable_attrs(self) -> Dict[str, Any]:
-		return {'struct': self.struct, 'config': self.config}
+		return {'struct': self.struct, 'config': dict(self.config)}
 
 	def get_expressions(self) -> List[str]:
 		"""Get all expression strings from the struct."""
@@ -113,31 +192,35 @@ class ExpressionStructBinding(ViewNode):
 class PropertyBinding(ViewNode):
 	"""Represents a property binding."""
 
+	__slots__ = ('target_path', 'config')
+
 	def __init__(self, path: str, target_path: str, config: Dict = None):
 		super().__init__(path, NodeType.PROPERTY_BINDING)
 		self.target_path = target_path
-		self.config = config or {}
+		self.config = config or EMPTY_MAPPING
 
 	def _get_serializable_attrs(self) -> Dict[str, Any]:
-		return {'target_path': self.target_path, 'config': self.config}
+		return {'target_path': self.target_path, 'config': dict(self.config)}
 
 
 class TagBinding(ViewNode):
 	"""Represents a tag binding with support for direct, indirect, and expression modes."""
 
+	__slots__ = ('tag_path', 'mode', 'references', 'config')
+
 	def __init__(self, path: str, tag_path: str, *, mode: str = "direct", references: Dict[str, str] = None, config: Dict = None):
 		super().__init__(path, NodeType.TAG_BINDING)
 		self.tag_path = tag_path
 		self.mode = mode  # 'direct', 'indirect', or 'expression'
-		self.references = references or {}  # For indirect tags: maps placeholder keys to expressions
-		self.config = config or {}
+		self.references = references or EMPTY_MAPPING  # For indirect tags: maps placeholder keys to expressions
+		self.config = config or EMPTY_MAPPING
 
 	def _get_serializable_attrs(self) -> Dict[str, Any]:
 		return {
 			'tag_path': self.tag_path,
 			'mode': self.mode,
-			'references': self.references,
-			'config': self.config
+			'references': dict(self.references),
+			'config': dict(self.config)
 		}
 
 	def get_expressions(self) -> List[str]:
@@ -156,7 +239,7 @@ class TagBinding(ViewNode):
 
 	def get_reference_expressions(self) -> Dict[str, str]:
 		"""Get the reference expressions for indirect tag bindings."""
-		return self.references.copy() if self.mode == 'indirect' else {}
+		return dict(self.references) if self.mode == 'indirect' else {}
 
 	def is_expression_tag(self) -> bool:
 		"""Check if this is an expression tag binding."""
@@ -174,14 +257,16 @@ class TagBinding(ViewNode):
 class QueryBinding(ViewNode):
 	"""Represents a query binding with a query path and parameters containing expressions."""
 
+	__slots__ = ('query_path', 'parameters', 'config')
+
 	def __init__(self, path: str, query_path: str, parameters: Dict[str, str], config: Dict = None):
 		super().__init__(path, NodeType.QUERY_BINDING)
 		self.query_path = query_path
 		self.parameters = parameters  # Dict mapping parameter names to expression strings
-		self.config = config or {}
+		self.config = config or EMPTY_MAPPING
 
 	def _get_serializable_attrs(self) -> Dict[str, Any]:
-		return {'query_path': self.query_path, 'parameters': self.parameters, 'config': self.config}
+		return {'query_path': self.query_path, 'parameters': self.parameters, 'config': dict(self.config)}
 
 	def get_parameter_expressions(self) -> List[str]:
 		"""Get all parameter expression strings."""
@@ -195,10 +280,27 @@ class QueryBinding(ViewNode):
 class ScriptNode(ViewNode):
 	"""Base class for all script-containing nodes."""
 
+	__slots__ = ('script', '_function_def')
+
 	def __init__(self, path: str, node_type: NodeType, script: str):
 		super().__init__(path, node_type)
 		self.script = script
-		self.function_def = "def undefined_function(self):"
+		self._function_def = None
+
+	@property
+	def function_def(self) -> str:
+		"""The def line the script body is wrapped in for linting, built on first use."""
+		if self._function_def is None:
+			self._function_def = self._build_function_def()
+		return self._function_def
+
+	@function_def.setter
+	def function_def(self, function_def: str):
+		self._function_def = function_def
+
+	def _build_function_def(self) -> str:
+		"""Build the def line for this kind of script. Override in subclasses."""
+		return "def undefined_function(self):"
 
 	def get_formatted_script(self) -> str:
 		"""Format the script with proper function definition."""
@@ -216,26 +318,34 @@ class ScriptNode(ViewNode):
 class MessageHandlerScript(ScriptNode):
 	"""Represents a message handler script."""
 
+	__slots__ = ('message_type', 'scope')
+
 	def __init__(self, path: str, script: str, message_type: str, scope: Dict = None):
 		super().__init__(path, NodeType.MESSAGE_HANDLER, script)
 		self.message_type = message_type
-		self.scope = scope or {}
-		self.function_def = "def onMessageReceived(self, payload):"
+		self.scope = scope or EMPTY_MAPPING
+
+	def _build_function_def(self) -> str:
+		return "def onMessageReceived(self, payload):"
 
 	def _get_serializable_attrs(self) -> Dict[str, Any]:
 		base_attrs = super()._get_serializable_attrs()
-		base_attrs.update({'message_type': self.message_type, 'scope': self.scope})
+		base_attrs.update({'message_type': self.message_type, 'scope': dict(self.scope)})
 		return base_attrs
 
 
 class CustomMethodScript(ScriptNode):
 	"""Represents a custom method script."""
 
+	__slots__ = ('name', 'params')
+
 	def __init__(self, path: str, name: str, script: str, params=None):
 		super().__init__(path, NodeType.CUSTOM_METHOD, script)
 		self.name = name
 		self.params = params or []
-		self.function_def = f"def {self.name}({', '.join(['self'] + self.params)}):"
+
+	def _build_function_def(self) -> str:
+		return f"def {self.name}({', '.join(['self'] + self.params)}):"
 
 	def _get_serializable_attrs(self) -> Dict[str, Any]:
 		base_attrs = super()._get_serializable_attrs()
@@ -246,10 +356,14 @@ class CustomMethodScript(ScriptNode):
 class TransformScript(ScriptNode):
 	"""Represents a transform script."""
 
+	__slots__ = ('binding_path',)
+
 	def __init__(self, path: str, script: str, binding_path: str = None):
 		super().__init__(path, NodeType.TRANSFORM, script)
 		self.binding_path = binding_path
-		self.function_def = "def transform(self, value):"
+
+	def _build_function_def(self) -> str:
+		return "def transform(self, value):"
 
 	def _get_serializable_attrs(self) -> Dict[str, Any]:
 		base_attrs = super()._get_serializable_attrs()
@@ -260,12 +374,16 @@ class TransformScript(ScriptNode):
 class EventHandlerScript(ScriptNode):
 	"""Represents an event handler script."""
 
+	__slots__ = ('event_domain', 'event_type', 'scope')
+
 	def __init__(self, path: str, event_domain: str, event_type: str, script: str, *, scope: str = None):
 		super().__init__(path, NodeType.EVENT_HANDLER, script)
 		self.event_domain = event_domain
 		self.event_type = event_type
 		self.scope = scope
-		self.function_def = f"def {self.event_type}(self, event):"
+
+	def _build_function_def(self) -> str:
+		return f"def {self.event_type}(self, event):"
 
 	def _get_serializable_attrs(self) -> Dict[str, Any]:
 		base_attrs = super()._get_serializable_attrs()
@@ -280,9 +398,12 @@ class EventHandlerScript(ScriptNode):
 class Property(ViewNode):
 	"""Represents a component property."""
 
+	__slots__ = ('name', 'value', 'persistent', 'private_access')
+
 	def __init__(self, path: str, name: str, value: Any, *, persistent: bool = None, private_access: bool = None):
 		super().__init__(path, NodeType.PROPERTY)
-		self.name = name
+		# Property names repeat across components (text, style, ...), so they are shared
+		self.name = sys.intern(name) if isinstance(name, str) else name
 		self.value = value
 		self.persistent = persistent  # True if property is persistent, False if not, None if unknown
 		self.private_access = private_access  # True if access mode is 'PRIVATE', False if not, None if unknown
@@ -0,0 +1,149 @@
+"""
+This module defines the ViewModel class, the structured model the builders produce for a view.
+
+Every node is stored exactly once, in the collection for its node type. The generic
+'bindings' and 'scripts' collections are derived from those on access, and secondary
+indexes (by path, by component type, by owning component) plus per-type counts are kept
+up to date as nodes are added, so lookups never need to filter the node lists.
+
+ViewModel is a read-only Mapping from collection name to node list, so code written against
+the former dict-of-lists model keeps working.
+"""
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from .node_types import ViewNode, NodeType, Component, ALL_BINDINGS
+
+# Model collection that holds each node type
+NODE_TYPE_COLLECTIONS = {
+	NodeType.COMPONENT: 'components',
+	NodeType.EXPRESSION_BINDING: 'expression_bindings',
+	NodeType.EXPRESSION_STRUCT_BINDING: 'expression_struct_bindings',
+	NodeType.PROPERTY_BINDING: 'property_bindings',
+	NodeType.TAG_BINDING: 'tag_bindings',
+	NodeType.QUERY_BINDING: 'query_bindings',
+	NodeType.MESSAGE_HANDLER: 'message_handlers',
+	NodeType.CUSTOM_METHOD: 'custom_methods',
+	NodeType.TRANSFORM: 'script_transforms',
+	NodeType.EVENT_HANDLER: 'event_handlers',
+	NodeType.PROPERTY: 'properties',
+}
+
+# Order in which nodes are visited: specific collections only, so each node appears once
+NODE_ORDER = (
+	NodeType.COMPONENT, NodeType.MESSAGE_HANDLER, NodeType.CUSTOM_METHOD, NodeType.EXPRESSION_BINDING,
+	NodeType.EXPRESSION_STRUCT_BINDING, NodeType.PROPERTY_BINDING, NodeType.TAG_BINDING, NodeType.QUERY_BINDING,
+	NodeType.TRANSFORM, NodeType.EVENT_HANDLER, NodeType.PROPERTY
+)
+
+# Script node types, in the order they appear in the generic 'scripts' collection
+_SCRIPT_ORDER = (NodeType.TRANSFORM, NodeType.MESSAGE_HANDLER, NodeType.CUSTOM_METHOD, NodeType.EVENT_HANDLER)
+
+# Collection names, in the key order of the model
+MODEL_KEYS = (
+	'components', 'bindings', 'scripts', 'event_handlers', 'message_handlers', 'custom_methods',
+	'expression_bindings', 'expression_struct_bindings', 'property_bindings', 'tag_bindings',
+	'query_bindings', 'script_transforms', 'properties'
+)
+
+_COLLECTION_TYPES = {collection: node_type for node_type, collection in NODE_TYPE_COLLECTIONS.items()}
+
+
+class ViewModel(Mapping):
+	"""Indexed view model: a read-only mapping of collection name to the nodes of that collection."""
+
+	def __init__(self, nodes: Iterable[ViewNode] = ()):
+		self._by_type: Dict[NodeType, List[ViewNode]] = {node_type: [] for node_type in NODE_ORDER}
+		self._by_path: Dict[str, List[ViewNode]] = {}
+		self._components_by_type: Dict[str, List[Component]] = {}
+		self.components_by_path: Dict[str, Component] = {}
+		# Bindings in the order they were added (a binding followed by its expression transforms)
+		self._bindings: List[ViewNode] = []
+		self._scripts: Optional[List[ViewNode]] = None
+		for node in nodes:
+			self.add(node)
+
+	def add(self, node: ViewNode):
+		"""Add a node to its collection and to every index."""
+		node_type = node.node_type
+		self._by_type[node_type].append(node)
+		self._by_path.setdefault(node.path, []).append(node)
+		if node_type in ALL_BINDINGS:
+			self._bindings.append(node)
+		elif node_type is NodeType.COMPONENT:
+			self.components_by_path[node.path] = node
+			self._components_by_type.setdefault(node.type, []).append(node)
+		elif node_type in _SCRIPT_ORDER:
+			self._scripts = None
+
+	# Mapping interface: collection name -> node list
+	def __getitem__(self, collection: str) -> List[ViewNode]:
+		if collection in _COLLECTION_TYPES:
+			return self._by_type[_COLLECTION_TYPES[collection]]
+		if collection == 'bindings':
+			return self._bindings
+		if collection == 'scripts':
+			if self._scripts is None:
+				self._scripts = [node for node_type in _SCRIPT_ORDER for node in self._by_type[node_type]]
+			return self._scripts
+		raise KeyError(collection)
+
+	def __iter__(self) -> Iterator[str]:
+		return iter(MODEL_KEYS)
+
+	def __len__(self) -> int:
+		return len(MODEL_KEYS)
+
+	@property
+	def nodes(self) -> List[ViewNode]:
+		"""All nodes, each exactly once, in visiting order."""
+		return self.nodes_of_types(None)
+
+	@property
+	def total_nodes(self) -> int:
+		"""Number of distinct nodes in the model."""
+		return sum(len(nodes) for nodes in self._by_type.values())
+
+	def nodes_of_type(self, node_type: NodeType) -> List[ViewNode]:
+		"""Return the nodes of one type (the model's own list; do not modify it)."""
+		return self._by_type[node_type]
+
+	def nodes_of_types(self, node_types: Optional[Set[NodeType]]) -> List[ViewNode]:
+		"""Return the nodes of the given types, or of every type if node_types is empty or None, in visiting order."""
+		return [
+			node for node_type in NODE_ORDER if not node_types or node_type in node_types
+			for node in self._by_type[node_type]
+		]
+
+	def count(self, node_types) -> int:
+		"""Return the number of nodes of a node type, or of a set of node types (every type if empty)."""
+		if isinstance(node_types, NodeType):
+			return len(self._by_type[node_types])
+		if not node_types:
+			return self.total_nodes
+		return sum(len(self._by_type[node_type]) for node_type in node_types)
+
+	@property
+	def node_type_counts(self) -> Dict[NodeType, int]:
+		"""Number of nodes per node type, for the types present in the model."""
+		return {node_type: len(self._by_type[node_type]) for node_type in NodeType if self._by_type[node_type]}
+
+	def nodes_at(self, path: str) -> List[ViewNode]:
+		"""Return the nodes at a path (several nodes can share one, e.g. a script and an event handler)."""
+		return self._by_path.get(path, [])
+
+	def component(self, path: str) -> Optional[Component]:
+		"""Return the component at path, or None."""
+		return self.components_by_path.get(path)
+
+	@property
+	def components_by_type(self) -> Dict[str, List[Component]]:
+		"""Components grouped by their component type (e.g. 'ia.display.label')."""
+		return self._components_by_type
+
+	def owned_nodes(self, component_path: str) -> List[ViewNode]:
+		"""Return the bindings, scripts and properties whose innermost enclosing component is at component_path."""
+		component = self.components_by_path.get(component_path)
+		if component is None:
+			return []
+		return component.bindings + component.scripts + component.property_nodes
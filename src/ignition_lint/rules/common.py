@@ -3,16 +3,44 @@ This module contains common and base node types for rule implementation
 """
 
 from abc import ABC, abstractmethod
-from typing import Set, List, Dict, Any, Literal
+from typing import Set, List, Dict, Any, Callable, Literal, FrozenSet, Optional
 from ..model.node_types import Property, ViewNode, NodeType, ScriptNode, ALL_BINDINGS, ALL_SCRIPTS
+from ..model.view_model import NODE_TYPE_COLLECTIONS
 
 # Type definition for severity levels
 Severity = Literal["warning", "error"]
 RESERVED_KEY_NAMES = {"_JavaDate"}
 
+
+def is_private_property(node: ViewNode) -> bool:
+	"""Check if a node represents a private property (name starts with '_' or is reserved)."""
+	if node.node_type == NodeType.PROPERTY and isinstance(node, Property):
+		return node.name.startswith('_') or node.name in RESERVED_KEY_NAMES
+	return False
+
+
 class NodeVisitor(ABC):
 	"""Simplified base visitor class that rules can extend."""
 
+	# Name of the method handling each node type, or None where it would do nothing; resolved
+	# once per class, when the class is created
+	_handler_names: Dict[NodeType, Optional[str]] = {}
+
+	def __init_subclass__(cls, **kwargs):
+		super().__init_subclass__(**kwargs)
+		cls._handler_names = _resolve_handler_names(cls)
+
+	def visit_handlers(self) -> Dict[NodeType, Optional[Callable[[ViewNode], Any]]]:
+		"""
+		Return this visitor's handler for every node type, the way ViewNode.accept would resolve it.
+
+		A node type maps to the bound visit_<type> method, falling back to visit_generic, or to
+		None when that is one of NodeVisitor's empty methods, so nodes of that type can be skipped.
+		"""
+		return {
+			node_type: None if name is None else getattr(self, name) for node_type, name in self._handler_names.items()
+		}
+
 	def visit_generic(self, node: ViewNode):
 		"""Generic visit method for nodes that don't have specific handlers."""
 
@@ -45,9 +73,30 @@ class NodeVisitor(ABC):
 		"""Visit a property node."""
 
 
+# NodeVisitor's own visit methods, which do nothing
+_EMPTY_HANDLERS = frozenset(
+	method for name, method in vars(NodeVisitor).items() if name.startswith('visit_') and name != 'visit_handlers'
+)
+
+
+def _resolve_handler_names(cls: type) -> Dict[NodeType, Optional[str]]:
+	"""Map every node type to the name of the visitor class's method handling it, or None if it does nothing."""
+	handler_names = {}
+	for node_type in NodeType:
+		name = f"visit_{node_type.value}"
+		if not getattr(cls, name, None):
+			name = 'visit_generic'
+		handler_names[node_type] = None if getattr(cls, name) in _EMPTY_HANDLERS else name
+	return handler_names
+
+
 class LintingRule(NodeVisitor):
 	"""Base class for linting rules with simplified interface and self-processing capability."""
 
+	# Milliseconds the rule may take to process a view before the engine aborts it, from the
+	# "timeout_ms" setting of its configuration; None for no limit
+	timeout_ms: Optional[float] = None
+
 	def __init__(self, target_node_types: Set[NodeType] = None, severity: str = "error", include_private_properties: bool = False):
 		"""
 		Initialize the rule.
@@ -92,11 +141,24 @@ class LintingRule(NodeVisitor):
 		processed_config = cls.preprocess_config(config)
 		return cls(**processed_config)
 
+	@property
+	def required_collections(self) -> Optional[FrozenSet[str]]:
+		"""
+		Model collections this rule reads, derived from target_node_types.
+
+		The engine only builds the collections that at least one rule requires. Override this
+		if a rule needs collections beyond the nodes it visits.
+
+		Returns:
+			Set of model collection names, or None if the rule applies to all nodes.
+		"""
+		if not self.target_node_types:
+			return None
+		return frozenset(NODE_TYPE_COLLECTIONS[node_type] for node_type in self.target_node_types)
+
 	def _is_private_property(self, node: ViewNode) -> bool:
 		"""Check if a node represents a private property (name starts with '_')."""
-		if node.node_type == NodeType.PROPERTY and isinstance(node, Property):
-			return node.name.startswith('_') or node.name in RESERVED_KEY_NAMES
-		return False
+		return is_private_property(node)
 
 	def applies_to(self, node: ViewNode) -> bool:
 		"""Check if this rule applies to the given node."""
@@ -112,16 +174,40 @@ class LintingRule(NodeVisitor):
 
 	def process_nodes(self, nodes: List[ViewNode]):
 		"""Process a list of nodes, applying the rule to applicable ones."""
-		self.errors = []  # Reset errors
-		self.warnings = []  # Reset warnings
-
 		# Filter nodes that this rule applies to
-		applicable_nodes = [node for node in nodes if self.applies_to(node)]
+		self.process_applicable_nodes([node for node in nodes if self.applies_to(node)])
+
+	def process_applicable_nodes(self, nodes: List[ViewNode]):
+		"""
+		Process nodes already known to apply to this rule.
+
+		The engine calls this with the nodes of the rule's target types, private properties
+		already excluded, so no node is checked with applies_to. Node types the rule has no
+		handler for (see visit_handlers) are left out as well.
+		"""
+		self.begin_processing()
+
+		# Visit each applicable node through the handler resolved for its type
+		handlers = self.visit_handlers()
+		for node in nodes:
+			handler = handlers[node.node_type]
+			if handler is not None:
+				handler(node)
 
-		# Visit each applicable node
-		for node in applicable_nodes:
-			node.accept(self)
+		self.finish_processing()
+
+	def begin_processing(self):
+		"""
+		Reset per-view state before the first node of a view is visited.
+
+		Override this (calling super) rather than process_nodes, so the engine can also run the
+		rule in its fused mode, where every rule's handlers are called in a single pass.
+		"""
+		self.errors = []  # Reset errors
+		self.warnings = []  # Reset warnings
 
+	def finish_processing(self):
+		"""Run per-view work after the last node of a view has been visited."""
 		# Allow for batch processing if needed
 		self.post_process()
 
@@ -171,22 +257,11 @@ class ScriptRule(LintingRule):
 		super().__init__(target_node_types, severity, include_private_properties)
 		self.collected_scripts = {}
 
-	def process_nodes(self, nodes: List[ViewNode]):
-		"""Process a list of nodes, applying the rule to applicable ones."""
-		self.errors = []  # Reset errors
-		self.warnings = []  # Reset warnings
+	def begin_processing(self):
+		"""Reset results and collected scripts before a view is visited."""
+		super().begin_processing()
 		self.collected_scripts = {}  # Reset collected scripts
 
-		# Filter nodes that this rule applies to
-		applicable_nodes = [node for node in nodes if self.applies_to(node)]
-
-		# Visit each applicable node
-		for node in applicable_nodes:
-			node.accept(self)
-
-		# Allow for batch processing if needed
-		self.post_process()
-
 	def visit_message_handler(self, node: ViewNode):
 		self._collect_script(node)
 
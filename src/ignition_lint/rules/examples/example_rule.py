@@ -50,6 +50,9 @@ class ExampleBindingCountRule(LintingRule):
 	and working with different node types.
 	"""
 
+	# Bindings that count towards the limit (struct and query bindings are not counted)
+	COUNTED_BINDING_TYPES = {NodeType.EXPRESSION_BINDING, NodeType.PROPERTY_BINDING, NodeType.TAG_BINDING}
+
 	@classmethod
 	def preprocess_config(cls, config):
 		"""Preprocess configuration before rule instantiation."""
@@ -66,7 +69,7 @@ class ExampleBindingCountRule(LintingRule):
 
 	def __init__(self, warning_threshold: int = 5, error_threshold: int = 10):
 		"""Initialize with binding count thresholds."""
-		# Target both components and bindings
+		# Target both components and bindings, so the model includes the bindings each component owns
 		super().__init__({NodeType.COMPONENT} | ALL_BINDINGS)
 
 		self.warning_threshold = warning_threshold
@@ -77,37 +80,16 @@ class ExampleBindingCountRule(LintingRule):
 	def error_message(self) -> str:
 		return f"Components should not have more than {self.error_threshold} bindings"
 
+	def begin_processing(self):
+		"""Forget the components counted for the previous view."""
+		super().begin_processing()
+		self.component_bindings = {}
+
 	def visit_component(self, node: ViewNode):
-		"""Initialize binding count for each component."""
-		self.component_bindings[node.path] = 0
-
-	def visit_expression_binding(self, node: ViewNode):
-		"""Count expression bindings."""
-		self._count_binding(node)
-
-	def visit_property_binding(self, node: ViewNode):
-		"""Count property bindings."""
-		self._count_binding(node)
-
-	def visit_tag_binding(self, node: ViewNode):
-		"""Count tag bindings."""
-		self._count_binding(node)
-
-	def _count_binding(self, node: ViewNode):
-		"""Helper to count bindings for their parent component."""
-		# Find the parent component path
-		path_parts = node.path.split('.')
-		component_path = None
-
-		# Look for parent component in the path
-		for i in range(len(path_parts) - 1, 0, -1):
-			potential_path = '.'.join(path_parts[:i])
-			if potential_path in self.component_bindings:
-				component_path = potential_path
-				break
-
-		if component_path:
-			self.component_bindings[component_path] += 1
+		"""Count the expression, property and tag bindings the component owns."""
+		self.component_bindings[node.path] = sum(
+			1 for binding in node.bindings if binding.node_type in self.COUNTED_BINDING_TYPES
+		)
 
 	def post_process(self):
 		"""Called after all nodes are processed to generate final errors."""
@@ -59,20 +59,19 @@ class UnusedCustomPropertiesRule(LintingRule):
 		self.used_properties = set()
 		self.flattened_json = {}
 
+	def begin_processing(self):
+		"""Reset results and property tracking before a view is visited, so no view sees another's properties."""
+		super().begin_processing()
+		self.defined_properties = {}
+		self.used_properties = set()
+
 	def set_flattened_json(self, flattened_json: Dict[str, Any]):
 		"""Set the flattened JSON for comprehensive property reference searching."""
 		self.flattened_json = flattened_json
 
-	def process_nodes(self, nodes):
-		"""Process nodes to detect unused custom properties and view parameters."""
-		# Call parent process_nodes first to get standard property processing
-		super().process_nodes(nodes)
-
-		# After processing all nodes, check for unused properties
-		self.finalize()
-
 	def post_process(self):
-		"""Called after all nodes are visited - but we handle this in process_nodes."""
+		"""After processing all nodes, check for unused properties."""
+		self.finalize()
 
 	def visit_property(self, node):
 		"""Visit property nodes to find custom property definitions."""
@@ -7,10 +7,12 @@ import datetime
 import tempfile
 import os
 import re
+import secrets
 import shutil
 from typing import Dict, List, Tuple
 
 from io import StringIO
+from astroid import MANAGER
 from pylint import lint
 from pylint.reporters.text import TextReporter
 
@@ -48,9 +50,10 @@ class PylintScriptRule(ScriptRule):
 		debug_dir = self._setup_debug_directory()
 		combined_content, line_map = self._combine_scripts(scripts)
 		path_to_issues = {path: [] for path in scripts.keys()}
-		temp_file_path = None
+		# Named before the file exists, so that the finally block removes it wherever the run is interrupted
+		temp_file_path = self._temp_file_path()
 		try:
-			temp_file_path = self._create_temp_file(combined_content)
+			self._write_temp_file(temp_file_path, combined_content)
 			pylint_output = self._run_pylint_on_file(temp_file_path, debug_dir)
 			self._parse_pylint_output(pylint_output, line_map, path_to_issues, debug_dir)
 		except (OSError, IOError) as e:
@@ -59,6 +62,10 @@ class PylintScriptRule(ScriptRule):
 		except ImportError as e:
 			error_msg = f"Error importing pylint modules: {str(e)}"
 			self._handle_pylint_error(error_msg, debug_dir, path_to_issues)
+		except BaseException:
+			# Interrupted, e.g. by a time budget: astroid may have been stopped midway through caching a module
+			MANAGER.clear_cache()
+			raise
 		finally:
 			self._cleanup_temp_file(temp_file_path, debug_dir, path_to_issues)
 
@@ -123,12 +130,15 @@ class PylintScriptRule(ScriptRule):
 
 		return "\n".join(combined_scripts), line_map
 
-	def _create_temp_file(self, content: str) -> str:
-		"""Create temporary file with script content."""
+	def _temp_file_path(self) -> str:
+		"""Return a new, unused path for the temporary file pylint is run on."""
 		timestamp = datetime.datetime.now().strftime("%H%M%S")
-		with tempfile.NamedTemporaryFile(prefix=f"{timestamp}_", suffix=".py", delete=False) as temp_file:
+		return os.path.join(tempfile.gettempdir(), f"{timestamp}_{secrets.token_hex(8)}.py")
+
+	def _write_temp_file(self, temp_file_path: str, content: str):
+		"""Create the temporary file with script content, readable only by the user."""
+		with open(temp_file_path, 'xb', opener=lambda path, flags: os.open(path, flags, 0o600)) as temp_file:
 			temp_file.write(content.encode('utf-8'))
-			return temp_file.name
 
 	def _run_pylint_on_file(self, temp_file_path: str, debug_dir: str) -> str:
 		"""Execute pylint on the temporary file and return output."""
@@ -200,13 +210,12 @@ class PylintScriptRule(ScriptRule):
 			path_to_issues[path].append(error_msg)
 
 	def _cleanup_temp_file(self, temp_file_path: str, debug_dir: str, path_to_issues: Dict[str, List[str]]) -> None:
-		"""Clean up temporary file, keeping it for debug if there were issues."""
-		if temp_file_path and os.path.exists(temp_file_path):
+		"""Remove the temporary file, keeping a copy for debug if there were issues."""
+		if os.path.exists(temp_file_path):
 			if any(issues for issues in path_to_issues.values()):
 				shutil.copy(temp_file_path, os.path.join(debug_dir, "pylint_input_temp.py"))
 				print(f"Pylint encountered issues. Debug files saved to: {debug_dir}")
-			else:
-				os.remove(temp_file_path)
+			os.remove(temp_file_path)
 
 
 def _save_debug_file(temp_file_path: str, debug_dir: str):
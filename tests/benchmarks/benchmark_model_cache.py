@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# pylint: disable=import-error,wrong-import-position
+"""
+Timing benchmark for the model cache.
+
+For every test case view, and one large synthetic view built from all of them (see
+benchmark_node_memory.py), compares reading, flattening and building the model of the
+view file with loading both from a ModelCache (content hash check included), and reports
+the size of the cache entries next to the size of the view files.
+
+This is a standalone script, not part of the test suite:
+
+  python tests/benchmarks/benchmark_model_cache.py
+  python tests/benchmarks/benchmark_model_cache.py --scale 50 --repeat 10 --json
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from benchmark_node_memory import CASES_DIR, build_corpus_view
+from ignition_lint.common.flatten_json import flatten_json, read_json_file
+from ignition_lint.common.result_cache import ModelCache
+from ignition_lint.model.builder import ViewModelBuilder
+
+
+def parse_view(view_file: Path):
+	"""Read, flatten and build the complete model of a view file, as on a model cache miss."""
+	flattened = flatten_json(read_json_file(view_file))
+	return flattened, ViewModelBuilder().build_model(flattened)
+
+
+def load_view(cache: ModelCache, view_file: Path):
+	"""Load the flattened view and model of a view file from the cache, as on a model cache hit."""
+	return cache.get(cache.key_for(view_file))
+
+
+def best_time(function, view_files: list, repeat: int) -> float:
+	"""Return the best total time, in milliseconds, of calling function on every file, over repeat runs."""
+	best = float('inf')
+	for _ in range(repeat):
+		start = time.perf_counter()
+		for view_file in view_files:
+			function(view_file)
+		best = min(best, time.perf_counter() - start)
+	return round(best * 1000, 3)
+
+
+def measure(view_files: list, cache_dir: Path, repeat: int) -> dict:
+	"""Fill a model cache with the views, then time parsing them against loading them from the cache."""
+	cache = ModelCache(cache_dir)
+	for view_file in view_files:
+		cache.put(cache.key_for(view_file), *parse_view(view_file))
+		if load_view(cache, view_file) is None:
+			raise RuntimeError(f"No model cached for {view_file}")
+
+	parse_ms = best_time(parse_view, view_files, repeat)
+	load_ms = best_time(lambda view_file: load_view(cache, view_file), view_files, repeat)
+	return {
+		'files': len(view_files),
+		'view_bytes': sum(view_file.stat().st_size for view_file in view_files),
+		'cache_bytes': sum(entry.stat().st_size for entry in (cache_dir / 'models').iterdir()),
+		'parse_ms': parse_ms,
+		'load_ms': load_ms,
+		'speedup': round(parse_ms / load_ms, 2),
+	}
+
+
+def main():
+	"""Parse arguments, run the benchmark and print the results."""
+	parser = argparse.ArgumentParser(description="Time loading view models from the model cache against parsing.")
+	parser.add_argument('--scale', type=int, default=20, help="Copies of each case in the large view (default: 20)")
+	parser.add_argument('--repeat', type=int, default=5, help="Runs per measurement; the best is kept (default: 5)")
+	parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+	args = parser.parse_args()
+
+	with tempfile.TemporaryDirectory() as temp_dir:
+		temp_dir = Path(temp_dir)
+		corpus_file = temp_dir / 'view.json'
+		corpus_file.write_text(json.dumps(build_corpus_view(args.scale)), encoding='utf-8')
+		results = {
+			'test cases': measure(sorted(CASES_DIR.glob('*/view.json')), temp_dir / 'cases-cache', args.repeat),
+			f'corpus x{args.scale}': measure([corpus_file], temp_dir / 'corpus-cache', args.repeat),
+		}
+
+	if args.json:
+		print(json.dumps(results, indent=2))
+		return
+
+	for corpus, result in results.items():
+		print(
+			f"{corpus} ({result['files']} files, {result['view_bytes'] / 1024:.0f} KiB of JSON, "
+			f"{result['cache_bytes'] / 1024:.0f} KiB cached): parse {result['parse_ms']:.2f} ms, "
+			f"load {result['load_ms']:.2f} ms ({result['speedup']:.1f}x)"
+		)
+
+
+if __name__ == '__main__':
+	main()
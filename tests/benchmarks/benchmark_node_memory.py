@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# pylint: disable=import-error,wrong-import-position
+"""
+Memory benchmark for the view model's nodes.
+
+Builds one large synthetic view from the tests/cases corpus (every case's root container
+copied --scale times under a common root) and reports the memory the built model keeps,
+per node, together with the shallow instance size of each node class.
+
+This is a standalone script, not part of the test suite. Run it before and after a change
+to the node classes and compare the output:
+
+  python tests/benchmarks/benchmark_node_memory.py
+  python tests/benchmarks/benchmark_node_memory.py --scale 200 --json
+"""
+
+import argparse
+import copy
+import gc
+import json
+import sys
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from ignition_lint.common.flatten_json import flatten_json, read_json_file
+from ignition_lint.model.builder import ViewModelBuilder
+
+CASES_DIR = Path(__file__).parent.parent / 'cases'
+
+
+def build_corpus_view(scale: int) -> dict:
+	"""Combine every test case view into one view, with each case's root repeated scale times."""
+	children = []
+	custom, params, prop_config = {}, {}, {}
+	for view_file in sorted(CASES_DIR.glob('*/view.json')):
+		view = read_json_file(view_file)
+		case = view_file.parent.name.replace(' ', '_')
+		for name, value in view.get('custom', {}).items():
+			custom[f"{case}_{name}"] = value
+		for name, value in view.get('params', {}).items():
+			params[f"{case}_{name}"] = value
+		for path, config in view.get('propConfig', {}).items():
+			scope, _, name = path.partition('.')
+			if scope in ('custom', 'params'):
+				prop_config[f"{scope}.{case}_{name}"] = config
+		if 'root' not in view:
+			continue
+		for copy_index in range(scale):
+			root = copy.deepcopy(view['root'])
+			root.setdefault('meta', {})['name'] = f"{case}_{copy_index}"
+			children.append(root)
+	return {
+		'custom': custom,
+		'params': params,
+		'propConfig': prop_config,
+		'root': {'meta': {'name': 'root'}, 'type': 'ia.container.flex', 'children': children},
+	}
+
+
+def instance_size(node) -> int:
+	"""Shallow size of a node: the object itself plus its attribute dict, if it has one."""
+	size = sys.getsizeof(node)
+	if hasattr(node, '__dict__'):
+		size += sys.getsizeof(node.__dict__)
+	return size
+
+
+def measure(scale: int) -> dict:
+	"""Build the corpus model and measure the memory it retains."""
+	flattened = flatten_json(build_corpus_view(scale))
+	gc.collect()
+
+	tracemalloc.start()
+	model = ViewModelBuilder().build_model(flattened)
+	gc.collect()
+	retained, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+
+	nodes = model.nodes
+	class_sizes = {}
+	class_counts = Counter(type(node).__name__ for node in nodes)
+	for node in nodes:
+		class_sizes.setdefault(type(node).__name__, instance_size(node))
+	return {
+		'scale': scale,
+		'flattened_keys': len(flattened),
+		'nodes': len(nodes),
+		'retained_bytes': retained,
+		'peak_bytes': peak,
+		'bytes_per_node': round(retained / len(nodes), 1) if nodes else 0,
+		'classes': {
+			name: {'count': class_counts[name], 'instance_bytes': class_sizes[name]}
+			for name in sorted(class_counts)
+		},
+	}
+
+
+def main():
+	"""Parse arguments, run the benchmark and print the results."""
+	parser = argparse.ArgumentParser(description="Measure the memory the view model keeps per node.")
+	parser.add_argument('--scale', type=int, default=100, help="Copies of each test case view (default: 100)")
+	parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+	args = parser.parse_args()
+
+	results = measure(args.scale)
+	if args.json:
+		print(json.dumps(results, indent=2))
+		return
+
+	print(f"Scale:           {results['scale']} copies of each case")
+	print(f"Flattened keys:  {results['flattened_keys']:,}")
+	print(f"Nodes:           {results['nodes']:,}")
+	print(f"Retained memory: {results['retained_bytes'] / 1024 / 1024:.1f} MiB (peak {results['peak_bytes'] / 1024 / 1024:.1f} MiB)")
+	print(f"Bytes per node:  {results['bytes_per_node']}")
+	print("\nInstance size per node class (object plus attribute dict):")
+	for name, stats in results['classes'].items():
+		print(f"  {name:<26} {stats['instance_bytes']:>5} bytes  x {stats['count']:,}")
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# pylint: disable=import-error,wrong-import-position
+"""
+Timing benchmark for the engine's rule execution modes.
+
+Lints every test case view, and one large synthetic view built from all of them (see
+benchmark_node_memory.py), with 5 and with 20 rules enabled, once with each rule walking
+its nodes in turn ('per-rule') and once with all rules sharing a single walk ('fused').
+PylintScriptRule is left out: it runs pylint in a subprocess, which would dominate the timings.
+
+This is a standalone script, not part of the test suite:
+
+  python tests/benchmarks/benchmark_rule_execution.py
+  python tests/benchmarks/benchmark_rule_execution.py --scale 50 --repeat 10 --json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from benchmark_node_memory import CASES_DIR, build_corpus_view
+from ignition_lint.common.flatten_json import flatten_json, read_json_file
+from ignition_lint.linter import LintEngine, EXECUTION_MODES
+from ignition_lint.model.node_types import NodeType, ALL_BINDINGS
+from ignition_lint.rules import RULES_MAP
+
+
+def _rule(name: str, *args, **kwargs):
+	"""Create a registered rule by name."""
+	return RULES_MAP[name](*args, **kwargs)
+
+
+def create_rules(count: int) -> list:
+	"""Return the first count rules of a fixed set of 20 rule configurations."""
+	rules = [
+		_rule('PollingIntervalRule'),
+		_rule('NamePatternRule', 'PascalCase'),
+		_rule('NamePatternRule', 'camelCase', target_node_types={NodeType.PROPERTY}),
+		_rule('ExampleNameLengthRule'),
+		_rule('BadComponentReferenceRule'),
+		_rule('UnusedCustomPropertiesRule'),
+		_rule('ExampleBindingCountRule'),
+		_rule('ExampleMixedSeverityRule'),
+		_rule('PollingIntervalRule', minimum_interval=5000),
+		_rule('BadComponentReferenceRule', case_sensitive=False),
+		_rule('ExampleNameLengthRule', min_length=5, target_node_types={NodeType.PROPERTY}),
+	]
+	for convention in ('camelCase', 'snake_case', 'kebab-case', 'SCREAMING_SNAKE_CASE', 'Title Case'):
+		rules.append(_rule('NamePatternRule', convention, target_node_types={NodeType.COMPONENT}))
+	for convention in ('PascalCase', 'snake_case'):
+		rules.append(_rule('NamePatternRule', convention, target_node_types={NodeType.PROPERTY}))
+	rules.append(_rule('NamePatternRule', 'camelCase', target_node_types=set(ALL_BINDINGS)))
+	rules.append(
+		_rule('NamePatternRule', 'camelCase', target_node_types={NodeType.CUSTOM_METHOD, NodeType.MESSAGE_HANDLER})
+	)
+	return rules[:count]
+
+
+def time_views(views: list, rule_count: int, mode: str, repeat: int) -> dict:
+	"""Lint the views and return the best per-file times, in milliseconds, over repeat runs."""
+	engine = LintEngine(create_rules(rule_count), execution_mode=mode)
+	best_total = best_rules = float('inf')
+	for _ in range(repeat):
+		total = rules = 0.0
+		for flattened in views:
+			start = time.perf_counter()
+			engine.process(dict(flattened))  # A new object, so the model is rebuilt as for a new file
+			middle = time.perf_counter()
+			engine.process(engine.flattened_json)  # The same object again: only the rules run
+			rules += time.perf_counter() - middle
+			total += middle - start
+		best_total = min(best_total, total)
+		best_rules = min(best_rules, rules)
+	return {
+		'per_file_ms': round(best_total / len(views) * 1000, 3),
+		'rules_per_file_ms': round(best_rules / len(views) * 1000, 3),
+	}
+
+
+def main():
+	"""Parse arguments, run the benchmark and print the results."""
+	parser = argparse.ArgumentParser(description="Time the per-rule and fused rule execution modes.")
+	parser.add_argument('--scale', type=int, default=20, help="Copies of each case in the large view (default: 20)")
+	parser.add_argument('--repeat', type=int, default=5, help="Runs per measurement; the best is kept (default: 5)")
+	parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+	args = parser.parse_args()
+
+	corpora = {
+		'test cases': [flatten_json(read_json_file(path)) for path in sorted(CASES_DIR.glob('*/view.json'))],
+		f'corpus x{args.scale}': [flatten_json(build_corpus_view(args.scale))],
+	}
+	results = {
+		corpus: {
+			f'{rule_count} rules': {mode: time_views(views, rule_count, mode, args.repeat) for mode in EXECUTION_MODES}
+			for rule_count in (5, 20)
+		}
+		for corpus, views in corpora.items()
+	}
+
+	if args.json:
+		print(json.dumps(results, indent=2))
+		return
+
+	for corpus, by_rule_count in results.items():
+		print(f"{corpus} ({len(corpora[corpus])} files), per file: total / rules only")
+		for rule_count, by_mode in by_rule_count.items():
+			timings = '   '.join(
+				f"{mode}: {timing['per_file_ms']:.2f} / {timing['rules_per_file_ms']:.2f} ms"
+				for mode, timing in by_mode.items()
+			)
+			print(f"  {rule_count:<9} {timings}")
+
+
+if __name__ == '__main__':
+	main()
@@ -8,10 +8,15 @@ import unittest
 import subprocess
 import tempfile
 import json
+import re
 import sys
 from pathlib import Path
 
 from fixtures.base_test import BaseIntegrationTest
+from ignition_lint.rules import RULES_MAP
+
+# Name of the temporary file PylintScriptRule runs pylint on
+TEMP_MODULE = re.compile(r"\d{6}_[0-9a-f]{16}")
 
 
 class TestCLIIntegration(BaseIntegrationTest):
@@ -175,6 +180,75 @@ class TestCLIIntegration(BaseIntegrationTest):
 		except Exception as e:
 			self.fail(f"Unexpected error running CLI stats-only: {e}")
 
+	def test_cli_parallel_jobs_match_serial(self):
+		"""Test linting with several worker processes prints the same output and exit code as a serial run."""
+		# Every rule, so a rule carrying state from one view into the next changes the serial output
+		config = {rule_name: {"enabled": True} for rule_name in RULES_MAP}
+		with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+			json.dump(config, f)
+			config_file = f.name
+
+		try:
+			view_files = [str(path) for path in sorted(self.test_cases_dir.glob("*/view.json"))]
+			if len(view_files) < 2:
+				self.skipTest("Not enough test case files found")
+
+			args = ["--config", config_file, "--no-cache", *view_files]
+			serial = self._run_cli_command(["--jobs", "1", *args], timeout=120)
+			parallel = self._run_cli_command(["--jobs", "4", *args], timeout=120)
+
+			self.assertEqual(parallel.returncode, serial.returncode, f"STDERR: {parallel.stderr}")
+			# Pylint reports name the temporary module it checked, which is new on every run
+			self.assertEqual(TEMP_MODULE.sub("<module>", parallel.stdout), TEMP_MODULE.sub("<module>", serial.stdout))
+			self.assertIn(f"Files processed: {len(view_files)}", parallel.stdout)
+
+		except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+			self.skipTest(f"CLI test skipped: {e}")
+		finally:
+			Path(config_file).unlink(missing_ok=True)
+
+	def test_cli_cached_run_matches_uncached(self):
+		"""Test a run answered from the result cache prints the same results as linting the files."""
+		config = {"NamePatternRule": {"enabled": True, "kwargs": {"convention": "PascalCase"}}}
+		with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+			json.dump(config, f)
+			config_file = f.name
+
+		try:
+			with tempfile.TemporaryDirectory() as cache_dir:
+				view_files = [str(path) for path in sorted(self.test_cases_dir.glob("*/view.json"))]
+				args = ["--config", config_file, "--cache-dir", cache_dir, *view_files]
+
+				uncached = self._run_cli_command(["--no-cache", *args])
+				self.assertFalse(any(Path(cache_dir).iterdir()))
+				cold = self._run_cli_command(args)
+				warm = self._run_cli_command(["--jobs", "2", *args])
+
+				self.assertTrue((Path(cache_dir) / "results").is_dir())
+				for result in (cold, warm):
+					self.assertEqual(result.returncode, uncached.returncode, f"STDERR: {result.stderr}")
+					self.assertEqual(result.stdout, uncached.stdout)
+
+		except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+			self.skipTest(f"CLI test skipped: {e}")
+		finally:
+			Path(config_file).unlink(missing_ok=True)
+
+	def test_cli_refuses_to_clear_a_directory_that_is_not_a_cache(self):
+		"""Test --clear-cache exits with an error, deleting nothing, when --cache-dir is not a cache directory."""
+		try:
+			with tempfile.TemporaryDirectory() as project_dir:
+				project_file = Path(project_dir) / "view.json"
+				project_file.write_text('{"root": {}}', encoding='utf-8')
+
+				result = self._run_cli_command(["--cache-dir", project_dir, "--clear-cache", str(project_file)])
+				self.assertEqual(result.returncode, 1, f"STDERR: {result.stderr}")
+				self.assertIn("not an ignition-lint cache directory", result.stdout)
+				self.assertTrue(project_file.exists())
+
+		except (subprocess.TimeoutExpired, FileNotFoundError) as e:
+			self.skipTest(f"CLI test skipped: {e}")
+
 	def test_cli_version_or_basic_execution(self):
 		"""Test that the CLI can at least execute without crashing."""
 		try:
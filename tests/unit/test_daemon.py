@@ -0,0 +1,165 @@
+# pylint: disable=import-error,wrong-import-position
+"""
+Unit tests for the lint daemon: a run served by the daemon must print and exit exactly as the
+same run in-process, a daemon running other package sources must hand over to a new one, an
+idle daemon must exit, and a socket directory the user does not own exclusively is refused.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from ignition_lint import daemon
+from ignition_lint.cli import main
+from ignition_lint.daemon import LintDaemon, package_fingerprint, socket_path
+
+CASES_DIR = Path(__file__).resolve().parent.parent / 'cases'
+
+CONFIG = {
+	'NamePatternRule': {
+		'enabled': True,
+		'kwargs': {'target_node_types': ['component'], 'convention': 'PascalCase'},
+	},
+	'PollingIntervalRule': {'enabled': True, 'kwargs': {'minimum_interval': 10000}},
+}
+
+
+@unittest.skipUnless(daemon.daemon_supported(), "Unix sockets are not available")
+class TestLintDaemon(unittest.TestCase):
+	"""Serve requests from a daemon running in a thread, on a socket in a temporary directory."""
+
+	def setUp(self):
+		self.original_cwd = os.getcwd()
+		self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+		self.root = Path(self.temp_dir.name).resolve()
+		self.config = self.root / 'rule_config.json'
+		self.config.write_text(json.dumps(CONFIG), encoding='utf-8')
+		self.path = str(self.root / 'daemon.sock')
+		self.daemon = LintDaemon(self.path, idle_timeout=10)
+		self.thread = threading.Thread(target=self.daemon.serve_forever, daemon=True)
+		self.thread.start()
+		self.wait_for_socket()
+
+	def tearDown(self):
+		if self.thread.is_alive():
+			self.request([], fingerprint='stop')
+		self.thread.join(10)
+		os.chdir(self.original_cwd)
+		self.temp_dir.cleanup()
+
+	def wait_for_socket(self):
+		"""Wait until the daemon listens."""
+		for _ in range(200):
+			if os.path.exists(self.path):
+				return
+			self.thread.join(0.01)
+		self.fail("The daemon did not start listening")
+
+	def request(self, argv, fingerprint=None):
+		"""Send a command line to the daemon and return its reply."""
+		return daemon._request(  # pylint: disable=protected-access
+			self.path, {'argv': argv, 'cwd': str(self.root), 'fingerprint': fingerprint or package_fingerprint()}
+		)
+
+	def run_locally(self, argv):
+		"""Run a command line in-process and return its output and exit code."""
+		stdout = io.StringIO()
+		stderr = io.StringIO()
+		exit_code = 0
+		with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+			try:
+				main(argv)
+			except SystemExit as e:
+				exit_code = e.code or 0
+		return stdout.getvalue(), stderr.getvalue(), exit_code
+
+	def test_runs_match_local_runs(self):
+		"""Test repeated and reconfigured runs print and exit as they do without the daemon."""
+		view_files = ','.join(str(path) for path in sorted(CASES_DIR.glob('*/view.json')))
+		argv = ['--config', str(self.config), '--files', view_files, '--no-cache']
+		for attempt in ('first', 'reused engine', 'changed config'):
+			with self.subTest(attempt=attempt):
+				if attempt == 'changed config':
+					self.config.write_text(json.dumps({'PollingIntervalRule': CONFIG['PollingIntervalRule']}), encoding='utf-8')
+				reply = self.request(argv)
+				stdout, stderr, exit_code = self.run_locally(argv)
+				self.assertEqual(reply['status'], 'ok')
+				self.assertEqual((reply['stdout'], reply['stderr'], reply['exit_code']), (stdout, stderr, exit_code))
+				self.assertEqual(exit_code, 1)
+
+		reply = self.request(['--no-such-option'])
+		self.assertEqual(reply['exit_code'], 2)
+		self.assertIn('unrecognized arguments', reply['stderr'])
+
+	def test_watch_runs_locally(self):
+		"""Test watch mode, which never finishes, is left to the client."""
+		self.assertEqual(self.request(['--watch', str(self.root)])['status'], 'local')
+
+	def test_outdated_daemon_hands_over(self):
+		"""Test a request from other package sources stops the daemon and removes its socket."""
+		self.assertEqual(self.request([], fingerprint='other sources')['status'], 'restart')
+		self.thread.join(10)
+		self.assertFalse(self.thread.is_alive())
+		self.assertFalse(os.path.exists(self.path))
+
+	def test_idle_daemon_exits(self):
+		"""Test the daemon exits once no request arrives within its idle timeout."""
+		idle_daemon = LintDaemon(str(self.root / 'idle.sock'), idle_timeout=0.05)
+		idle_daemon.serve_forever()
+		self.assertFalse(os.path.exists(idle_daemon.path))
+
+	def test_second_daemon_does_not_take_over(self):
+		"""Test a daemon started for a socket another daemon serves exits at once."""
+		LintDaemon(self.path, idle_timeout=10).serve_forever()
+		self.assertTrue(os.path.exists(self.path))
+		self.assertEqual(self.request(['--no-such-option'])['exit_code'], 2)
+
+
+@unittest.skipUnless(daemon.daemon_supported(), "Unix sockets are not available")
+class TestSocketPath(unittest.TestCase):
+	"""Test the socket directory is only used when it is private to the user."""
+
+	def setUp(self):
+		self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+		self.runtime_dir = Path(self.temp_dir.name)
+		self.directory = self.runtime_dir / f"ignition-lint-{os.getuid()}"
+		self.environ = mock.patch.dict(os.environ, {'XDG_RUNTIME_DIR': str(self.runtime_dir)})
+		self.environ.start()
+
+	def tearDown(self):
+		self.environ.stop()
+		self.temp_dir.cleanup()
+
+	def test_private_directory_is_created(self):
+		"""Test the directory is created with mode 0700 and the socket is placed in it."""
+		path = socket_path(self.temp_dir.name)
+		self.assertEqual(Path(path).parent, self.directory)
+		self.assertEqual(self.directory.stat().st_mode & 0o777, 0o700)
+		self.assertEqual(socket_path(self.temp_dir.name), path)
+
+	def test_unsafe_directory_is_refused(self):
+		"""Test a directory others can access, or a symlink to one, is refused."""
+		self.directory.mkdir(mode=0o755)
+		self.directory.chmod(0o755)
+		with self.assertRaises(PermissionError):
+			socket_path(self.temp_dir.name)
+
+		self.directory.rmdir()
+		target = self.runtime_dir / 'target'
+		target.mkdir(mode=0o700)
+		self.directory.symlink_to(target)
+		with self.assertRaises(PermissionError):
+			socket_path(self.temp_dir.name)
+
+
+if __name__ == '__main__':
+	unittest.main()
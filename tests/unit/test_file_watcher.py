@@ -0,0 +1,99 @@
+# pylint: disable=import-error,wrong-import-position
+"""
+Unit tests for the view file watchers used by watch mode: both watchers must report views
+created, modified, moved and deleted anywhere in the tree, and nothing else.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from ignition_lint.common.file_watcher import WATCH_METHODS, PollingWatcher, create_watcher, iter_change_batches
+
+# Long enough for a change to be seen, short enough to keep the tests fast
+TIMEOUT = 1.0
+
+
+class TestWatchers(unittest.TestCase):
+	"""Run the same scenarios against every watch method available on this system."""
+
+	def setUp(self):
+		self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+		self.root = Path(self.temp_dir.name).resolve()
+		self.write('views/Existing/view.json', '{}')
+
+	def tearDown(self):
+		self.temp_dir.cleanup()
+
+	def write(self, relative_path: str, text: str):
+		"""Write a file below the watched directory, creating its directories."""
+		path = self.root / relative_path
+		path.parent.mkdir(parents=True, exist_ok=True)
+		path.write_text(text, encoding='utf-8')
+
+	def watchers(self):
+		"""Yield a watcher of the tree for each available method, closing it afterwards."""
+		for method in sorted(WATCH_METHODS):
+			watcher = PollingWatcher(self.root, interval=0.02) if method == 'poll' else create_watcher(self.root, method)
+			with self.subTest(method=method):
+				try:
+					yield watcher
+				finally:
+					watcher.close()
+
+	def test_changes(self):
+		"""Test creations, edits, moves and deletions of view files are reported, other files are not."""
+		existing = self.root / 'views/Existing/view.json'
+		for watcher in self.watchers():
+			self.assertEqual(watcher.view_files(), [existing])
+
+			self.write('views/New/Nested/view.json', '{}')
+			self.assertEqual(watcher.changes(TIMEOUT), {self.root / 'views/New/Nested/view.json'})
+
+			self.write('views/Existing/view.json', '{"root": {}}')
+			self.write('views/Existing/resource.json', '{}')
+			self.assertEqual(watcher.changes(TIMEOUT), {existing})
+
+			# Saved by writing a temporary file and renaming it over the view
+			self.write('views/Existing/view.json.tmp', '{"root": [1]}')
+			os.replace(self.root / 'views/Existing/view.json.tmp', existing)
+			self.assertEqual(watcher.changes(TIMEOUT), {existing})
+
+			(self.root / 'views/New').rename(self.root / 'views/Renamed')
+			self.assertEqual(
+				watcher.changes(TIMEOUT),
+				{self.root / 'views/New/Nested/view.json', self.root / 'views/Renamed/Nested/view.json'}
+			)
+			self.write('views/Renamed/Nested/view.json', '{"moved": true}')
+			self.assertEqual(watcher.changes(TIMEOUT), {self.root / 'views/Renamed/Nested/view.json'})
+
+			shutil.rmtree(self.root / 'views/Renamed')
+			self.assertEqual(watcher.changes(TIMEOUT), {self.root / 'views/Renamed/Nested/view.json'})
+			self.assertEqual(watcher.view_files(), [existing])
+			self.assertEqual(watcher.changes(0.05), set())
+
+	def test_batches_are_debounced(self):
+		"""Test changes arriving within the debounce window are reported together."""
+		for watcher in self.watchers():
+			batches = iter_change_batches(watcher, debounce=0.3)
+			self.write('views/Existing/view.json', '{"root": {}}')
+			self.write('views/Other/view.json', '{}')
+			self.assertEqual(
+				next(batches), {self.root / 'views/Existing/view.json', self.root / 'views/Other/view.json'}
+			)
+			shutil.rmtree(self.root / 'views/Other')
+			self.assertEqual(next(batches), {self.root / 'views/Other/view.json'})
+
+	def test_unknown_method(self):
+		"""Test an unknown watch method is rejected."""
+		with self.assertRaises(ValueError):
+			create_watcher(self.root, 'fsevents')
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,111 @@
+# pylint: disable=import-error,wrong-import-position
+"""
+Unit tests for the FlatIndex prefix/suffix index.
+
+Every query is checked against the equivalent linear scan over the flattened JSON,
+including the document order of the results.
+"""
+
+import os
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from ignition_lint.common.flat_index import FlatIndex
+from ignition_lint.common.flatten_json import flatten_json, read_json_file
+
+
+class TestFlatIndex(unittest.TestCase):
+	"""Test FlatIndex queries on small hand-written views."""
+
+	def setUp(self):
+		self.flattened = flatten_json({
+			"custom": {"b": 1, "a": 2},
+			"params": {"p": "x"},
+			"props": {"x": 1},
+			"propsExtra": {"y": 2},
+			"root": {
+				"meta": {"name": "root"},
+				"type": "ia.container.flex",
+				"children": [
+					{"meta": {"name": "Label"}, "type": "ia.display.label"},
+					{"meta": {"name": "Button"}, "type": "ia.input.button"},
+				],
+			},
+		})
+		self.index = FlatIndex(self.flattened)
+
+	def test_items_under_keeps_document_order(self):
+		"""Test that prefix matches come back in insertion order, not sorted order."""
+		self.assertEqual(self.index.items_under("custom."), [("custom.b", 1), ("custom.a", 2)])
+		self.assertEqual(self.index.keys_under("nothing."), [])
+
+	def test_has_prefix(self):
+		"""Test prefix existence checks."""
+		self.assertTrue(self.index.has_prefix("root.root.children[1].Button."))
+		self.assertTrue(self.index.has_prefix("props"))
+		self.assertFalse(self.index.has_prefix("propConfig."))
+		self.assertFalse(self.index.has_prefix("zzz"))
+
+	def test_children(self):
+		"""Test listing immediate child segments of object and array paths."""
+		self.assertEqual(self.index.children(""), ["custom", "params", "props", "propsExtra", "root"])
+		self.assertEqual(self.index.children("root.root"), ["meta", "type", "children"])
+		self.assertEqual(self.index.children("root.root.children"), ["[0]", "[1]"])
+		# "propsExtra" shares the string prefix but is not a child of "props"
+		self.assertEqual(self.index.children("props"), ["x"])
+
+	def test_suffix_lookup(self):
+		"""Test keys_with_suffix and items_with_suffix."""
+		self.assertEqual(
+			self.index.items_with_suffix(".meta.name"),
+			[
+				("root.root.meta.name", "root"),
+				("root.root.children[0].Label.meta.name", "Label"),
+				("root.root.children[1].Button.meta.name", "Button"),
+			]
+		)
+		self.assertEqual(self.index.keys_with_suffix(".nope"), [])
+
+	def test_mapping_access(self):
+		"""Test the dictionary-style helpers."""
+		self.assertEqual(len(self.index), len(self.flattened))
+		self.assertIn("params.p", self.index)
+		self.assertEqual(self.index["params.p"], "x")
+		self.assertIsNone(self.index.get("params.q"))
+
+	def test_empty_index(self):
+		"""Test that an empty index answers every query with nothing."""
+		index = FlatIndex({})
+		self.assertFalse(index.has_prefix(""))
+		self.assertEqual(index.items_under(""), [])
+		self.assertEqual(index.keys_with_suffix("x"), [])
+		self.assertEqual(index.children(""), [])
+
+
+class TestFlatIndexCorpus(unittest.TestCase):
+	"""Compare FlatIndex against linear scans over every test case view."""
+
+	def test_matches_linear_scan(self):
+		"""Test prefix and suffix queries for every view in tests/cases."""
+		cases_dir = Path(__file__).parent.parent / 'cases'
+		for view_file in sorted(cases_dir.glob('*/view.json')):
+			with self.subTest(case=view_file.parent.name):
+				flattened = flatten_json(read_json_file(view_file))
+				index = FlatIndex(flattened)
+				prefixes = {""}
+				for key in flattened:
+					prefixes.update(key[:cut] for cut in range(0, len(key), 7))
+				for prefix in sorted(prefixes)[:500]:
+					expected = [(key, value) for key, value in flattened.items() if key.startswith(prefix)]
+					self.assertEqual(index.items_under(prefix), expected)
+					self.assertEqual(index.has_prefix(prefix), bool(expected))
+				for suffix in ('.meta.name', '.binding.type', '.messageType', '.script', 'e'):
+					expected = [key for key in flattened if key.endswith(suffix)]
+					self.assertEqual(index.keys_with_suffix(suffix), expected)
+
+
+if __name__ == '__main__':
+	unittest.main()
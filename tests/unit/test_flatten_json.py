@@ -19,8 +19,8 @@ from pathlib import Path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
 
 from ignition_lint.common.flatten_json import (
-	flatten_json, flatten_file, read_json_file, write_json_file, format_json, preserve_unicode_escapes,
-	restore_unicode_escapes
+	flatten_json, flatten_file, iter_flatten_file, read_json_file, write_json_file, format_json,
+	preserve_unicode_escapes, restore_unicode_escapes
 )
 
 
@@ -102,6 +102,17 @@ class TestFlattenJson(unittest.TestCase):
 
 		self.assertEqual(result, expected)
 
+	def test_flatten_deep_nesting(self):
+		"""Test nesting deeper than the recursion limit flattens without a RecursionError."""
+		depth = sys.getrecursionlimit() * 2
+		data = "leaf"
+		for _ in range(depth):
+			data = {"a": [data]}
+
+		result = flatten_json(data)
+
+		self.assertEqual(result, OrderedDict([(".".join(["a[0]"] * depth), "leaf")]))
+
 	def test_flatten_complex_ignition_structure(self):
 		"""Test flattening a structure similar to Ignition view components."""
 		data = {
@@ -237,6 +248,118 @@ class TestFileOperations(unittest.TestCase):
 			self.assertEqual(line, line.rstrip())
 
 
+class TestStreamingFlatten(unittest.TestCase):
+	"""Test that the streaming flattener matches flatten_json without building the JSON tree."""
+
+	def setUp(self): # pylint: disable=invalid-name
+		"""Set up temporary files for testing."""
+		self.temp_dir = Path(tempfile.mkdtemp())
+
+	def tearDown(self): # pylint: disable=invalid-name
+		"""Clean up temporary files."""
+		if self.temp_dir.exists():
+			shutil.rmtree(self.temp_dir)
+
+	def _write(self, data) -> Path:
+		test_file = self.temp_dir / "view.json"
+		with test_file.open("w", encoding="utf-8") as f:
+			json.dump(data, f, ensure_ascii=False)
+		return test_file
+
+	def _assert_stream_matches(self, test_file: Path):
+		expected = list(flatten_json(read_json_file(test_file)).items())
+		# Tiny chunk sizes force tokens to straddle chunk boundaries
+		for chunk_size in (1, 7, 65536):
+			with self.subTest(chunk_size=chunk_size):
+				self.assertEqual(list(iter_flatten_file(test_file, chunk_size=chunk_size)), expected)
+
+	def test_stream_matches_test_cases(self):
+		"""Test streaming output matches flatten_json for every test case view."""
+		cases_dir = Path(__file__).parent.parent / "cases"
+		for view_file in sorted(cases_dir.glob("*/view.json")):
+			with self.subTest(case=view_file.parent.name):
+				self._assert_stream_matches(view_file)
+
+	def test_stream_component_name_after_children(self):
+		"""Test meta.name rewriting applies to keys that appear before the meta key."""
+		data = {
+			"children": [{"props": {"text": "Go"}, "meta": {"name": "Button"}}],
+			"meta": {"name": "Root"},
+		}
+		test_file = self._write(data)
+
+		result = OrderedDict(iter_flatten_file(test_file))
+
+		self.assertEqual(result["Root.children[0].Button.props.text"], "Go")
+		self._assert_stream_matches(test_file)
+
+	def test_stream_java_dates(self):
+		"""Test Java Date objects collapse under keys but not inside lists, as in flatten_json."""
+		date = {"$": ["ts", 192, 1699999999999], "$ts": 1700000000000}
+		data = {
+			"custom": {"start": date, "notDate": {"$": ["ts", 1, 2], "$ts": 3, "extra": 4}},
+			"dates": [date],
+		}
+		test_file = self._write(data)
+
+		result = OrderedDict(iter_flatten_file(test_file))
+
+		self.assertEqual(result["custom.start._JavaDate"], 1700000000000)
+		self.assertEqual(result["custom.notDate.extra"], 4)
+		self.assertIn("dates[0].$ts", result)
+		self._assert_stream_matches(test_file)
+
+	def test_stream_mixed_structures(self):
+		"""Test root lists, nested lists, empty containers, escapes and literals."""
+		data = [{"text": "quote \" and \u00e9", "n": [-1.5e3, 0, True, None, [], {}]}, [[1, [2]]]]
+		self._assert_stream_matches(self._write(data))
+
+	def test_stream_deep_nesting(self):
+		"""Test nesting deeper than the recursion limit streams without a RecursionError."""
+		depth = sys.getrecursionlimit() * 2
+		test_file = self.temp_dir / "deep.json"
+		test_file.write_text('{"a": [' * depth + '"leaf"' + ']}' * depth, encoding="utf-8")
+
+		self.assertEqual(list(iter_flatten_file(test_file)), [(".".join(["a[0]"] * depth), "leaf")])
+
+	def test_stream_invalid_json(self):
+		"""Test that malformed JSON raises JSONDecodeError."""
+		test_file = self.temp_dir / "bad.json"
+		test_file.write_text('{"a": [1, 2}', encoding="utf-8")
+
+		with self.assertRaises(json.JSONDecodeError):
+			list(iter_flatten_file(test_file))
+
+	def test_stream_error_position(self):
+		"""Test errors point at the same line, column and character as the json module, across chunks."""
+		test_file = self.temp_dir / "bad.json"
+		test_file.write_text(json.dumps({"pad": ["x" * 50] * 2000}, indent=2)[:-1] + ',\n  "a": [1,,2]}', encoding="utf-8")
+		with self.assertRaises(json.JSONDecodeError) as expected:
+			json.loads(test_file.read_text(encoding="utf-8"))
+
+		for chunk_size in (1, 7, 65536):
+			with self.subTest(chunk_size=chunk_size), self.assertRaises(json.JSONDecodeError) as raised:
+				list(iter_flatten_file(test_file, chunk_size=chunk_size))
+			error = raised.exception
+			self.assertEqual((error.lineno, error.colno, error.pos), (expected.exception.lineno, expected.exception.colno, expected.exception.pos))
+			self.assertIn(f"line {error.lineno} column {error.colno}", str(error))
+
+	def test_stream_invalid_utf8(self):
+		"""Test bytes that are not UTF-8 raise JSONDecodeError pointing at them."""
+		test_file = self.temp_dir / "bad.json"
+		test_file.write_bytes(b'{"a": 1,\n "b": "\xff"}')
+
+		with self.assertRaises(json.JSONDecodeError) as raised:
+			list(iter_flatten_file(test_file, chunk_size=4))
+		self.assertEqual((raised.exception.lineno, raised.exception.colno), (2, 8))
+
+	def test_flatten_file_streaming(self):
+		"""Test the streaming mode of flatten_file returns the same sorted results."""
+		test_file = self._write({"b": {"meta": {"name": "X"}, "v": 1}, "a": [1, 2]})
+
+		self.assertEqual(list(flatten_file(test_file, streaming=True).items()), list(flatten_file(test_file).items()))
+
+
 class TestUnicodeHandling(unittest.TestCase):
 	"""Test Unicode escape handling functionality."""
 
@@ -0,0 +1,136 @@
+# pylint: disable=import-error,wrong-import-position
+"""
+Unit tests for listing changed view files with git, in a temporary repository: additions,
+modifications, renames and deletions, since a ref and in the index, and linting the staged
+content of a view rather than its working tree file.
+"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from ignition_lint.cli import main
+from ignition_lint.common.git_changes import GitError, changed_view_files, staged_copies
+
+# A view whose only component is not named in PascalCase, and the same view once it is fixed
+BAD_VIEW = '{"root": {"meta": {"name": "root"}, "children": [{"meta": {"name": "bad_name"}, "type": "ia.display.label"}]}}'
+FIXED_VIEW = BAD_VIEW.replace('bad_name', 'GoodName')
+
+
+@unittest.skipIf(shutil.which('git') is None, "git is not installed")
+class TestChangedViewFiles(unittest.TestCase):
+	"""Test which view files are reported after changes on a branch and in the index."""
+
+	def setUp(self):
+		self.original_cwd = os.getcwd()
+		self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+		self.repo = Path(self.temp_dir.name).resolve()
+		self.git('init', '-q', '-b', 'main')
+		for view in ('Kept', 'Edited', 'Moved', 'Deleted'):
+			self.write(f"views/{view}/view.json", f'{{"root": {{"meta": {{"name": "{view}"}}}}}}')
+		self.write('README.md', 'views')
+		self.git('add', '-A')
+		self.git('commit', '-q', '-m', 'views')
+
+	def tearDown(self):
+		os.chdir(self.original_cwd)
+		self.temp_dir.cleanup()
+
+	def git(self, *args):
+		"""Run git in the repository."""
+		subprocess.run(
+			['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],
+			cwd=self.repo, check=True, capture_output=True
+		)
+
+	def write(self, relative_path: str, text: str):
+		"""Write a file in the repository, creating its directories."""
+		path = self.repo / relative_path
+		path.parent.mkdir(parents=True, exist_ok=True)
+		path.write_text(text, encoding='utf-8')
+
+	def changed(self, **kwargs):
+		"""Return the changed view files, as POSIX paths relative to the repository."""
+		return sorted(path.as_posix() for path in changed_view_files(cwd=str(self.repo), **kwargs))
+
+	def test_changed_since_ref(self):
+		"""Test committed, uncommitted and untracked changes count; deletions and other files do not."""
+		self.git('checkout', '-q', '-b', 'feature')
+		self.write('views/Edited/view.json', '{"root": {}}')
+		self.git('mv', 'views/Moved', 'views/Renamed')
+		self.git('rm', '-q', 'views/Deleted/view.json')
+		self.write('README.md', 'changed')
+		self.git('commit', '-q', '-am', 'change views')
+		self.write('views/Kept/view.json', '{"root": {"meta": {}}}')
+		self.write('views/New/view.json', '{}')
+
+		self.assertEqual(
+			self.changed(since='main'),
+			['views/Edited/view.json', 'views/Kept/view.json', 'views/New/view.json', 'views/Renamed/view.json']
+		)
+		self.assertEqual(self.changed(since='HEAD'), ['views/Kept/view.json', 'views/New/view.json'])
+
+	def test_staged(self):
+		"""Test only changes in the index count, including files deleted from the working tree since."""
+		self.write('views/Edited/view.json', '{"root": {}}')
+		self.write('views/Kept/view.json', '{"root": {"meta": {}}}')
+		self.write('views/Staged/view.json', '{}')
+		self.git('add', 'views/Edited/view.json', 'views/Staged/view.json')
+		(self.repo / 'views/Staged/view.json').unlink()
+
+		self.assertEqual(self.changed(staged=True), ['views/Edited/view.json', 'views/Staged/view.json'])
+
+	def test_staged_copies_hold_the_index_content(self):
+		"""Test the copies hold the staged content, not the working tree's, and are removed on exit."""
+		self.write('views/Edited/view.json', BAD_VIEW)
+		self.git('add', 'views/Edited/view.json')
+		self.write('views/Edited/view.json', FIXED_VIEW)
+
+		file_paths = changed_view_files(staged=True, cwd=str(self.repo / 'views'))
+		with staged_copies(file_paths, cwd=str(self.repo / 'views')) as copies:
+			copy = copies[Path('Edited/view.json')]
+			self.assertEqual(copy.read_text(encoding='utf-8'), BAD_VIEW)
+		self.assertFalse(copy.exists())
+
+	def test_cli_lints_the_staged_content(self):
+		"""Test --staged reports the issues of what is staged, under the file's own path."""
+		self.write('config.json', json.dumps({'NamePatternRule': {'enabled': True, 'kwargs': {'convention': 'PascalCase'}}}))
+		self.write('views/Edited/view.json', BAD_VIEW)
+		self.git('add', 'views/Edited/view.json')
+		self.write('views/Edited/view.json', FIXED_VIEW)
+		os.chdir(self.repo)
+
+		output = io.StringIO()
+		with contextlib.redirect_stdout(output), self.assertRaises(SystemExit):
+			main(['--staged', '--no-cache', '--jobs', '1', '--config', 'config.json'])
+		self.assertIn("Found 1 warnings in views/Edited/view.json", output.getvalue())
+		self.assertIn("'bad_name'", output.getvalue())
+
+	def test_paths_are_relative_to_the_working_directory(self):
+		"""Test files below the working directory are reported relative to it."""
+		self.write('views/Edited/view.json', '{"root": {}}')
+		self.git('add', '-A')
+		self.assertEqual(changed_view_files(staged=True, cwd=str(self.repo / 'views')), [Path('Edited/view.json')])
+
+	def test_errors(self):
+		"""Test unknown refs and directories outside a repository raise GitError."""
+		with self.assertRaises(GitError):
+			changed_view_files(since='no-such-ref', cwd=str(self.repo))
+		with tempfile.TemporaryDirectory() as outside:
+			with self.assertRaises(GitError):
+				changed_view_files(staged=True, cwd=outside)
+		with self.assertRaises(ValueError):
+			changed_view_files(cwd=str(self.repo))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,97 @@
+# pylint: disable=import-error,wrong-import-position
+"""
+Unit tests for the JSON decode backends.
+
+Every available backend must produce exactly what the stdlib json module produces,
+whether the file is read into memory or memory-mapped.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from ignition_lint.common.flatten_json import read_json_file
+from ignition_lint.common.json_backend import BACKENDS, get_backend, load_json_file
+
+
+class TestJsonBackend(unittest.TestCase):
+	"""Test backend selection and decoding."""
+
+	def setUp(self):
+		self.temp_dir = Path(tempfile.mkdtemp())
+
+	def tearDown(self):
+		shutil.rmtree(self.temp_dir)
+
+	def _write(self, name: str, content: bytes) -> Path:
+		path = self.temp_dir / name
+		path.write_bytes(content)
+		return path
+
+	def test_backend_selection(self):
+		"""Test auto-selection and rejection of unknown backends."""
+		self.assertIn('stdlib', BACKENDS)
+		expected = 'orjson' if 'orjson' in BACKENDS else 'stdlib'
+		self.assertEqual(get_backend().name, expected)
+		self.assertEqual(get_backend('auto').name, expected)
+		self.assertEqual(get_backend('stdlib').name, 'stdlib')
+		with self.assertRaises(ValueError):
+			get_backend('simdjson-nope')
+
+	def test_corpus_matches_stdlib(self):
+		"""Test every backend, with and without mmap, on every test case view."""
+		cases_dir = Path(__file__).parent.parent / 'cases'
+		for view_file in sorted(cases_dir.glob('*/view.json')):
+			with view_file.open('r', encoding='utf-8') as file:
+				expected = json.load(file)
+			for name in BACKENDS:
+				for threshold in (0, 1 << 40):
+					with self.subTest(case=view_file.parent.name, backend=name, mmap=threshold == 0):
+						result = load_json_file(view_file, name, mmap_threshold=threshold)
+						self.assertEqual(result, expected)
+						self.assertEqual(list(result), list(expected))
+						self.assertIs(type(result), dict)
+
+	def test_lenient_input(self):
+		"""Test NaN, huge integers, a UTF-8 BOM and non-ASCII text decode on every backend."""
+		content = '{"nan": NaN, "big": 123456789012345678901234567890, "text": "Größe ✓"}'.encode('utf-8')
+		for name in BACKENDS:
+			for prefix in (b'', b'\xef\xbb\xbf'):
+				with self.subTest(backend=name, bom=bool(prefix)):
+					result = load_json_file(self._write('lenient.json', prefix + content), name, mmap_threshold=0)
+					self.assertNotEqual(result['nan'], result['nan'])
+					self.assertEqual(result['big'], 123456789012345678901234567890)
+					self.assertEqual(result['text'], "Größe ✓")
+
+	def test_invalid_json(self):
+		"""Test that invalid JSON raises json.JSONDecodeError on every backend."""
+		path = self._write('invalid.json', b'{"a": [1, 2}')
+		for name in BACKENDS:
+			with self.subTest(backend=name):
+				with self.assertRaises(json.JSONDecodeError):
+					load_json_file(path, name, mmap_threshold=0)
+
+	def test_empty_file(self):
+		"""Test that an empty file is reported as invalid JSON rather than failing to map."""
+		path = self._write('empty.json', b'')
+		for name in BACKENDS:
+			with self.subTest(backend=name):
+				with self.assertRaises(json.JSONDecodeError):
+					load_json_file(path, name, mmap_threshold=0)
+
+	def test_read_json_file_uses_backend(self):
+		"""Test read_json_file returns plain dicts for an explicit backend."""
+		path = self._write('view.json', b'{"b": {"c": 1}, "a": 2}')
+		result = read_json_file(path, backend='stdlib')
+		self.assertEqual(list(result), ['b', 'a'])
+		self.assertIs(type(result['b']), dict)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,141 @@
+# pylint: disable=import-error,wrong-import-position
+"""
+Unit tests for ViewModelBuilder: the component tree, component ownership and propConfig lookups.
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from ignition_lint.common.flatten_json import flatten_json
+from ignition_lint.model.builder import ViewModelBuilder
+
+
+def _label(name, **members):
+	return {"meta": {"name": name}, "type": "ia.display.label", **members}
+
+
+class TestPropertyExtraction(unittest.TestCase):
+	"""Test how properties are attributed and configured."""
+
+	def setUp(self):
+		self.builder = ViewModelBuilder()
+
+	def build_properties(self, view):
+		"""Build the model and return its properties keyed by path."""
+		model = self.builder.build_model(flatten_json(view))
+		return {prop.path: prop for prop in model['properties']}
+
+	def test_owner_is_innermost_component_at_a_segment_boundary(self):
+		"""Test owners resolve to the deepest component whose path is a whole-segment prefix."""
+		children = [_label(f"Label{index}", props={"text": index}) for index in range(11)]
+		children[1]["children"] = [_label("Inner", props={"text": "inner"})]
+		self.build_properties({"root": {"meta": {"name": "root"}, "type": "ia.container.flex", "children": children}})
+
+		find_owner = self.builder._find_owner  # pylint: disable=protected-access
+		self.assertEqual(
+			find_owner("root.root.children[10].Label10.props.text"), "root.root.children[10].Label10"
+		)
+		self.assertEqual(
+			find_owner("root.root.children[1].Label1.children[0].Inner.props.text"),
+			"root.root.children[1].Label1.children[0].Inner"
+		)
+		self.assertEqual(find_owner("root.root.props.style.color"), "root.root")
+		self.assertIsNone(find_owner("props.text"))
+		self.assertIsNone(find_owner("text"))
+
+	def test_properties_outside_components_are_skipped(self):
+		"""Test only view-level custom/params properties exist outside a component."""
+		properties = self.build_properties({
+			"custom": {"a": 1},
+			"params": {"b": 2},
+			"props": {"defaultSize": {"width": 100}},
+			"root": _label("root", props={"text": "x"}),
+		})
+		self.assertEqual(list(properties), ["custom.a", "params.b", "root.root.props.text"])
+
+	def test_prop_config_persistence_and_access(self):
+		"""Test persistence and access come from the propConfig entry of the exact property path."""
+		properties = self.build_properties({
+			"custom": {"kept": 1, "dropped": 2, "keptLonger": 3},
+			"propConfig": {
+				"custom.kept": {"persistent": True, "access": "PRIVATE"},
+				"custom.dropped": {"persistent": False},
+				"custom.keptLonger": {"access": "PUBLIC"},
+				"root.root.custom.hidden": {"persistent": False},
+			},
+			"root": _label("root", custom={"hidden": 1, "shown": 2}),
+		})
+		self.assertEqual(list(properties), ["custom.kept", "custom.keptLonger", "root.root.custom.shown"])
+		self.assertTrue(properties["custom.kept"].persistent)
+		self.assertTrue(properties["custom.kept"].private_access)
+		self.assertIsNone(properties["custom.keptLonger"].persistent)
+		self.assertFalse(properties["custom.keptLonger"].private_access)
+		self.assertIsNone(properties["root.root.custom.shown"].private_access)
+
+		# Settings do not leak into the next build
+		properties = self.build_properties({"custom": {"dropped": 2}})
+		self.assertIsNone(properties["custom.dropped"].persistent)
+
+
+class TestComponentTree(unittest.TestCase):
+	"""Test the parent/child links and owned nodes of components."""
+
+	VIEW = {
+		"custom": {"viewProp": 1},
+		"root": {
+			"children": [
+				{
+					"children": [_label("Inner", props={"text": "inner"})],
+					"meta": {"name": "Panel"},
+					"propConfig": {"props.visible": {"binding": {"config": {"expression": "true"}, "type": "expr"}}},
+					"props": {"visible": True},
+					"scripts": {"customMethods": [{"name": "refresh", "params": [], "script": "pass"}]},
+					"type": "ia.container.flex",
+				},
+				_label("Title", events={"onClick": {"script": "pass"}}),
+			],
+			"meta": {"name": "root"},
+			"type": "ia.container.flex",
+		},
+	}
+
+	def test_tree_links(self):
+		"""Test parents, children, depth and owned nodes."""
+		builder = ViewModelBuilder()
+		builder.build_model(flatten_json(self.VIEW))
+		root = builder.get_component("root.root")
+		panel = builder.get_component("root.root.children[0].Panel")
+		inner = builder.get_component("root.root.children[0].Panel.children[0].Inner")
+		title = builder.get_component("root.root.children[1].Title")
+
+		self.assertIsNone(root.parent)
+		self.assertEqual(root.children, [panel, title])
+		self.assertIs(inner.parent, panel)
+		self.assertEqual([root.depth, panel.depth, inner.depth], [0, 1, 2])
+		self.assertEqual(list(inner.iter_ancestors()), [panel, root])
+		self.assertEqual(list(root.iter_descendants()), [panel, inner, title])
+
+		self.assertEqual([binding.path for binding in panel.bindings], ["root.root.children[0].Panel.propConfig.props.visible"])
+		self.assertEqual([script.node_type.value for script in panel.scripts], ["custom_method"])
+		self.assertEqual([script.node_type.value for script in title.scripts], ["event_handler"])
+		self.assertEqual(panel.properties, {"visible": True})
+		self.assertEqual(inner.properties, {"text": "inner"})
+		self.assertEqual(root.properties, {})
+		self.assertEqual(root.bindings, [])
+		self.assertIsNone(builder.get_component("custom"))
+
+	def test_rebuild_starts_a_new_tree(self):
+		"""Test components from a previous build are not reused."""
+		builder = ViewModelBuilder()
+		builder.build_model(flatten_json(self.VIEW))
+		first_root = builder.get_component("root.root")
+		builder.build_model(flatten_json(self.VIEW))
+		self.assertIsNot(builder.get_component("root.root"), first_root)
+		self.assertEqual(len(builder.get_component("root.root").children), 2)
+
+
+if __name__ == '__main__':
+	unittest.main()
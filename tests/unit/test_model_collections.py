@@ -0,0 +1,166 @@
+# pylint: disable=import-error,wrong-import-position
+"""
+Unit tests for demand-driven model building.
+
+Rules declare the model collections they need, and the builders only run the collectors
+that fill those collections. A partial model must hold exactly the nodes of the full model
+for every requested collection.
+"""
+
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from ignition_lint.common.flatten_json import flatten_json, read_json_file
+from ignition_lint.linter import LintEngine
+from ignition_lint.model.builder import ViewModelBuilder, COLLECTION_COLLECTORS, resolve_collectors
+from ignition_lint.model.node_types import NodeType
+from ignition_lint.rules import PollingIntervalRule, NamePatternRule, PylintScriptRule
+from ignition_lint.rules.common import LintingRule
+
+CASES_DIR = Path(__file__).parent.parent / 'cases'
+
+
+def _serialize(nodes):
+	serialized = [node.serialize() for node in nodes]
+	# Components only own the properties of models that include the properties collection
+	for node in serialized:
+		node.pop('properties_count', None)
+	return serialized
+
+
+class _AllNodesRule(LintingRule):
+	"""Rule without target node types, which therefore needs the whole model."""
+
+	@property
+	def error_message(self) -> str:
+		return "Visits every node"
+
+
+class TestRequiredCollections(unittest.TestCase):
+	"""Test the collections rules declare and the collectors they resolve to."""
+
+	def test_rules_derive_collections_from_target_types(self):
+		"""Test required_collections follows target_node_types."""
+		self.assertEqual(
+			PollingIntervalRule().required_collections,
+			{'expression_bindings', 'expression_struct_bindings', 'property_bindings', 'tag_bindings', 'query_bindings'}
+		)
+		self.assertEqual(
+			NamePatternRule(target_node_types={NodeType.COMPONENT}).required_collections, {'components'}
+		)
+		self.assertEqual(
+			PylintScriptRule().required_collections,
+			{'message_handlers', 'custom_methods', 'script_transforms', 'event_handlers'}
+		)
+		self.assertIsNone(_AllNodesRule().required_collections)
+
+	def test_engine_unions_rule_collections(self):
+		"""Test the engine requests the union of its rules' collections, or everything."""
+		engine = LintEngine([PollingIntervalRule(), NamePatternRule(target_node_types={NodeType.COMPONENT})])
+		self.assertIn('components', engine.required_collections())
+		self.assertIn('tag_bindings', engine.required_collections())
+		self.assertNotIn('properties', engine.required_collections())
+		self.assertIsNone(LintEngine([PollingIntervalRule(), _AllNodesRule()]).required_collections())
+
+	def test_resolve_collectors(self):
+		"""Test collection names map to the collectors that fill them."""
+		self.assertEqual(resolve_collectors(['tag_bindings', 'script_transforms']), {'bindings'})
+		self.assertEqual(resolve_collectors(['properties']), {'components', 'properties'})
+		self.assertEqual(resolve_collectors([]), set())
+		self.assertEqual(len(resolve_collectors(None)), 6)
+		with self.assertRaises(ValueError):
+			resolve_collectors(['widgets'])
+
+
+class TestPartialModels(unittest.TestCase):
+	"""Compare partial models with the full model on every test case view."""
+
+	def test_requested_collections_match_full_model(self):
+		"""Test each collection built on its own equals the same collection of the full model."""
+		for view_file in sorted(CASES_DIR.glob('*/view.json')):
+			view = read_json_file(view_file)
+			flattened = flatten_json(view)
+			full = ViewModelBuilder().build_model(flattened)
+			for collection in COLLECTION_COLLECTORS:
+				with self.subTest(case=view_file.parent.name, collection=collection):
+					model = ViewModelBuilder().build_model(flattened, collections=[collection])
+					self.assertEqual(_serialize(model[collection]), _serialize(full[collection]))
+					self.assertEqual(list(model), list(full))
+
+	def test_unrequested_collections_are_empty(self):
+		"""Test collectors that fill no requested collection do not run."""
+		view = read_json_file(CASES_DIR / 'PreferredStyle' / 'view.json')
+		model = ViewModelBuilder().build_model(flatten_json(view), collections=['tag_bindings'])
+		self.assertEqual(model['properties'], [])
+		self.assertEqual(model['components'], [])
+		self.assertEqual(model['message_handlers'], [])
+
+	def test_polling_rule_skips_property_extraction(self):
+		"""Test an engine with only PollingIntervalRule never collects properties."""
+		view_file = CASES_DIR / 'PreferredStyle' / 'view.json'
+		flattened = flatten_json(read_json_file(view_file))
+		full_results = LintEngine([PollingIntervalRule(), _AllNodesRule()]).process(flattened)
+
+		engine = LintEngine([PollingIntervalRule()])
+		with mock.patch.object(ViewModelBuilder, '_collect_properties') as collect_properties:
+			results = engine.process(flattened)
+		collect_properties.assert_not_called()
+		self.assertEqual(results.errors.get('PollingIntervalRule'), full_results.errors.get('PollingIntervalRule'))
+
+	def test_debug_output_builds_full_model(self):
+		"""Test the full model is built when it is written out for debugging."""
+		view_file = CASES_DIR / 'PreferredStyle' / 'view.json'
+		flattened = flatten_json(read_json_file(view_file))
+		engine = LintEngine([PollingIntervalRule()], debug_output_dir=None)
+		engine.debug_output_dir = 'unused'
+		with mock.patch.object(LintEngine, '_save_debug_files'):
+			engine.process(flattened, source_file_path=str(view_file))
+		self.assertTrue(engine.view_model['properties'])
+
+
+class TestModelReuse(unittest.TestCase):
+	"""Test the engine builds the model once per view."""
+
+	VIEW_FILE = CASES_DIR / 'PreferredStyle' / 'view.json'
+
+	def count_builds(self, engine, calls):
+		"""Run calls(engine) and return how many times the engine's builder built a model."""
+		with mock.patch.object(
+			engine.model_builder, 'build_model', wraps=engine.model_builder.build_model
+		) as build_model:
+			calls(engine)
+		return build_model.call_count
+
+	def test_one_build_per_view(self):
+		"""Test statistics, analysis, node debugging and linting of one view share a single model."""
+		flattened = flatten_json(read_json_file(self.VIEW_FILE))
+		engine = LintEngine([PollingIntervalRule()])
+
+		def lint_everything(engine):
+			engine.get_model_statistics(flattened)
+			engine.analyze_rule_impact(flattened)
+			engine.debug_nodes(flattened, ['component'])
+			engine.process(flattened)
+
+		self.assertEqual(self.count_builds(engine, lint_everything), 1)
+
+	def test_rebuild_when_needed(self):
+		"""Test a new view, or collections missing from a partial model, trigger a new build."""
+		flattened = flatten_json(read_json_file(self.VIEW_FILE))
+		engine = LintEngine([PollingIntervalRule()])
+		self.assertEqual(self.count_builds(engine, lambda engine: engine.process(flattened)), 1)
+		self.assertEqual(self.count_builds(engine, lambda engine: engine.get_model_statistics(flattened)), 1)
+		self.assertEqual(self.count_builds(engine, lambda engine: engine.process(flattened)), 0)
+		self.assertEqual(self.count_builds(engine, lambda engine: engine.process(dict(flattened))), 1)
+
+		engine.flattened_json = flattened
+		self.assertEqual(self.count_builds(engine, lambda engine: engine.get_view_model()), 1)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,171 @@
+# pylint: disable=import-error,wrong-import-position
+"""
+Unit tests for profiling: profiled runs must lint exactly as unprofiled ones, record the phases
+and rules of every file, and produce a well-formed Chrome trace with one lane per process; memory
+profiles must attribute allocations to the span that made them.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from ignition_lint.cli import create_rules_from_config, get_view_file, load_config, main
+from ignition_lint.common.profiler import (
+	FILE, PHASE, RULE, MemoryProfiler, Profiler, chrome_trace, memory_report, summarize
+)
+from ignition_lint.linter import EXECUTION_MODES, LintEngine
+
+CASES_DIR = Path(__file__).resolve().parent.parent / 'cases'
+CONFIG_PATH = Path(__file__).resolve().parent.parent.parent / 'rule_config.json'
+
+
+class TestProfiler(unittest.TestCase):
+	"""Test spans and their totals."""
+
+	def test_spans_and_totals(self):
+		"""Test spans record their arguments, including ones added inside the block, and are totalled per name."""
+		profiler = Profiler()
+		for nodes in (2, 3):
+			with profiler.span('RuleA.process_nodes', RULE, rule='RuleA', nodes=nodes):
+				pass
+		with profiler.span('build_model', PHASE) as span_args:
+			span_args['nodes'] = 7
+
+		self.assertEqual(profiler.spans[-1].args, {'nodes': 7})
+		self.assertTrue(all(span.wall_ns >= 0 and span.pid == os.getpid() for span in profiler.spans))
+		(rule_total,) = summarize(profiler.spans, RULE, key='rule')
+		self.assertEqual((rule_total.name, rule_total.count, rule_total.nodes), ('RuleA', 2, 5))
+		self.assertEqual([total.name for total in summarize(profiler.spans, PHASE)], ['build_model'])
+
+		self.assertEqual(len(profiler.take()), 3)
+		self.assertEqual(profiler.spans, [])
+
+	def test_chrome_trace(self):
+		"""Test spans become complete events, relative to the first, with a named lane per process."""
+		profiler = Profiler()
+		with profiler.span('view.json', FILE):
+			with profiler.span('decode', PHASE):
+				pass
+		worker_span = profiler.spans[0]._replace(pid=-1)
+		trace = chrome_trace(profiler.spans + [worker_span], main_pid=os.getpid())
+
+		events = [event for event in trace['traceEvents'] if event['ph'] == 'X']
+		self.assertEqual(min(event['ts'] for event in events), 0)
+		self.assertEqual({event['name'] for event in events}, {'view.json', 'decode'})
+		self.assertTrue(all('cpu_ms' in event['args'] for event in events))
+		lanes = {
+			event['pid']: event['args']['name'] for event in trace['traceEvents'] if event['name'] == 'process_name'
+		}
+		self.assertEqual(lanes, {os.getpid(): 'main', -1: 'worker 1'})
+		json.dumps(trace)
+
+
+class TestMemoryProfiler(unittest.TestCase):
+	"""Test memory measured in nested spans."""
+
+	def test_peak_and_retained(self):
+		"""Test a nested span's peak counts towards its parent, and retained memory is what outlives a span."""
+		profiler = MemoryProfiler()
+		try:
+			with profiler.span('view.json', FILE, file_bytes=1000):
+				with profiler.span('decode', PHASE):
+					temporary = bytearray(4 * 2**20)
+					del temporary
+				with profiler.span('build_model', PHASE):
+					kept = bytearray(2**20)
+		finally:
+			profiler.close()
+		self.assertFalse(tracemalloc.is_tracing())
+
+		decode, build_model, file = profiler.spans
+		self.assertGreaterEqual(decode.args['peak_bytes'], 4 * 2**20)
+		self.assertLess(decode.args['retained_bytes'], 2**16)
+		self.assertGreaterEqual(build_model.args['retained_bytes'], len(kept))
+		self.assertGreaterEqual(file.args['peak_bytes'], 4 * 2**20)
+		self.assertEqual((decode.file, build_model.file), ('view.json', 'view.json'))
+		self.assertIn('allocation_sites', decode.args)
+
+		report = memory_report(profiler.spans, max_model_ratio=100)
+		self.assertEqual(len(report['files']), 1)
+		file_report = report['files'][0]
+		self.assertGreater(file_report['model_ratio'], 1000)
+		self.assertTrue(file_report['flagged'])
+		self.assertEqual(report['allocation_sites']['span'], 'decode')
+		self.assertEqual([phase['name'] for phase in report['phases']], ['decode', 'build_model'])
+		json.dumps(report)
+
+
+class TestProfiledLinting(unittest.TestCase):
+	"""Test profiling the engine and the CLI on the test cases."""
+
+	def test_profiled_results_match(self):
+		"""Test profiling changes no result, and records every rule in both execution modes."""
+		view_file = CASES_DIR / 'ExpressionBindings' / 'view.json'
+		for execution_mode in EXECUTION_MODES:
+			with self.subTest(execution_mode=execution_mode):
+				results = []
+				for profiler in (None, Profiler()):
+					with contextlib.redirect_stdout(io.StringIO()):
+						rules = create_rules_from_config(load_config(str(CONFIG_PATH)))
+					engine = LintEngine(rules, execution_mode=execution_mode, profiler=profiler)
+					results.append(engine.process(get_view_file(view_file, profiler=profiler)))
+				self.assertEqual(results[0], results[1])
+
+				self.assertEqual(
+					{total.name for total in summarize(profiler.spans, RULE, key='rule')},
+					{type(rule).__name__ for rule in rules}
+				)
+				phases = {total.name for total in summarize(profiler.spans, PHASE)}
+				self.assertTrue({'decode', 'flatten', 'build_model'} <= phases)
+
+	def test_cli_profile_output(self):
+		"""Test --profile-output prints the report and writes a trace with a span for every file."""
+		view_files = sorted(CASES_DIR.glob('*/view.json'))
+		with tempfile.TemporaryDirectory() as temp_dir:
+			trace_path = Path(temp_dir) / 'trace.json'
+			output = io.StringIO()
+			with contextlib.redirect_stdout(output), self.assertRaises(SystemExit):
+				main([
+					'--config', str(CONFIG_PATH), '--files', ','.join(str(path) for path in view_files), '--no-cache',
+					'--jobs', '2', '--profile-top', '3', '--profile-output', str(trace_path)
+				])
+			trace = json.loads(trace_path.read_text(encoding='utf-8'))
+
+		self.assertIn('Slowest files (top 3 of 12)', output.getvalue())
+		self.assertIn('Slowest rules', output.getvalue())
+		file_events = [event for event in trace['traceEvents'] if event.get('cat') == FILE]
+		self.assertEqual(sorted(event['name'] for event in file_events), sorted(str(path) for path in view_files))
+		lanes = [event['args']['name'] for event in trace['traceEvents'] if event['name'] == 'process_name']
+		self.assertTrue(lanes and all(lane.startswith('worker ') for lane in lanes))
+
+	def test_cli_memory_profile_output(self):
+		"""Test --memory-profile-output prints the report and writes it as JSON, with a model size for every file."""
+		view_files = sorted(CASES_DIR.glob('*/view.json'))
+		with tempfile.TemporaryDirectory() as temp_dir:
+			report_path = Path(temp_dir) / 'memory.json'
+			output = io.StringIO()
+			with contextlib.redirect_stdout(output), self.assertRaises(SystemExit):
+				main([
+					'--config', str(CONFIG_PATH), '--files', ','.join(str(path) for path in view_files), '--jobs', '1',
+					'--max-model-ratio', '0', '--memory-profile-output', str(report_path)
+				])
+			report = json.loads(report_path.read_text(encoding='utf-8'))
+
+		self.assertFalse(tracemalloc.is_tracing())
+		self.assertIn('Memory profile', output.getvalue())
+		self.assertIn('files have models over 0×', output.getvalue())
+		self.assertEqual(sorted(file['file'] for file in report['files']), sorted(str(path) for path in view_files))
+		self.assertTrue(all(file['model_bytes'] > 0 and file['flagged'] for file in report['files']))
+		self.assertTrue(report['allocation_sites']['sites'])
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,241 @@
+# pylint: disable=import-error,wrong-import-position
+"""
+Unit tests for the on-disk caches: result hits and misses, invalidation on content or
+configuration changes, the stat pre-check that skips re-hashing, size-based pruning, models
+that load from the cache identical to freshly built ones, and rejection of unsigned models.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from ignition_lint.common.flatten_json import flatten_json, read_json_file
+from ignition_lint.common import result_cache
+from ignition_lint.common.result_cache import ModelCache, ResultCache, rules_fingerprint
+from ignition_lint.linter import LintEngine, LintResults
+from ignition_lint.model.builder import ViewModelBuilder
+from ignition_lint.model.node_types import EMPTY_MAPPING
+from ignition_lint.rules import RULES_MAP
+
+CASES_DIR = Path(__file__).parent.parent / 'cases'
+
+CONFIG = {"PollingIntervalRule": {"enabled": True, "kwargs": {"minimum_interval": 10000}}}
+
+
+class TestResultCache(unittest.TestCase):
+	"""Test storing and looking up results in a temporary cache directory."""
+
+	def setUp(self):
+		self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+		self.root = Path(self.temp_dir.name)
+		self.view_file = self.root / 'view.json'
+		self.view_file.write_text('{"root": {}}', encoding='utf-8')
+		self.rules = [RULES_MAP['PollingIntervalRule'](minimum_interval=10000)]
+
+	def tearDown(self):
+		self.temp_dir.cleanup()
+
+	def make_cache(self, config=None, **kwargs) -> ResultCache:
+		"""Create a cache in the temporary directory."""
+		return ResultCache(self.root / 'cache', config=CONFIG if config is None else config, rules=self.rules, **kwargs)
+
+	def test_round_trip(self):
+		"""Test stored results are returned for the same file, configuration and rules."""
+		cache = self.make_cache()
+		key = cache.key_for(self.view_file)
+		self.assertIsNone(cache.get(key))
+
+		results = LintResults(warnings={}, errors={"PollingIntervalRule": ["custom.a: 'now()'"]}, has_errors=True)
+		cache.put(key, results)
+		cached = self.make_cache().get(self.make_cache().key_for(self.view_file))
+		self.assertEqual(cached.errors, results.errors)
+		self.assertEqual(cached.warnings, {})
+		self.assertTrue(cached.has_errors)
+
+	def test_key_changes_with_content_and_config(self):
+		"""Test editing the file or the configuration changes the key."""
+		cache = self.make_cache()
+		key = cache.key_for(self.view_file)
+
+		other_config = {"PollingIntervalRule": {"enabled": True, "kwargs": {"minimum_interval": 5000}}}
+		self.assertNotEqual(self.make_cache(config=other_config).key_for(self.view_file), key)
+
+		self.view_file.write_text('{"root": {"meta": {}}}', encoding='utf-8')
+		self.assertNotEqual(cache.key_for(self.view_file), key)
+
+	def test_unchanged_file_is_not_rehashed(self):
+		"""Test the recorded hash is reused while the file's size and modification time are unchanged."""
+		cache = self.make_cache()
+		key = cache.key_for(self.view_file)
+		stat = self.view_file.stat()
+
+		# Same size and mtime: the stale record is trusted
+		self.view_file.write_text('{"root": []}', encoding='utf-8')
+		os.utime(self.view_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+		self.assertEqual(cache.key_for(self.view_file), key)
+
+		# A new mtime forces the file to be hashed again
+		os.utime(self.view_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+		self.assertNotEqual(cache.key_for(self.view_file), key)
+
+	def test_rules_fingerprint(self):
+		"""Test the fingerprint depends on the rule classes, not on their instances."""
+		self.assertEqual(rules_fingerprint(self.rules), rules_fingerprint([RULES_MAP['PollingIntervalRule']()]))
+		self.assertNotEqual(rules_fingerprint(self.rules), rules_fingerprint([RULES_MAP['NamePatternRule']()]))
+
+	def test_prune_evicts_least_recently_used(self):
+		"""Test pruning removes the oldest entries until the cache fits its size limit."""
+		cache = self.make_cache(max_bytes=0)
+		results = LintResults(warnings={}, errors={}, has_errors=False)
+		for index in range(3):
+			cache.put(f"key{index}", results)
+		entry_size = (cache.cache_dir / 'results' / 'key0.json').stat().st_size
+		for index in range(3):
+			os.utime(cache.cache_dir / 'results' / f"key{index}.json", ns=(index, index))
+
+		cache.max_bytes = 2 * entry_size
+		cache.prune()
+		self.assertEqual(sorted(path.name for path in (cache.cache_dir / 'results').iterdir()), ['key1.json', 'key2.json'])
+
+		cache.clear()
+		self.assertFalse((cache.cache_dir / 'results').exists())
+		self.assertIsNone(cache.get('key2'))
+
+	def test_created_directory_is_marked_and_ignored(self):
+		"""Test the directory a cache creates holds a cache directory tag and a .gitignore ignoring everything."""
+		cache = self.make_cache()
+		cache.put('key', LintResults(warnings={}, errors={}, has_errors=False))
+		self.assertTrue((cache.cache_dir / result_cache.CACHE_MARKER).read_bytes().startswith(b"Signature: 8a477f597d28d172789f06886806bc55"))
+		self.assertEqual((cache.cache_dir / '.gitignore').read_text(encoding='utf-8'), "*\n")
+
+	def test_clear_removes_only_cache_subdirectories(self):
+		"""Test clearing leaves files the caches did not write in a marked directory."""
+		cache = self.make_cache()
+		cache.put('key', LintResults(warnings={}, errors={}, has_errors=False))
+		cache.key_for(self.view_file)
+		(cache.cache_dir / 'notes.txt').write_text('keep', encoding='utf-8')
+
+		cache.clear()
+		self.assertEqual(
+			sorted(path.name for path in cache.cache_dir.iterdir()), ['.gitignore', result_cache.CACHE_MARKER, 'notes.txt']
+		)
+
+	def test_directory_that_is_not_a_cache_is_never_cleared(self):
+		"""Test a --cache-dir pointing at an existing directory with other files is used but neither marked nor cleared."""
+		cache = ResultCache(self.root, config=CONFIG, rules=self.rules)
+		cache.put(cache.key_for(self.view_file), LintResults(warnings={}, errors={}, has_errors=False))
+		self.assertFalse((self.root / result_cache.CACHE_MARKER).exists())
+		self.assertFalse((self.root / '.gitignore').exists())
+
+		with self.assertRaises(ValueError):
+			cache.clear()
+		self.assertTrue(self.view_file.exists())
+		self.assertTrue((self.root / 'results').is_dir())
+
+	def test_interrupted_write_leaves_no_temporary_file(self):
+		"""Test an entry write interrupted by a BaseException, such as a time budget running out, is cleaned up."""
+		cache = self.make_cache()
+		cache.key_for(self.view_file)  # Creates the cache directory
+		with mock.patch.object(result_cache.os, 'replace', side_effect=KeyboardInterrupt), self.assertRaises(KeyboardInterrupt):
+			cache.put('key', LintResults(warnings={}, errors={}, has_errors=False))
+		self.assertEqual(list((cache.cache_dir / 'results').iterdir()), [])
+
+	def test_models_do_not_evict_results(self):
+		"""Test each cache is pruned within its own size limit, leaving the other cache's entries alone."""
+		results = LintResults(warnings={}, errors={}, has_errors=False)
+		cache = self.make_cache()
+		cache.put('key', results)
+		model_cache = ModelCache(cache.cache_dir, max_bytes=0, key_path=self.root / 'model-cache.key')
+		flattened = {'root.meta.name': 'root'}
+		model_cache.put('key', flattened, ViewModelBuilder().build_model(flattened))
+		self.assertTrue((cache.cache_dir / 'models' / 'key.pickle').exists())
+
+		model_cache.prune()
+		cache.prune()
+		self.assertFalse((cache.cache_dir / 'models' / 'key.pickle').exists())
+		self.assertIsNotNone(cache.get('key'))
+
+
+
+class TestModelCache(unittest.TestCase):
+	"""Test models loaded from the cache against models built from the view files."""
+
+	def setUp(self):
+		self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+		self.key_path = Path(self.temp_dir.name) / 'keys' / 'model-cache.key'
+		self.cache = ModelCache(Path(self.temp_dir.name) / 'cache', key_path=self.key_path)
+
+	def tearDown(self):
+		self.temp_dir.cleanup()
+
+	def test_loaded_models_match_built_models(self):
+		"""Test every node, index and tree link survives the round trip through the cache."""
+		for view_file in sorted(CASES_DIR.glob('*/view.json')):
+			with self.subTest(case=view_file.parent.name):
+				flattened = flatten_json(read_json_file(view_file))
+				model = ViewModelBuilder().build_model(flattened)
+				key = self.cache.key_for(view_file)
+				self.cache.put(key, flattened, model)
+
+				loaded_flattened, loaded = self.cache.get(key)
+				self.assertEqual(loaded_flattened, flattened)
+				self.assertEqual([node.serialize() for node in loaded.nodes], [node.serialize() for node in model.nodes])
+				for component in loaded['components']:
+					self.assertIs(loaded.component(component.path), component)
+					self.assertTrue(component.parent is None or component in component.parent.children)
+				for binding in loaded['bindings']:
+					self.assertTrue(binding.config or binding.config is EMPTY_MAPPING)
+
+	def test_cached_model_gives_the_same_results(self):
+		"""Test linting with a model from the cache reports what linting the parsed view does."""
+		view_file = CASES_DIR / 'LineDashboard' / 'view.json'
+		rules = [RULES_MAP['NamePatternRule']('PascalCase'), RULES_MAP['UnusedCustomPropertiesRule']()]
+		engine = LintEngine(rules)
+		expected = engine.process(flatten_json(read_json_file(view_file)))
+
+		flattened = flatten_json(read_json_file(view_file))
+		key = self.cache.key_for(view_file)
+		self.cache.put(key, flattened, ViewModelBuilder().build_model(flattened))
+		loaded_flattened, loaded = self.cache.get(key)
+		engine.set_view(loaded_flattened, loaded)
+		self.assertIs(engine.get_view_model(), loaded)
+		self.assertEqual(engine.process(loaded_flattened), expected)
+
+	def test_key_depends_on_content_only(self):
+		"""Test the key ignores the rule configuration but not the file content."""
+		view_file = CASES_DIR / 'PascalCase' / 'view.json'
+		key = self.cache.key_for(view_file)
+		self.assertEqual(ModelCache(self.cache.cache_dir, key_path=self.key_path).key_for(view_file), key)
+		self.assertNotEqual(self.cache.key_for(CASES_DIR / 'camelCase' / 'view.json'), key)
+		self.assertIsNone(self.cache.get(key))
+
+		(self.cache.cache_dir / 'models').mkdir(parents=True)
+		(self.cache.cache_dir / 'models' / f"{key}.pickle").write_bytes(b'truncated')
+		self.assertIsNone(self.cache.get(key))
+
+	def test_entries_not_signed_with_the_key_are_never_unpickled(self):
+		"""Test entries written with another key, or moved to another cache key, are misses that are not unpickled."""
+		flattened = {'root.meta.name': 'root'}
+		model = ViewModelBuilder().build_model(flattened)
+		self.cache.put('key', flattened, model)
+		self.assertIsNotNone(self.cache.get('key'))
+		self.assertEqual(self.key_path.stat().st_mode & 0o777, 0o600)
+
+		other_cache = ModelCache(self.cache.cache_dir, key_path=Path(self.temp_dir.name) / 'other.key')
+		other_cache.put('other', flattened, model)
+		entry = (self.cache.cache_dir / 'models' / 'key.pickle').read_bytes()
+		(self.cache.cache_dir / 'models' / 'moved.pickle').write_bytes(entry)
+
+		with mock.patch.object(result_cache.pickle, 'loads', wraps=result_cache.pickle.loads) as loads:
+			self.assertIsNone(self.cache.get('other'))
+			self.assertIsNone(self.cache.get('moved'))
+		loads.assert_not_called()
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,194 @@
+# pylint: disable=import-error,wrong-import-position
+"""
+Unit tests for how the engine hands nodes to rules.
+
+The engine gives each rule the nodes of its target types, with private properties already
+removed unless the rule includes them, so rules never filter the node list themselves. The
+results must match letting every rule filter the complete node list, whether the rules run
+one after another or share a single pass over the nodes.
+"""
+
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from ignition_lint.common.flatten_json import flatten_json, read_json_file
+from ignition_lint.linter import LintEngine, EXECUTION_MODES
+from ignition_lint.model.builder import ViewModelBuilder
+from ignition_lint.model.node_types import NodeType
+from ignition_lint.rules import RULES_MAP, NamePatternRule
+from ignition_lint.rules.common import LintingRule
+
+CASES_DIR = Path(__file__).parent.parent / 'cases'
+
+
+class _PropertyNamesRule(NamePatternRule):
+	"""Property naming rule, with or without private properties, reporting under its own key."""
+
+	def __init__(self, include_private_properties=False):
+		super().__init__('camelCase', target_node_types={NodeType.PROPERTY})
+		self.include_private_properties = include_private_properties
+
+	@property
+	def error_key(self) -> str:
+		return f"{super().error_key}(private={self.include_private_properties})"
+
+
+def _create_rules():
+	"""Every registered rule with its default configuration, plus property naming rules with and without private properties."""
+	rules = [
+		rule_class.create_from_config({})
+		for rule_name, rule_class in RULES_MAP.items()
+		if rule_name != 'PylintScriptRule'
+	]
+	return rules + [_PropertyNamesRule(), _PropertyNamesRule(include_private_properties=True)]
+
+
+class _RecordingRule(LintingRule):
+	"""Rule that overrides process_nodes, as rules written before process_applicable_nodes may do."""
+
+	def __init__(self):
+		super().__init__({NodeType.COMPONENT})
+		self.received = None
+
+	@property
+	def error_message(self) -> str:
+		return "Records the nodes it is given"
+
+	def process_nodes(self, nodes):
+		self.received = list(nodes)
+		super().process_nodes(nodes)
+
+
+class TestRuleDispatch(unittest.TestCase):
+	"""Compare engine dispatch with rules filtering the full node list."""
+
+	def test_results_match_per_node_filtering(self):
+		"""Test every rule reports the same violations as when it filters every node itself."""
+		for view_file in sorted(CASES_DIR.glob('*/view.json')):
+			with self.subTest(case=view_file.parent.name):
+				flattened = flatten_json(read_json_file(view_file))
+				results = LintEngine(_create_rules()).process(flattened)
+
+				nodes = ViewModelBuilder().build_model(flattened).nodes
+				for rule in _create_rules():
+					if hasattr(rule, 'set_flattened_json'):
+						rule.set_flattened_json(flattened)
+					rule.process_nodes(nodes)
+					self.assertEqual(results.errors.get(rule.error_key, []), rule.errors)
+					self.assertEqual(results.warnings.get(rule.error_key, []), rule.warnings)
+
+	def test_engine_does_not_filter_nodes(self):
+		"""Test the engine never asks a rule whether a node applies to it."""
+		flattened = flatten_json(read_json_file(CASES_DIR / 'AllNodeTypes' / 'view.json'))
+		with mock.patch.object(LintingRule, 'applies_to', side_effect=AssertionError("node filtered")):
+			LintEngine(_create_rules()).process(flattened)
+
+	def test_private_properties_are_partitioned(self):
+		"""Test private properties only reach rules that include them."""
+		view = {"custom": {"_hidden": 1, "shown": 2, "_JavaDate": 3}}
+		engine = LintEngine([_PropertyNamesRule(), _PropertyNamesRule(include_private_properties=True)])
+		with mock.patch.object(NamePatternRule, 'visit_property') as visit_property:
+			engine.process(flatten_json(view))
+		visited = [call.args[0].name for call in visit_property.call_args_list]
+		self.assertEqual(visited, ['shown', '_hidden', 'shown', '_JavaDate'])
+
+	def test_process_nodes_overrides_are_called(self):
+		"""Test rules overriding process_nodes still receive their applicable nodes through it."""
+		rule = _RecordingRule()
+		LintEngine([rule]).process(flatten_json(read_json_file(CASES_DIR / 'AllNodeTypes' / 'view.json')))
+		self.assertTrue(rule.received)
+		self.assertTrue(all(node.node_type is NodeType.COMPONENT for node in rule.received))
+
+
+class TestFusedExecution(unittest.TestCase):
+	"""Compare the fused single-pass execution mode with running rules one after another."""
+
+	def test_fused_results_match_per_rule(self):
+		"""Test every rule reports the same violations, in the same order, in both modes."""
+		engines = {mode: LintEngine(_create_rules(), execution_mode=mode) for mode in EXECUTION_MODES}
+		for view_file in sorted(CASES_DIR.glob('*/view.json')):
+			with self.subTest(case=view_file.parent.name):
+				flattened = flatten_json(read_json_file(view_file))
+				per_rule = engines['per-rule'].process(flattened)
+				fused = engines['fused'].process(flattened)
+				self.assertEqual(fused, per_rule)
+
+	def test_fused_mode_walks_nodes_once(self):
+		"""Test the fused mode gives no rule a node list, except rules overriding the processing hooks."""
+		recording = _RecordingRule()
+		rules = _create_rules() + [recording]
+		flattened = flatten_json(read_json_file(CASES_DIR / 'AllNodeTypes' / 'view.json'))
+		with mock.patch.object(LintingRule, 'process_applicable_nodes', autospec=True) as process_applicable_nodes:
+			LintEngine(rules, execution_mode='fused').process(flattened)
+		self.assertEqual(process_applicable_nodes.call_args_list, [mock.call(recording, recording.received)])
+
+	def test_unknown_execution_mode(self):
+		"""Test an unknown execution mode is rejected."""
+		with self.assertRaises(ValueError):
+			LintEngine([], execution_mode='parallel')
+
+
+class TestVisitHandlers(unittest.TestCase):
+	"""Test the per-type handler tables rules are dispatched through."""
+
+	def test_handlers_follow_visit_methods(self):
+		"""Test each type resolves to its visit method, then visit_generic, or None if neither is overridden."""
+		handlers = _RecordingRule().visit_handlers()
+		self.assertEqual(set(handlers), set(NodeType))
+		self.assertTrue(all(handler is None for handler in handlers.values()))
+
+		rule = _PropertyNamesRule()
+		handlers = rule.visit_handlers()
+		self.assertEqual(handlers[NodeType.PROPERTY], rule.visit_property)
+		# NamePatternRule overrides visit_generic, which covers types without a visit method of their own
+		self.assertEqual(handlers[NodeType.QUERY_BINDING], rule.visit_generic)
+
+	def test_handlers_resolved_once_per_class(self):
+		"""Test linting resolves no handler table, and asks each rule for its handlers once per view."""
+		rule = _PropertyNamesRule()
+		flattened = flatten_json(read_json_file(CASES_DIR / 'AllNodeTypes' / 'view.json'))
+		with mock.patch('ignition_lint.rules.common._resolve_handler_names') as resolve, \
+			mock.patch.object(rule, 'visit_handlers', wraps=rule.visit_handlers) as visit_handlers:
+			LintEngine([rule]).process(flattened)
+		resolve.assert_not_called()
+		self.assertEqual(visit_handlers.call_count, 1)
+
+	def test_types_without_handlers_are_not_passed(self):
+		"""Test the engine leaves out nodes whose type the rule has no handler for."""
+
+		class _ComponentRule(LintingRule):
+			"""Rule that targets components, recording the nodes it is given."""
+
+			def __init__(self):
+				super().__init__({NodeType.COMPONENT, NodeType.PROPERTY})
+				self.received = []
+
+			@property
+			def error_message(self) -> str:
+				return "Records the nodes it is given"
+
+			def process_applicable_nodes(self, nodes):
+				self.received = list(nodes)
+				super().process_applicable_nodes(nodes)
+
+		class _HandlingRule(_ComponentRule):
+			"""The same rule, handling components."""
+
+			def visit_component(self, node):
+				pass
+
+		flattened = flatten_json(read_json_file(CASES_DIR / 'AllNodeTypes' / 'view.json'))
+		idle, handling = _ComponentRule(), _HandlingRule()
+		LintEngine([idle, handling]).process(flattened)
+		self.assertEqual(idle.received, [])
+		self.assertTrue(handling.received)
+		self.assertTrue(all(node.node_type is NodeType.COMPONENT for node in handling.received))
+
+
+if __name__ == '__main__':
+	unittest.main()
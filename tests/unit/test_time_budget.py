@@ -0,0 +1,207 @@
+# pylint: disable=import-error,wrong-import-position
+"""
+Unit tests for time budgets: work runs in a child process that is killed once past its budget,
+with nested budgets' children killed along with it, and the caller's state, signal handlers and
+hooks left alone; the engine must report a rule that ran out of its budget without losing the
+results of the other rules, and without touching the rule instance; a killed pylint run must
+leave no temporary file; and the CLI must do the same for files past --max-file-time.
+"""
+
+import contextlib
+import io
+import os
+import re
+import signal
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from ignition_lint.cli import FILE_TIMEOUT_KEY, create_rules_from_config, get_view_file, main
+from ignition_lint.common.time_budget import BudgetExceeded, budgets_enforced, run_within_budget
+from ignition_lint.linter import EXECUTION_MODES, RULE_TIMEOUT_KEY, LintEngine
+from ignition_lint.model.node_types import NodeType
+from ignition_lint.rules.common import LintingRule
+from ignition_lint.rules.scripts.lint_script import PylintScriptRule
+
+CASES_DIR = Path(__file__).resolve().parent.parent / 'cases'
+
+
+def spin(seconds: float):
+	"""Keep busy for up to seconds."""
+	deadline = time.monotonic() + seconds
+	while time.monotonic() < deadline:
+		pass
+
+
+def exceeds(seconds: float, work) -> bool:
+	"""Run work within a budget; return True if it ran past it."""
+	try:
+		run_within_budget(seconds, work)
+	except BudgetExceeded:
+		return True
+	return False
+
+
+class SlowRule(LintingRule):
+	"""A rule that keeps busy on every component."""
+
+	def __init__(self):
+		super().__init__({NodeType.COMPONENT})
+
+	@property
+	def error_message(self) -> str:
+		return "test rule"
+
+	def visit_component(self, node):
+		spin(5)
+		self.errors.append(f"{node.path}: checked")
+
+
+class CountingRule(LintingRule):
+	"""A rule that reports every component."""
+
+	def __init__(self):
+		super().__init__({NodeType.COMPONENT})
+
+	@property
+	def error_message(self) -> str:
+		return "test rule"
+
+	def visit_component(self, node):
+		self.errors.append(f"{node.path}: seen")
+
+
+@unittest.skipUnless(budgets_enforced(), "Budgets need os.fork")
+class TestTimeBudget(unittest.TestCase):
+	"""Test running work in a child process within a budget."""
+
+	def test_result_and_exceptions(self):
+		"""Test the work's result is returned, and its exceptions raised with the child's traceback."""
+		self.assertEqual(run_within_budget(5, lambda value: value * 2, 21), 42)
+
+		def fail():
+			raise KeyError('missing')
+
+		with self.assertRaises(KeyError) as raised:
+			run_within_budget(5, fail)
+		self.assertIn('in fail', str(raised.exception.__cause__))
+
+	def test_work_past_budget_is_killed(self):
+		"""Test busy work and regular expression backtracking are killed once past their budget."""
+		start = time.monotonic()
+		self.assertTrue(exceeds(0.05, lambda: spin(5)))
+		self.assertTrue(exceeds(0.05, lambda: re.match(r'(a+)+$', 'a' * 40 + 'b')))
+		self.assertLess(time.monotonic() - start, 2)
+		self.assertFalse(exceeds(5, lambda: None))
+
+	def test_caller_is_left_alone(self):
+		"""Test the work's changes stay in the child, and no signal handler or hook is replaced."""
+		handler = signal.getsignal(signal.SIGALRM)
+		unraisablehook = sys.unraisablehook
+		changed = []
+		run_within_budget(5, changed.append, 'child')
+		self.assertTrue(exceeds(0.05, lambda: changed.append('child') or spin(5)))
+		self.assertEqual(changed, [])
+		self.assertIs(signal.getsignal(signal.SIGALRM), handler)
+		self.assertIs(sys.unraisablehook, unraisablehook)
+
+	def test_nested_budgets_are_killed_with_the_outer_one(self):
+		"""Test an inner budget handles its own expiry, and its child is killed with the outer budget's."""
+		with tempfile.TemporaryDirectory() as temp_dir:
+			marker = Path(temp_dir) / 'marker'
+
+			def inner_work():
+				spin(0.5)
+				marker.touch()
+
+			def outer_work():
+				inner_expired = exceeds(0.02, lambda: spin(5))
+				run_within_budget(5, inner_work)
+				return inner_expired
+
+			self.assertTrue(run_within_budget(5, outer_work))
+			self.assertTrue(marker.exists())
+			marker.unlink()
+
+			self.assertTrue(exceeds(0.2, outer_work))
+			time.sleep(0.6)
+			self.assertFalse(marker.exists())
+
+	def test_invalid(self):
+		"""Test budgets must be positive."""
+		with self.assertRaises(ValueError):
+			run_within_budget(0, lambda: None)
+
+
+@unittest.skipUnless(budgets_enforced(), "Budgets need os.fork")
+class TestRuleTimeouts(unittest.TestCase):
+	"""Test rules and files running out of their budgets."""
+
+	def test_rule_timeout(self):
+		"""Test a rule past its budget is reported as timed out, and the other rules' results are kept."""
+		view_data = get_view_file(CASES_DIR / 'PascalCase' / 'view.json')
+		for execution_mode in EXECUTION_MODES:
+			with self.subTest(execution_mode=execution_mode):
+				slow_rule = SlowRule()
+				slow_rule.timeout_ms = 50
+				results = LintEngine([slow_rule, CountingRule()], execution_mode=execution_mode).process(view_data)
+				self.assertEqual(set(results.errors), {'CountingRule', RULE_TIMEOUT_KEY})
+				self.assertIn('SlowRule exceeded its time budget of 50 ms', results.errors[RULE_TIMEOUT_KEY][0])
+
+	def test_budgeted_rule_instance_is_untouched(self):
+		"""Test a rule with a budget reports what it does without one, and runs in a child, finished or killed."""
+		view_data = get_view_file(CASES_DIR / 'PascalCase' / 'view.json')
+		expected = LintEngine([CountingRule()]).process(view_data)
+		counting_rule = CountingRule()
+		counting_rule.timeout_ms = 5000
+		slow_rule = SlowRule()
+		slow_rule.timeout_ms = 50
+		engine = LintEngine([slow_rule, counting_rule])
+
+		results = engine.process(view_data)
+		self.assertEqual(results.errors['CountingRule'], expected.errors['CountingRule'])
+		self.assertEqual(engine.rules, [slow_rule, counting_rule])
+		self.assertEqual((slow_rule.errors, counting_rule.errors), ([], []))
+
+	def test_killed_pylint_run_leaves_no_temp_file(self):
+		"""Test a pylint run killed while checking its temporary file leaves nothing behind."""
+		view_data = get_view_file(CASES_DIR / 'LineDashboard' / 'view.json')
+		rule = PylintScriptRule()
+		rule.timeout_ms = 100
+		with tempfile.TemporaryDirectory() as temp_dir, mock.patch.object(tempfile, 'tempdir', temp_dir):
+			with mock.patch.object(PylintScriptRule, '_run_pylint_on_file', side_effect=lambda *_: spin(5)):
+				results = LintEngine([rule]).process(view_data)
+			self.assertIn(RULE_TIMEOUT_KEY, results.errors)
+			self.assertEqual(os.listdir(temp_dir), [])
+
+	def test_config(self):
+		"""Test timeout_ms is read next to enabled and kwargs, and invalid values skip the rule."""
+		with contextlib.redirect_stdout(io.StringIO()) as output:
+			rules = create_rules_from_config({
+				'PollingIntervalRule': {'enabled': True, 'kwargs': {}, 'timeout_ms': 2000},
+				'NamePatternRule': {'enabled': True, 'kwargs': {}, 'timeout_ms': 'soon'},
+			})
+		self.assertEqual([(type(rule).__name__, rule.timeout_ms) for rule in rules], [('PollingIntervalRule', 2000)])
+		self.assertIn('timeout_ms must be a positive number', output.getvalue())
+
+	def test_max_file_time(self):
+		"""Test a file past --max-file-time is reported as timed out, and the other files are still linted."""
+		slow_file = CASES_DIR / 'LineDashboard' / 'view.json'
+		config = Path(__file__).resolve().parent.parent.parent / 'rule_config.json'
+		output = io.StringIO()
+		with contextlib.redirect_stdout(output), self.assertRaises(SystemExit):
+			main([
+				'--config', str(config), '--files', f"{slow_file},{CASES_DIR / 'PascalCase' / 'view.json'}",
+				'--no-cache', '--jobs', '1', '--max-file-time', '0.01'
+			])
+		self.assertIn(f"{FILE_TIMEOUT_KEY} (error)", output.getvalue())
+		self.assertIn('Files processed: 2', output.getvalue())
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -18,6 +18,7 @@ REMAINING LIMITATIONS:
 import json
 from fixtures.base_test import BaseRuleTest
 from fixtures.test_helpers import get_test_config, create_temp_view_file
+from ignition_lint.common.flatten_json import flatten_json
 
 
 class TestUnusedCustomPropertiesRule(BaseRuleTest):
@@ -208,3 +209,13 @@ class TestUnusedCustomPropertiesRule(BaseRuleTest):
 			mock_view, rule_config, "UnusedCustomPropertiesRule", expected_error_count=1,
 			error_patterns=["unusedViewParam", "never referenced"]
 		)
+
+	def test_properties_do_not_carry_over_between_views(self):
+		"""Test a rule reused for several views only reports each view's own unused properties."""
+		lint_engine = self.create_lint_engine(get_test_config("UnusedCustomPropertiesRule"))
+		first = lint_engine.process(flatten_json({"custom": {"firstViewProp": 1}, "root": {"meta": {"name": "root"}}}))
+		second = lint_engine.process(flatten_json({"custom": {"secondViewProp": 2}, "root": {"meta": {"name": "root"}}}))
+
+		self.assertEqual(len(first.errors["UnusedCustomPropertiesRule"]), 1)
+		self.assertEqual(len(second.errors["UnusedCustomPropertiesRule"]), 1)
+		self.assertIn("secondViewProp", second.errors["UnusedCustomPropertiesRule"][0])
@@ -0,0 +1,93 @@
+# pylint: disable=import-error,wrong-import-position
+"""
+Unit tests for the indexed ViewModel.
+
+The model must behave like the former dict of 13 node lists while storing each node once,
+and every index and count must agree with filtering the node lists directly.
+"""
+
+import os
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from ignition_lint.common.flatten_json import flatten_json, read_json_file
+from ignition_lint.model import ViewModel
+from ignition_lint.model.builder import ViewModelBuilder
+from ignition_lint.model.node_types import NodeType, NodeUtils, ALL_BINDINGS, ALL_SCRIPTS
+from ignition_lint.model.view_model import MODEL_KEYS, NODE_TYPE_COLLECTIONS
+
+CASES_DIR = Path(__file__).parent.parent / 'cases'
+
+
+class TestViewModel(unittest.TestCase):
+	"""Compare the model's indexes with direct filtering on every test case view."""
+
+	def setUp(self):
+		self.models = {
+			view_file.parent.name: ViewModelBuilder().build_model(flatten_json(read_json_file(view_file)))
+			for view_file in sorted(CASES_DIR.glob('*/view.json'))
+		}
+
+	def test_mapping_interface(self):
+		"""Test the model exposes the same 13 collections, in the same order, as the old dict model."""
+		for case, model in self.models.items():
+			with self.subTest(case=case):
+				self.assertEqual(list(model), list(MODEL_KEYS))
+				self.assertEqual(len(model), 13)
+				self.assertEqual(dict(model.items()).keys(), set(MODEL_KEYS))
+				with self.assertRaises(KeyError):
+					_ = model['widgets']
+
+	def test_nodes_are_stored_once(self):
+		"""Test every node belongs to exactly one specific collection and generic collections are derived."""
+		for case, model in self.models.items():
+			with self.subTest(case=case):
+				nodes = model.nodes
+				self.assertEqual(len({id(node) for node in nodes}), len(nodes))
+				self.assertEqual(model.total_nodes, len(nodes))
+				for node_type, collection in NODE_TYPE_COLLECTIONS.items():
+					self.assertEqual(model[collection], NodeUtils.filter_by_types(nodes, {node_type}))
+				self.assertCountEqual(model['bindings'], NodeUtils.filter_by_types(nodes, ALL_BINDINGS))
+				self.assertEqual(
+					model['scripts'],
+					model['script_transforms'] + model['message_handlers'] + model['custom_methods'] +
+					model['event_handlers']
+				)
+
+	def test_indexes_and_counts(self):
+		"""Test type, path and component-type lookups against linear scans."""
+		for case, model in self.models.items():
+			with self.subTest(case=case):
+				nodes = model.nodes
+				for node_types in ({NodeType.COMPONENT}, ALL_BINDINGS, ALL_SCRIPTS, ALL_BINDINGS | {NodeType.PROPERTY}):
+					expected = NodeUtils.filter_by_types(nodes, node_types)
+					self.assertEqual(model.nodes_of_types(node_types), expected)
+					self.assertEqual(model.count(node_types), len(expected))
+				self.assertEqual(model.count(set()), len(nodes))
+				self.assertEqual(
+					model.node_type_counts,
+					{node_type: model.count(node_type) for node_type in NodeType if model.count(node_type)}
+				)
+				for node in nodes:
+					self.assertIn(node, model.nodes_at(node.path))
+				for component in model['components']:
+					self.assertIs(model.component(component.path), component)
+					self.assertIn(component, model.components_by_type[component.type])
+					for owned in model.owned_nodes(component.path):
+						self.assertIn(owned, nodes)
+				self.assertEqual(model.nodes_at('no.such.path'), [])
+				self.assertEqual(model.owned_nodes('no.such.path'), [])
+
+	def test_empty_model(self):
+		"""Test an empty model has empty collections and zero counts."""
+		model = ViewModel()
+		self.assertTrue(all(nodes == [] for nodes in model.values()))
+		self.assertEqual(model.total_nodes, 0)
+		self.assertEqual(model.node_type_counts, {})
+
+
+if __name__ == '__main__':
+	unittest.main()